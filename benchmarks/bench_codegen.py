@@ -0,0 +1,54 @@
+# Microbenchmark for code generation, opcodes of the simc-codes corpus are compiled to C repeatedly and the number
+# of opcodes emitted per second is reported
+import io
+import sys
+import contextlib
+
+from common import corpus_paths, timed
+
+from simc.symbol_table import SymbolTable
+from simc.lexical_analyzer import LexicalAnalyzer
+from simc.parser.simc_parser import parse
+from simc.compiler import generate_code
+
+
+def parse_corpus():
+    """
+    Returns (opcodes, symbol table) of every program of the corpus which compiles
+    """
+
+    programs = []
+    for path in corpus_paths():
+        try:
+            # Some programs of corpus print while they are compiled
+            with contextlib.redirect_stdout(io.StringIO()):
+                table = SymbolTable()
+                tokens, _ = LexicalAnalyzer(path, table).lexical_analyze()
+                programs.append((parse(tokens, table), table))
+        except Exception:
+            continue
+
+    return programs
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = 5
+
+    programs = parse_corpus()
+    num_opcodes = sum(len(opcodes) for opcodes, _ in programs) * rounds
+
+    def emit():
+        for _ in range(rounds):
+            for opcodes, table in programs:
+                generate_code(opcodes, table)
+
+    _, best = timed(emit, repeats)
+
+    print("%d programs, %d opcodes emitted" % (len(programs), num_opcodes))
+    print("%-20s  %12.4f" % ("seconds", best))
+    print("%-20s  %12.0f" % ("opcodes / second", num_opcodes / best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Benchmark comparing symbol table size, memory and time with constant interning switched on and off
+import os
+import tempfile
+import tracemalloc
+
+from common import compile_source, main_program, timed, write_source
+
+from simc.symbol_table import SymbolTable
+
+
+def generate_program(num_lines):
+    """
+    Generates a literal heavy sim-C program, every line reuses the same handful of constants
+
+    Params
+    ======
+    num_lines (int) = Number of statements in MAIN
+
+    Returns
+    =======
+    string: The sim-C source code
+    """
+
+    statements = ["var a = 0"]
+    for i in range(num_lines):
+        statements.extend(["a = a * 1 + 0", 'print("\\n")'])
+
+    return main_program(statements)
+
+
+def measure(source_path, c_path, intern_constants):
+    """
+    Returns the number of table entries, peak traced memory and time taken by the pipeline
+
+    Time and memory are measured in separate runs as tracing allocations slows down the pipeline
+    """
+
+    def run_pipeline():
+        table = SymbolTable(intern_constants=intern_constants)
+        return compile_source(source_path, c_path, table)
+
+    table, elapsed = timed(run_pipeline)
+
+    tracemalloc.start()
+    run_pipeline()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(table.symbol_table), peak, elapsed
+
+
+def main():
+    sizes = [500, 1000, 2000]
+
+    print(
+        "%8s  %8s  %10s  %12s  %10s"
+        % ("lines", "intern", "entries", "peak (KiB)", "seconds")
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            source_path = write_source(tmp_dir, generate_program(size))
+            c_path = os.path.join(tmp_dir, "bench.c")
+
+            for intern_constants in [False, True]:
+                entries, peak, elapsed = measure(source_path, c_path, intern_constants)
+                print(
+                    "%8d  %8s  %10d  %12.1f  %10.4f"
+                    % (size, intern_constants, entries, peak / 1024, elapsed)
+                )
+
+
+if __name__ == "__main__":
+    main()
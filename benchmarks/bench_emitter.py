@@ -0,0 +1,78 @@
+# Benchmark for writing generated C code, time should grow linearly with lines of C code and peak memory should
+# stay close to the size of the syntax tree instead of holding several copies of the output
+import os
+import tempfile
+import tracemalloc
+
+from common import growth_ratio, main_program, timed, write_source
+
+from simc.symbol_table import SymbolTable
+from simc.lexical_analyzer import LexicalAnalyzer
+from simc.parser.simc_parser import parse
+from simc.compiler import compile
+
+
+def generate_program(num_lines):
+    """
+    Generates a sim-C program which compiles to about num_lines lines of C code, half of them in a function
+    and half in main
+
+    Params
+    ======
+    num_lines (int) = Number of lines of C code
+
+    Returns
+    =======
+    string: The sim-C source code
+    """
+
+    half = num_lines // 2
+
+    function = ["fun step(x) {", "\tvar y = x"]
+    function.extend("\ty = y * %d + x" % i for i in range(half))
+    function.extend(["\treturn y", "}"])
+
+    statements = ["var total = step(1)"]
+    statements.extend("print(total + %d)" % i for i in range(half))
+
+    return main_program(statements, function)
+
+
+def main():
+    sizes = [62500, 125000, 250000, 500000]
+
+    print("%10s  %12s  %14s  %10s" % ("C lines", "seconds", "peak MiB", "ratio"))
+
+    previous = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            source_path = write_source(tmp_dir, generate_program(size))
+
+            table = SymbolTable()
+            tokens, _ = LexicalAnalyzer(source_path, table).lexical_analyze()
+            opcodes = parse(tokens, table)
+            del tokens
+
+            # Only writing the C code is measured, tracing allocations slows it down so peak memory is
+            # measured in a second run
+            c_path = os.path.join(tmp_dir, "bench.c")
+            _, elapsed = timed(lambda: compile(opcodes, c_path, table))
+
+            tracemalloc.start()
+            compile(opcodes, c_path, table)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            with open(c_path) as file:
+                num_c_lines = sum(1 for _ in file)
+
+            ratio = growth_ratio(elapsed, previous)
+            print(
+                "%10d  %12.4f  %14.2f  %10.2f"
+                % (num_c_lines, elapsed, peak / 2 ** 20, ratio)
+            )
+            previous = elapsed
+
+
+if __name__ == "__main__":
+    main()
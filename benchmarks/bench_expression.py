@@ -0,0 +1,96 @@
+# Benchmark for parsing long and deeply nested expressions, time should grow linearly with the number of operators
+# and nesting depth, and deep nesting should not hit the recursion limit
+import os
+import tempfile
+
+from common import compile_source, growth_ratio, main_program, timed, write_source
+
+
+def long_expression(num_operators):
+    """
+    Generates a sim-C program with a single expression having num_operators operators, like a polynomial
+    evaluated by macro expansion
+
+    Params
+    ======
+    num_operators (int) = Number of operators in the expression
+
+    Returns
+    =======
+    string: The sim-C source code
+    """
+
+    terms = ["x"]
+    for i in range(num_operators // 2):
+        terms.append("%d * x" % (i + 1))
+
+    return main_program(["var x = 2", "var y = %s" % " + ".join(terms), "print(y)"])
+
+
+def nested_parens(depth):
+    """
+    Generates a sim-C program with an operand nested in depth pairs of parentheses
+    """
+
+    expr = "(" * depth + "1" + ")" * depth
+
+    return main_program(["var x = %s" % expr, "print(x)"])
+
+
+def nested_calls(depth):
+    """
+    Generates a sim-C program with depth function calls nested in the arguments of each other
+    """
+
+    expr = "inc(" * depth + "1" + ")" * depth
+
+    return main_program(
+        ["var x = %s" % expr, "print(x)"], ["fun inc(a) {", "\treturn a + 1", "}"]
+    )
+
+
+def nested_casts(depth):
+    """
+    Generates a sim-C program with depth explicit type casts nested in each other
+    """
+
+    expr = "int(" * depth + "1.5" + ")" * depth
+
+    return main_program(["var x = %s" % expr, "print(x)"])
+
+
+def run_series(title, generate, sizes, tmp_dir):
+    """
+    Compiles the generated program for each size and prints the time, doubling the size should roughly double
+    the time
+    """
+
+    print("%-22s  %10s  %12s  %10s" % (title, "size", "seconds", "ratio"))
+
+    previous = None
+    for size in sizes:
+        source_path = write_source(tmp_dir, generate(size))
+        c_path = os.path.join(tmp_dir, "bench.c")
+        _, elapsed = timed(lambda: compile_source(source_path, c_path))
+
+        print(
+            "%-22s  %10d  %12.4f  %10.2f"
+            % ("", size, elapsed, growth_ratio(elapsed, previous))
+        )
+        previous = elapsed
+
+    print()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_series(
+            "operators", long_expression, [12500, 25000, 50000, 100000], tmp_dir
+        )
+        run_series("nested parentheses", nested_parens, [2500, 5000, 10000], tmp_dir)
+        run_series("nested calls", nested_calls, [2500, 5000, 10000], tmp_dir)
+        run_series("nested type casts", nested_casts, [2500, 5000, 10000], tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
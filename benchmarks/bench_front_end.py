@@ -0,0 +1,65 @@
+# Benchmark for the front end of modules, a program imports many large modules and the time taken to compile
+# it is compared between lexing and parsing modules one after another and in a pool of processes
+import os
+import contextlib
+
+from common import (
+    calling_program,
+    function_module,
+    installed_modules,
+    temporary_working_directory,
+    timed,
+    write_source,
+)
+
+from simc.simc import compile_file
+
+# Prefix of names of modules generated for the benchmark
+MODULE_PREFIX = "bench_front_end_lib"
+
+
+def main():
+    num_modules = 8
+    num_functions = 600
+    jobs = os.cpu_count() or 1
+
+    # Every module has names of its own, calls reach the last function of every module
+    modules = {
+        "%s%d" % (MODULE_PREFIX, index): function_module(
+            num_functions, "m%d_" % index
+        )
+        for index in range(num_modules)
+    }
+    program = calling_program(
+        list(modules),
+        [
+            ("gm%d_%d" % (index, num_functions - 1), index)
+            for index in range(num_modules)
+        ],
+    )
+
+    print("%-10s  %14s" % ("jobs", "seconds"))
+
+    outputs = []
+    with installed_modules(modules):
+        for num_jobs in [1, jobs]:
+            # Build cache is disabled so that every run lexes and parses all modules
+            with temporary_working_directory() as tmp_dir:
+                filename = write_source(tmp_dir, program, "prog.simc")
+
+                with contextlib.redirect_stdout(None):
+                    c_filename, elapsed = timed(
+                        lambda: compile_file(filename, use_cache=False, jobs=num_jobs)
+                    )
+
+                with open(c_filename) as file:
+                    outputs.append(file.read())
+
+                print("%-10d  %14.4f" % (num_jobs, elapsed))
+
+    if outputs[0] != outputs[-1]:
+        print("generated C code differs between jobs")
+
+
+if __name__ == "__main__":
+    main()
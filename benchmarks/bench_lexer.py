@@ -0,0 +1,67 @@
+# Benchmark comparing the table driven scanner with the legacy character by character scanner
+import tempfile
+
+from common import corpus_paths, timed, write_source
+
+from simc.symbol_table import SymbolTable
+from simc.lexical_analyzer import LexicalAnalyzer
+
+
+def generate_source(num_copies):
+    """
+    Generates a large source by concatenating the simc-codes corpus (the lexer does not check structure)
+
+    Params
+    ======
+    num_copies (int) = Number of times the corpus is repeated
+
+    Returns
+    =======
+    string: Source code to be lexed
+    """
+
+    corpus = ""
+    for path in corpus_paths():
+        with open(path) as file:
+            corpus += file.read() + "\n"
+
+    return corpus * num_copies
+
+
+def time_lexer(source_path, scanner):
+    """
+    Returns number of tokens generated and time taken (in seconds) by the scanner
+    """
+
+    (tokens, _), elapsed = timed(
+        lambda: LexicalAnalyzer(
+            source_path, SymbolTable(), scanner=scanner
+        ).lexical_analyze()
+    )
+
+    return len(tokens), elapsed
+
+
+def main():
+    sizes = [1, 4, 16]
+
+    print(
+        "%8s  %10s  %12s  %12s  %10s"
+        % ("copies", "tokens", "legacy (s)", "table (s)", "speedup")
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            source_path = write_source(tmp_dir, generate_source(size))
+
+            num_tokens, legacy_time = time_lexer(source_path, "legacy")
+            _, table_time = time_lexer(source_path, "table")
+
+            print(
+                "%8d  %10d  %12.4f  %12.4f  %10.2f"
+                % (size, num_tokens, legacy_time, table_time, legacy_time / table_time)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Benchmark for pruning of module code, a program uses a few functions of a large module and the size of
+# generated header and the time taken by cc to compile it are reported
+import os
+import shutil
+import tempfile
+import subprocess
+
+from common import calling_program, timed, write_source
+
+from simc.simc import compile_string
+
+
+def generate_module(num_functions):
+    """
+    Generates a sim-C module with num_functions functions, every function calls the previous one so that
+    functions used by the program reach a few others
+
+    Params
+    ======
+    num_functions (int) = Number of functions in module
+
+    Returns
+    =======
+    string: The sim-C source code of module
+    """
+
+    lines = [
+        "var offset = 1",
+        "var unused_offset = 2",
+        "",
+        "fun f0(x0) {",
+        "\treturn x0 + offset",
+        "}",
+        "",
+    ]
+
+    # Every function has names of its own, reusing names of parameters across many functions isn't supported
+    for i in range(1, num_functions):
+        lines.extend(
+            [
+                "fun f%d(x%d) {" % (i, i),
+                "\tvar y%d = f%d(x%d) * %d" % (i, i - 1, i, i),
+                "\treturn y%d + %d" % (i, i),
+                "}",
+                "",
+            ]
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_program(used):
+    """
+    Generates a sim-C program which calls the given functions of module
+
+    Params
+    ======
+    used (list) = Indices of functions called by program
+
+    Returns
+    =======
+    string: The sim-C source code of program
+    """
+
+    return calling_program(["stdlib_like"], [("f%d" % i, i) for i in used])
+
+
+def time_cc(c_code, header, tmp_dir):
+    """
+    Compiles generated C code with cc and returns the elapsed time in seconds, None if cc isn't available
+    """
+
+    cc = shutil.which("cc")
+    if cc is None:
+        return None
+
+    write_source(tmp_dir, header, "stdlib_like.h")
+    c_path = write_source(tmp_dir, c_code, "bench.c")
+    o_path = os.path.join(tmp_dir, "bench.o")
+
+    _, elapsed = timed(
+        lambda: subprocess.run([cc, "-c", c_path, "-o", o_path], check=True)
+    )
+
+    return elapsed
+
+
+def main():
+    num_functions = 2000
+    module = generate_module(num_functions)
+
+    print(
+        "%14s  %12s  %14s  %12s"
+        % ("used functions", "header KiB", "simc seconds", "cc seconds")
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for used in [[3], [3, 50], [3, 50, 400], [num_functions - 1]]:
+            source = generate_program(used)
+            result, elapsed = timed(
+                lambda: compile_string(source, modules={"stdlib_like": module})
+            )
+
+            header = result.headers["stdlib_like.h"]
+            cc_time = time_cc(result.c_code, header, tmp_dir)
+            print(
+                "%14s  %12.1f  %14.4f  %12s"
+                % (
+                    ",".join(map(str, used)),
+                    len(header) / 1024,
+                    elapsed,
+                    "-" if cc_time is None else "%.4f" % cc_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
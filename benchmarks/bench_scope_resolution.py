@@ -0,0 +1,61 @@
+# Benchmark for scope resolution of deeply nested, identifier heavy programs
+import tempfile
+
+from common import growth_ratio, main_program, timed, write_source
+
+from simc.symbol_table import SymbolTable
+from simc.lexical_analyzer import LexicalAnalyzer
+
+
+def generate_program(depth, uses_per_block):
+    """
+    Generates a sim-C program with depth nested blocks, every block shadows the same variable names and uses
+    them many times
+
+    Params
+    ======
+    depth          (int) = Number of nested blocks
+    uses_per_block (int) = Number of statements using variables in every block
+
+    Returns
+    =======
+    string: The sim-C source code
+    """
+
+    statements = ["var x = 0", "var y = 1"]
+    for level in range(depth):
+        indent = "\t" * (level + 1)
+        statements.append(indent[:-1] + "{")
+        statements.append(indent + "var x = %d" % level)
+        for _ in range(uses_per_block):
+            statements.append(indent + "x = x + y")
+    for level in reversed(range(depth)):
+        statements.append("\t" * level + "}")
+    statements.append("print(x)")
+
+    return main_program(statements)
+
+
+def main():
+    sizes = [(25, 40), (50, 40), (100, 40), (200, 40), (400, 40)]
+
+    print("%8s  %10s  %12s  %10s" % ("depth", "tokens", "seconds", "ratio"))
+
+    previous = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for depth, uses in sizes:
+            source_path = write_source(tmp_dir, generate_program(depth, uses))
+
+            # Identifiers are resolved while the lexical analyzer generates tokens
+            (tokens, _), elapsed = timed(
+                lambda: LexicalAnalyzer(source_path, SymbolTable()).lexical_analyze()
+            )
+
+            # Doubling the depth doubles the program, time should roughly double too
+            ratio = growth_ratio(elapsed, previous)
+            print("%8d  %10d  %12.4f  %10.2f" % (depth, len(tokens), elapsed, ratio))
+            previous = elapsed
+
+
+if __name__ == "__main__":
+    main()
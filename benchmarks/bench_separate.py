@@ -0,0 +1,89 @@
+# Benchmark for separate compilation of modules, many programs import the same large module and the time taken
+# by simc and cc to build all of them is compared between module headers with definitions and cached object files
+import os
+import contextlib
+
+from common import (
+    calling_program,
+    function_module,
+    installed_modules,
+    temporary_working_directory,
+    timed,
+    write_source,
+)
+
+import simc.build_cache as build_cache
+from simc.simc import compile_file
+from simc.toolchain import DEFAULT_CFLAGS, find_c_compiler, run_c_compiler
+
+# Name of module generated for the benchmark
+MODULE_NAME = "bench_separate_lib"
+
+
+def build_programs(filenames, link):
+    """
+    Builds executables of programs, returns the seconds taken by simc and cc together
+
+    Params
+    ======
+    filenames (list) = Paths of sim-C programs
+    link      (bool) = Whether modules are compiled separately to cached object files and linked, otherwise the
+                       C file of each program is compiled with the module header having all definitions (with the
+                       same flags of C compiler)
+
+    Returns
+    =======
+    float: Seconds taken to build all programs
+    """
+
+    cc = find_c_compiler()
+
+    def build():
+        for filename in filenames:
+            with contextlib.redirect_stdout(None):
+                c_filename = compile_file(filename, link=link)
+
+            if not link:
+                exe_filename = os.path.splitext(c_filename)[0]
+                run_c_compiler(
+                    [cc]
+                    + DEFAULT_CFLAGS
+                    + ["-I", ".", c_filename, "-o", exe_filename, "-lm"]
+                )
+
+    _, elapsed = timed(build)
+
+    return elapsed
+
+
+def main():
+    num_programs = 8
+    num_functions = 1500
+
+    module = function_module(num_functions)
+    program = calling_program(
+        [MODULE_NAME], [("g%d" % i, i) for i in range(num_functions)]
+    )
+
+    print("%-24s  %14s" % ("mode", "seconds"))
+
+    with installed_modules({MODULE_NAME: module}):
+        for title, link in [
+            ("header with definitions", False),
+            ("separate, cached object", True),
+        ]:
+            # Every mode starts with an empty build cache, generated files are written to the current directory
+            with temporary_working_directory() as tmp_dir:
+                build_cache.CACHE_DIR = os.path.join(tmp_dir, "cache")
+
+                filenames = [
+                    write_source(tmp_dir, program, "prog%d.simc" % i)
+                    for i in range(num_programs)
+                ]
+
+                elapsed = build_programs(filenames, link)
+                print("%-24s  %14.4f" % (title, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Benchmark for startup time of compiler, the time taken to import simc is measured with python -X importtime
+# and checked against a budget, and a short compilation is timed through python -m simc
+#
+# Usage: python benchmarks/bench_startup.py [--budget-ms 60] [--runs 10]
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+from common import REPO_DIR, timed, write_source
+
+# Program compiled to time a short compilation
+PROGRAM = "MAIN\n\tvar a = 1\n\tprint(a)\nEND_MAIN\n"
+
+
+def environment():
+    """
+    Returns environment of processes started, the simc package of repository is importable and its bytecode is
+    cached like it is for an installed package
+    """
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    return env
+
+
+def import_times(module):
+    """
+    Import a module in a new interpreter with -X importtime
+
+    Params
+    ======
+    module (string) = Name of module
+
+    Returns
+    =======
+    dict: Name of every module imported -> (self microseconds, cumulative microseconds)
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        env=environment(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    # Lines look like: import time:   self [us] | cumulative | imported package
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+
+    return times
+
+
+def time_command(command, runs, cwd):
+    """
+    Returns the fastest wall clock time of a command in seconds
+    """
+
+    _, best = timed(
+        lambda: subprocess.run(
+            command,
+            env=environment(),
+            cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        ),
+        runs,
+    )
+
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Measure startup time of the sim-C compiler"
+    )
+    arg_parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=60.0,
+        help="Milliseconds importing simc.simc may take",
+    )
+    arg_parser.add_argument(
+        "--runs", type=int, default=10, help="Number of runs, the fastest is kept"
+    )
+    options = arg_parser.parse_args()
+
+    # Cumulative time of simc is the time taken by imports of compiler (and the modules they import), the first
+    # import writes bytecode of modules which changed
+    import_times("simc.simc")
+    runs = [import_times("simc.simc") for _ in range(options.runs)]
+    best = min(runs, key=lambda times: times["simc"][1])
+    import_ms = best["simc"][1] / 1000
+
+    print("Importing simc.simc takes %.1f ms, slowest modules:" % import_ms)
+    slowest = sorted(best.items(), key=lambda item: -item[1][0])[:10]
+    for name, (self_us, cumulative_us) in slowest:
+        print(
+            "    %-40s  %8.1f ms  %8.1f ms"
+            % (name, self_us / 1000, cumulative_us / 1000)
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = write_source(tmp_dir, PROGRAM, "startup.simc")
+
+        print("\n%-28s  %12s" % ("short compilation", "seconds"))
+        for title, command in [
+            ("python -c pass", [sys.executable, "-c", "pass"]),
+            ("python -m simc", [sys.executable, "-m", "simc"]),
+        ]:
+            if command[-1] != "pass":
+                command = command + [filename, "--no-cache"]
+
+            elapsed = time_command(command, options.runs, tmp_dir)
+            print("%-28s  %12.4f" % (title, elapsed))
+
+    if import_ms > options.budget_ms:
+        print(
+            "\033[91mImporting simc.simc takes %.1f ms, over the budget of %.1f ms \033[m"
+            % (import_ms, options.budget_ms)
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
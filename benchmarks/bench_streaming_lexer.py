@@ -0,0 +1,80 @@
+# Benchmark comparing peak memory of lexing a large source at once and streaming its tokens
+import os
+import tempfile
+import tracemalloc
+
+from common import main_program, timed, write_source
+
+from simc.symbol_table import SymbolTable
+from simc.lexical_analyzer import LexicalAnalyzer
+
+
+def generate_source(num_lines):
+    """
+    Generates a large source made of statements reusing a few identifiers and constants
+
+    Params
+    ======
+    num_lines (int) = Number of statements
+
+    Returns
+    =======
+    string: Source code to be lexed
+    """
+
+    statements = ["var total = 0"]
+    statements.extend(["total = total + (3 * 7) // running total"] * num_lines)
+
+    return main_program(statements)
+
+
+def measure(source_path, streaming):
+    """
+    Returns number of tokens, peak traced memory and time taken to lex the source
+    """
+
+    def lex():
+        lexical_analyzer = LexicalAnalyzer(source_path, SymbolTable())
+        if streaming:
+            return sum(1 for _ in lexical_analyzer.iter_tokens())
+
+        tokens, _ = lexical_analyzer.lexical_analyze()
+        return len(tokens)
+
+    tracemalloc.start()
+    num_tokens, elapsed = timed(lex)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return num_tokens, peak, elapsed
+
+
+def main():
+    sizes = [5000, 20000, 80000]
+
+    print(
+        "%10s  %10s  %10s  %12s  %10s"
+        % ("MiB", "mode", "tokens", "peak (MiB)", "seconds")
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            source_path = write_source(tmp_dir, generate_source(size))
+            source_size = os.path.getsize(source_path) / 2 ** 20
+
+            for streaming in [False, True]:
+                num_tokens, peak, elapsed = measure(source_path, streaming)
+                print(
+                    "%10.1f  %10s  %10d  %12.2f  %10.4f"
+                    % (
+                        source_size,
+                        "stream" if streaming else "list",
+                        num_tokens,
+                        peak / 2 ** 20,
+                        elapsed,
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Benchmark for symbol table lookups, compile time should grow roughly linearly with symbol count
+import os
+import tempfile
+
+from common import compile_source, growth_ratio, main_program, timed, write_source
+
+
+def generate_program(num_symbols):
+    """
+    Generates a sim-C program which declares num_symbols variables, each one depending on the previous one
+
+    Params
+    ======
+    num_symbols (int) = Number of variables to be declared
+
+    Returns
+    =======
+    string: The sim-C source code
+    """
+
+    statements = ["var v0 = 0"]
+    for i in range(1, num_symbols):
+        statements.append("var v%d = v%d + %d" % (i, i - 1, i))
+    statements.append("print(v%d)" % (num_symbols - 1))
+
+    return main_program(statements)
+
+
+def main():
+    sizes = [500, 1000, 2000, 4000, 8000]
+
+    print("%10s  %12s  %10s" % ("symbols", "seconds", "ratio"))
+
+    previous = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            source_path = write_source(tmp_dir, generate_program(size))
+            c_path = os.path.join(tmp_dir, "bench.c")
+            _, elapsed = timed(lambda: compile_source(source_path, c_path))
+
+            # With linear growth doubling the symbols should roughly double the time
+            ratio = growth_ratio(elapsed, previous)
+            print("%10d  %12.4f  %10.2f" % (size, elapsed, ratio))
+            previous = elapsed
+
+
+if __name__ == "__main__":
+    main()
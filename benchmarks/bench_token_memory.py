@@ -0,0 +1,100 @@
+# Benchmark for memory used by tokens and opcodes over the simc-codes corpus scaled up
+import sys
+import copy
+import tracemalloc
+
+from common import corpus_paths
+
+from simc.symbol_table import SymbolTable
+from simc.lexical_analyzer import LexicalAnalyzer
+from simc.parser.simc_parser import parse
+from simc.token_class import TokenStream
+
+
+class DictToken:
+    """
+    Token with a per-instance __dict__ and string type, used as the reference for comparison
+    """
+
+    def __init__(self, type, val, line_num):
+        self.type = type
+        self.val = val
+        self.line_num = line_num
+
+
+class DictOpCode:
+    """
+    OpCode with a per-instance __dict__, string type and the value rendered as a string, used as the reference
+    for comparison
+    """
+
+    def __init__(self, opcode, val, dtype=None):
+        self.type = opcode
+        self.val = val
+        self.dtype = dtype
+
+
+def traced_size(build):
+    """
+    Returns the result of build and the memory it allocated (in bytes) that is still alive
+    """
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, after - before
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    # Lex and parse every program of the corpus once
+    all_tokens = []
+    all_opcodes = []
+    for path in corpus_paths():
+        table = SymbolTable()
+        tokens, _ = LexicalAnalyzer(path, table).lexical_analyze()
+        all_tokens.extend(tokens)
+        all_opcodes.extend(parse(tokens, table))
+
+    # Scale the corpus up by copying it
+    all_tokens = all_tokens * scale
+    all_opcodes = all_opcodes * scale
+
+    print("%d tokens, %d opcodes" % (len(all_tokens), len(all_opcodes)))
+    print("%-28s  %12s  %14s" % ("representation", "KiB", "bytes / item"))
+
+    def report(name, build, count):
+        _, size = traced_size(build)
+        print("%-28s  %12.1f  %14.1f" % (name, size / 1024, size / count))
+
+    report(
+        "tokens (__dict__)",
+        lambda: [DictToken(t.type, t.val, t.line_num) for t in all_tokens],
+        len(all_tokens),
+    )
+    report(
+        "tokens (__slots__)",
+        lambda: [type(t)(t.type, t.val, t.line_num) for t in all_tokens],
+        len(all_tokens),
+    )
+    report("tokens (TokenStream)", lambda: TokenStream(all_tokens), len(all_tokens))
+    report(
+        "opcodes (__dict__)",
+        lambda: [DictOpCode(o.type, o.val, o.dtype) for o in all_opcodes],
+        len(all_opcodes),
+    )
+    # Statements of syntax tree have a constructor each, so they are copied together with their expressions
+    # (each one separately so that statements repeated by scaling are copied again)
+    report(
+        "opcodes (syntax tree)",
+        lambda: [copy.deepcopy(o) for o in all_opcodes],
+        len(all_opcodes),
+    )
+
+
+if __name__ == "__main__":
+    main()
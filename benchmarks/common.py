@@ -0,0 +1,201 @@
+# Scaffolding shared by the benchmarks, importing this module makes the local simc package importable when a
+# benchmark is run from the repository, and the helpers generate, write, compile and time programs
+import os
+import sys
+import time
+import tempfile
+import contextlib
+
+# Root of repository, the local simc package is imported from here
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_DIR)
+
+from simc.symbol_table import SymbolTable
+from simc.lexical_analyzer import LexicalAnalyzer, MODULE_DIR
+from simc.parser.simc_parser import parse
+from simc.compiler import compile
+
+
+def corpus_paths():
+    """
+    Returns paths of all sim-C programs in the simc-codes directory
+    """
+
+    codes_dir = os.path.join(REPO_DIR, "simc-codes")
+
+    return sorted(
+        os.path.join(codes_dir, name)
+        for name in os.listdir(codes_dir)
+        if name.endswith(".simc")
+    )
+
+
+def main_program(statements, definitions=()):
+    """
+    Generates a sim-C program running statements in MAIN
+
+    Params
+    ======
+    statements  (iterable) = Lines of MAIN, each one is indented by a tab
+    definitions (iterable) = Lines before MAIN, like imports and functions
+
+    Returns
+    =======
+    string: The sim-C source code
+    """
+
+    lines = list(definitions)
+    if lines and lines[-1]:
+        lines.append("")
+    lines.append("MAIN")
+    lines.extend("\t" + statement for statement in statements)
+    lines.append("END_MAIN")
+
+    return "\n".join(lines) + "\n"
+
+
+def function_module(num_functions, prefix=""):
+    """
+    Generates a sim-C module with num_functions independent functions named g<prefix><index>, each having a few
+    statements
+
+    Params
+    ======
+    num_functions (int)    = Number of functions in module
+    prefix        (string) = Prefix of names, keeps names unique across modules
+
+    Returns
+    =======
+    string: The sim-C source code of module
+    """
+
+    lines = []
+    for i in range(num_functions):
+        name = "%s%d" % (prefix, i)
+        lines.extend(
+            [
+                "fun g%s(a%s) {" % (name, name),
+                "\tvar b%s = a%s * %d + 1" % (name, name, i),
+                "\tvar c%s = b%s * b%s - a%s" % (name, name, name, name),
+                "\treturn c%s + b%s" % (name, name),
+                "}",
+                "",
+            ]
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def calling_program(module_names, calls):
+    """
+    Generates a sim-C program which imports modules and prints the results of calls
+
+    Params
+    ======
+    module_names (list) = Names of modules imported
+    calls        (list) = (name of function, integer argument) of every call
+
+    Returns
+    =======
+    string: The sim-C source code of program
+    """
+
+    return main_program(
+        ["print(%s(%d))" % call for call in calls],
+        ["import " + name for name in module_names],
+    )
+
+
+def write_source(directory, source, name="bench.simc"):
+    """
+    Writes source code to a file of directory and returns its path
+    """
+
+    path = os.path.join(directory, name)
+    with open(path, "w") as file:
+        file.write(source)
+
+    return path
+
+
+def compile_source(source_path, c_path, table=None):
+    """
+    Runs the full compiler pipeline on a source file and returns the symbol table
+
+    Params
+    ======
+    source_path (string)      = Path of sim-C source file
+    c_path      (string)      = Path of C file written
+    table       (SymbolTable) = Symbol table used, a new one by default
+    """
+
+    if table is None:
+        table = SymbolTable()
+    tokens, _ = LexicalAnalyzer(source_path, table).lexical_analyze()
+    compile(parse(tokens, table), c_path, table)
+
+    return table
+
+
+def timed(function, repeat=1):
+    """
+    Calls function repeat times, the fastest call is kept so that other processes disturb the result less
+
+    Returns
+    =======
+    any:   Result of the last call
+    float: Seconds taken by the fastest call
+    """
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return result, best
+
+
+def growth_ratio(elapsed, previous):
+    """
+    Returns the ratio of time to time of previous size, nan for the first size
+    """
+
+    return elapsed / previous if previous else float("nan")
+
+
+@contextlib.contextmanager
+def installed_modules(sources):
+    """
+    Installs generated modules next to the standard modules while the context runs
+
+    Params
+    ======
+    sources (dict) = Module name -> sim-C source code
+    """
+
+    os.makedirs(MODULE_DIR, exist_ok=True)
+    paths = []
+    try:
+        for name, source in sources.items():
+            paths.append(write_source(MODULE_DIR, source, name + ".simc"))
+        yield
+    finally:
+        for path in paths:
+            os.remove(path)
+
+
+@contextlib.contextmanager
+def temporary_working_directory():
+    """
+    Runs the context in a new temporary directory, the compiler writes generated files to the current directory
+    """
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            yield tmp_dir
+        finally:
+            os.chdir(cwd)
@@ -0,0 +1,462 @@
+# Benchmark suite measuring every stage of the compiler on synthetic programs of growing size, the growth
+# exponent of each stage is fitted so that super-linear stages stand out, results are saved as JSON and can be
+# checked against a baseline (the exit status is 1 if a growth exponent increased, slower times are only reported)
+#
+# Usage: python benchmarks/suite.py [--max-tokens N] [--output results.json] [--baseline old.json]
+import sys
+import gc
+import json
+import math
+import time
+import argparse
+import platform
+import statistics
+
+from common import calling_program, main_program
+
+from simc.simc import compile_string
+from simc.compile_stats import CompileStats
+
+
+def many_functions(n):
+    """
+    Program with n small functions, every function has the same names of parameters and variables
+    """
+
+    functions = []
+    for i in range(n):
+        functions.extend(
+            ["fun f%d(a) {" % i, "\tvar b = a * %d + 1" % i, "\treturn b - a", "}", ""]
+        )
+
+    return main_program(["print(f0(1))"], functions), {}
+
+
+def deep_nesting(n):
+    """
+    Program with n nested if blocks, statements after a nested block aren't supported so only the innermost
+    block has a statement
+    """
+
+    statements = ["var x = 1"]
+    for depth in range(n):
+        statements.append("\t" * depth + "if(x > %d) {" % depth)
+    statements.append("\t" * n + "print(x)")
+    for depth in reversed(range(n)):
+        statements.append("\t" * depth + "}")
+
+    return main_program(statements), {}
+
+
+def long_expression(n):
+    """
+    Program with a single expression of n terms
+    """
+
+    expression = " + ".join("x * %d" % i for i in range(n))
+
+    return main_program(["var x = 1", "var y = " + expression, "print(y)"]), {}
+
+
+def many_literals(n):
+    """
+    Program declaring n variables initialized with number and string literals
+    """
+
+    statements = []
+    for i in range(n):
+        if i % 2 == 0:
+            statements.append("var v%d = %d.5" % (i, i))
+        else:
+            statements.append('var v%d = "s%d"' % (i, i))
+    statements.append("print(v0)")
+
+    return main_program(statements), {}
+
+
+def many_imports(n):
+    """
+    Program importing n modules and calling a function of each, modules are compiled from memory
+    """
+
+    modules = {
+        "lib%d" % i: "fun g%d(a) {\n\treturn a * 2\n}\n\n"
+        "fun h%d(a) {\n\treturn a + 1\n}\n" % (i, i)
+        for i in range(n)
+    }
+    source = calling_program(list(modules), [("g%d" % i, i) for i in range(n)])
+
+    return source, modules
+
+
+def big_initializers(n):
+    """
+    Program with a structure of n members and an array initialized with n values
+    """
+
+    struct = ["struct point {"]
+    struct.extend("\tvar m%d = %d" % (i, i) for i in range(n))
+    struct.append("}")
+
+    values = ", ".join(str(i) for i in range(n))
+    statements = ["point p", "var arr[%d] = {%s}" % (n, values), "print(arr[0])"]
+
+    return main_program(statements, struct), {}
+
+
+# Name of workload -> generator(n) returning source code and modules for a program growing with n
+WORKLOADS = {
+    "many_functions": many_functions,
+    "deep_nesting": deep_nesting,
+    "long_expression": long_expression,
+    "many_literals": many_literals,
+    "many_imports": many_imports,
+    "big_initializers": big_initializers,
+}
+
+# Stages measured, scope resolution runs while lexing so it is part of lex
+STAGES = ["lex", "link", "parse", "prune", "compile"]
+
+# Seconds below which the time of a stage is mostly noise and constant costs, such times aren't fitted
+MIN_FITTED_SECONDS = 0.005
+
+# Seconds a whole compilation must take in the baseline to compare its time, faster ones vary too much from run
+# to run and the growth exponents catch their regressions
+MIN_COMPARED_SECONDS = 0.1
+
+
+def measure(source, modules):
+    """
+    Compile a program once and return the number of tokens and the seconds taken by every stage
+
+    Params
+    ======
+    source  (string) = sim-C source code of program
+    modules (dict)   = Module name -> sim-C source code imported by program
+
+    Returns
+    =======
+    int:  Number of tokens of program and its modules
+    dict: Stage -> seconds, total is the sum of stages
+    """
+
+    # Collections of garbage are left out of timings (as timeit does), their pauses vary from run to run
+    stats = CompileStats()
+    gc.collect()
+    gc.disable()
+    try:
+        compile_string(source, modules=modules, stats=stats)
+    finally:
+        gc.enable()
+
+    # Stages of modules are added to the stages of source code
+    seconds = dict.fromkeys(STAGES, 0.0)
+    num_tokens = 0
+    for stage in stats.stages:
+        seconds[stage.stage] = seconds.get(stage.stage, 0.0) + stage.wall
+        if stage.stage == "lex":
+            num_tokens += stage.tokens
+    seconds["total"] = sum(seconds.values())
+
+    return num_tokens, seconds
+
+
+def token_growth(generator):
+    """
+    Returns how the number of tokens of a workload grows with size, tokens = fixed + per_unit * size
+
+    Params
+    ======
+    generator (function) = Generator of workload
+
+    Returns
+    =======
+    float: Tokens of program which don't depend on size
+    float: Tokens added for every unit of size
+    """
+
+    small_tokens, _ = measure(*generator(16))
+    large_tokens, _ = measure(*generator(64))
+    per_unit = (large_tokens - small_tokens) / 48
+
+    return small_tokens - 16 * per_unit, per_unit
+
+
+def growth_exponent(points):
+    """
+    Fit seconds = c * tokens ^ k by least squares on a log-log scale, 1 is linear and 2 is quadratic
+
+    Params
+    ======
+    points (list) = (tokens, seconds) of every size
+
+    Returns
+    =======
+    float: The exponent k, None if there are too few points
+    """
+
+    points = [(tokens, seconds) for tokens, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+
+    xs = [math.log(tokens) for tokens, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def run_workload(name, targets, repeat, budget):
+    """
+    Measure a workload at every size, larger sizes are skipped once compiling them is expected to take longer
+    than the budget
+
+    Every round of repeats compiles each size once, so that the machine getting slower for a while slows all
+    sizes alike rather than bending the growth exponents
+
+    Params
+    ======
+    name    (string) = Name of workload
+    targets (list)   = Number of tokens of each size
+    repeat  (int)    = Number of times each program is compiled, the median time of each stage is kept
+    budget  (float)  = Seconds a single compilation may take before larger sizes are skipped
+
+    Returns
+    =======
+    dict: Sizes measured and growth exponents of stages
+    """
+
+    generator = WORKLOADS[name]
+    fixed, per_unit = token_growth(generator)
+
+    # Sizes are picked with one compilation each, which also warms up the compiler
+    sizes = []
+    programs = []
+    for target in targets:
+        # Time of next size is extrapolated with the growth of the last two sizes (at least linear)
+        if sizes:
+            exponent = 1.0
+            if len(sizes) >= 2:
+                exponent = growth_exponent(
+                    [(size["tokens"], size["seconds"]["total"]) for size in sizes[-2:]]
+                )
+                exponent = max(1.0, exponent or 1.0)
+
+            last = sizes[-1]
+            expected = last["seconds"]["total"] * (target / last["target"]) ** exponent
+            if expected > budget:
+                break
+
+        n = max(1, round((target - fixed) / per_unit))
+        program = generator(n)
+        num_tokens, seconds = measure(*program)
+        programs.append(program)
+        sizes.append(
+            {"target": target, "n": n, "tokens": num_tokens, "seconds": seconds}
+        )
+
+    runs = [{} for _ in sizes]
+    for _ in range(repeat):
+        for program, times in zip(programs, runs):
+            _, seconds = measure(*program)
+            for stage, elapsed in seconds.items():
+                times.setdefault(stage, []).append(elapsed)
+
+    for size, times in zip(sizes, runs):
+        size["seconds"] = {
+            stage: statistics.median(elapsed) for stage, elapsed in times.items()
+        }
+
+    # Small programs are dominated by constant costs, so only the largest sizes are fitted (and only the sizes at
+    # which a stage takes long enough to be measured)
+    fitted = sizes[-3:]
+    exponents = {
+        stage: growth_exponent(
+            [
+                (size["tokens"], size["seconds"][stage])
+                for size in fitted
+                if size["seconds"][stage] >= MIN_FITTED_SECONDS
+            ]
+        )
+        for stage in STAGES + ["total"]
+    }
+
+    return {"sizes": sizes, "exponents": exponents}
+
+
+def check_regressions(results, baseline, threshold, exponent_threshold):
+    """
+    Compare results with a baseline, a stage regresses if it grows faster with size, times depend on the load of
+    the machine so a workload that got slower at the largest size measured by both is only reported as a slowdown
+
+    Params
+    ======
+    results            (dict)  = Results of this run
+    baseline           (dict)  = Results of an earlier run
+    threshold          (float) = Relative slowdown allowed, 0.5 allows 50% more time
+    exponent_threshold (float) = Increase of growth exponent allowed
+
+    Returns
+    =======
+    list: Description of every regression
+    list: Description of every slowdown
+    """
+
+    regressions = []
+    slowdowns = []
+    for name, workload in results["workloads"].items():
+        old_workload = baseline["workloads"].get(name)
+        if old_workload is None:
+            continue
+
+        old_sizes = {size["target"]: size for size in old_workload["sizes"]}
+        common = [size for size in workload["sizes"] if size["target"] in old_sizes]
+
+        if common:
+            size = common[-1]
+            old_seconds = old_sizes[size["target"]]["seconds"]["total"]
+            new_seconds = size["seconds"]["total"]
+            if (
+                old_seconds >= MIN_COMPARED_SECONDS
+                and new_seconds > old_seconds * (1 + threshold)
+            ):
+                slowdowns.append(
+                    "%s: %.4fs -> %.4fs at %d tokens"
+                    % (name, old_seconds, new_seconds, size["tokens"])
+                )
+
+        for stage in STAGES + ["total"]:
+            old_exponent = old_workload["exponents"].get(stage)
+            new_exponent = workload["exponents"].get(stage)
+            if (
+                old_exponent is not None
+                and new_exponent is not None
+                and new_exponent > old_exponent + exponent_threshold
+            ):
+                regressions.append(
+                    "%s %s: growth exponent %.2f -> %.2f"
+                    % (name, stage, old_exponent, new_exponent)
+                )
+
+    return regressions, slowdowns
+
+
+def print_results(results):
+    """
+    Print growth exponents of stages and the time taken at the largest size of every workload
+    """
+
+    # Growth exponents are shown for every stage
+    print(
+        "%-18s  %10s  %10s  " % ("workload", "tokens", "seconds")
+        + "  ".join("%8s" % stage for stage in STAGES + ["total"])
+    )
+
+    for name, workload in results["workloads"].items():
+        largest = workload["sizes"][-1]
+        exponents = [
+            "-"
+            if workload["exponents"][stage] is None
+            else "%.2f" % workload["exponents"][stage]
+            for stage in STAGES + ["total"]
+        ]
+        print(
+            "%-18s  %10d  %10.4f  "
+            % (name, largest["tokens"], largest["seconds"]["total"])
+            + "  ".join("%8s" % exponent for exponent in exponents)
+        )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Measure stages of the compiler on programs of growing size"
+    )
+    arg_parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=10 ** 5,
+        help="Size of the largest programs in tokens (sizes are powers of 10 from 100)",
+    )
+    arg_parser.add_argument(
+        "--workloads",
+        nargs="+",
+        choices=sorted(WORKLOADS),
+        default=list(WORKLOADS),
+        help="Workloads to run",
+    )
+    arg_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=7,
+        help="Number of times each program is compiled, the median time is kept",
+    )
+    arg_parser.add_argument(
+        "--budget",
+        type=float,
+        default=10.0,
+        help="Seconds one compilation may take before larger sizes of a workload are skipped",
+    )
+    arg_parser.add_argument("--output", help="Path of JSON file to save results to")
+    arg_parser.add_argument("--baseline", help="Path of JSON results to compare with")
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Relative slowdown of a workload reported as a slowdown",
+    )
+    arg_parser.add_argument(
+        "--exponent-threshold",
+        type=float,
+        default=0.3,
+        help="Increase of growth exponent of a stage counted as a regression",
+    )
+    options = arg_parser.parse_args()
+
+    targets = []
+    target = 100
+    while target <= options.max_tokens:
+        targets.append(target)
+        target *= 10
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": options.repeat,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "workloads": {},
+    }
+
+    for name in options.workloads:
+        results["workloads"][name] = run_workload(
+            name, targets, options.repeat, options.budget
+        )
+
+    print_results(results)
+
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+
+        regressions, slowdowns = check_regressions(
+            results, baseline, options.threshold, options.exponent_threshold
+        )
+        for slowdown in slowdowns:
+            print("\033[93mSlowdown: %s \033[m" % slowdown)
+        for regression in regressions:
+            print("\033[91mRegression: %s \033[m" % regression)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
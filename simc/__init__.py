@@ -1,3 +1,25 @@
-import simc
-
 __version__ = "0.1-alpha-4"
+
+
+def compile_string(source, modules=None, filename="main.simc", **options):
+    """
+    Compile sim-C source code to C in memory, see simc.simc.compile_string for the other options
+
+    The compiler is imported when this is first called, so importing the package (or a module of it) doesn't
+    load it
+
+    Params
+    ======
+    source   (string) = sim-C source code
+    modules  (dict)   = Module name -> sim-C source code, these are used for imports before installed modules
+    filename (string) = Name of source file used in diagnostics
+
+    Returns
+    =======
+    CompileResult (simc.simc): The generated C code, CompileError (simc.diagnostics) is raised if source code has
+                               errors
+    """
+
+    from .simc import compile_string
+
+    return compile_string(source, modules, filename, **options)
@@ -0,0 +1,4 @@
+# Entry point of python -m simc, it starts faster than the console script made by setuptools
+from .simc import run
+
+run()
@@ -0,0 +1,366 @@
+# Modules for hashing and serializing cached build stages, modules for writing files (tempfile, shutil) are
+# imported when an entry is stored as builds which hit the cache don't need them
+import os
+import hashlib
+import pickle
+from functools import lru_cache
+
+# Version of compiler, part of every cache key
+from . import __version__
+
+# Default directory in which cached stages are stored, it belongs to the user (like $XDG_CACHE_HOME/simc/build)
+# as loading an entry unpickles it, a cache inside the project being compiled could be planted by anyone
+# who can write to the project
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "simc",
+    "build",
+)
+
+# Bump whenever the layout of cached stages changes
+CACHE_FORMAT = 5
+
+# Size of cache directory in bytes above which the least recently used entries are removed
+CACHE_SIZE_LIMIT = 512 * 1024 * 1024
+
+
+def hash_file(path):
+    """
+    Returns hash of the contents of a file
+
+    Params
+    ======
+    path (string) = Path of file to be hashed
+
+    Returns
+    =======
+    string: Hex digest of contents of file
+    """
+
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def compiler_fingerprint():
+    """
+    Returns a hash identifying the compiler, this is the version together with the sources of the compiler
+    so that caches written by a development checkout are invalidated as soon as the compiler changes
+
+    Sources of the compiler don't change while it is running, so they are hashed once per process
+
+    Returns
+    =======
+    string: Hex digest identifying the compiler
+    """
+
+    digest = hashlib.sha256(("%s:%d" % (__version__, CACHE_FORMAT)).encode())
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+
+    for root, dirs, files in os.walk(package_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith(".py"):
+                path = os.path.join(root, filename)
+                digest.update(os.path.relpath(path, package_dir).encode())
+                with open(path, "rb") as file:
+                    digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """
+    BuildCache class stores the results of compiler stages on disk keyed by a hash of their inputs
+    """
+
+    def __init__(self, cache_dir=None, size_limit=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        cache_dir  (string) = Directory in which cached stages are stored, CACHE_DIR if not given
+        size_limit (int)    = Size of cache directory in bytes kept when entries are stored, CACHE_SIZE_LIMIT if
+                              not given
+        """
+
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.size_limit = size_limit or CACHE_SIZE_LIMIT
+        self.fingerprint = compiler_fingerprint()
+
+        # The directory is trimmed once, when the first entry is stored, as listing it costs as much as a build
+        # of a small file
+        self.trimmed = False
+
+    def key(self, *parts):
+        """
+        Returns key for a stage given the hashes/names of all of its inputs
+
+        Params
+        ======
+        parts (tuple) = Strings identifying the inputs of stage
+
+        Returns
+        =======
+        string: Hex digest to be used as key of stage
+        """
+
+        digest = hashlib.sha256(self.fingerprint.encode())
+        for part in parts:
+            digest.update(b"\0" + str(part).encode())
+
+        return digest.hexdigest()
+
+    def __path(self, stage, key):
+        return os.path.join(self.cache_dir, stage + "-" + key + ".pickle")
+
+    def load(self, stage, key):
+        """
+        Returns the cached result of a stage
+
+        Params
+        ======
+        stage (string) = Name of stage
+        key   (string) = Key of stage returned by key()
+
+        Returns
+        =======
+        object: Cached result of stage, None if it was never stored (or can't be read)
+        """
+
+        path = self.__path(stage, key)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except Exception:
+            # A missing, truncated or stale entry is simply a cache miss
+            return None
+
+        self.__touch(path)
+
+        return value
+
+    def store(self, stage, key, value):
+        """
+        Store the result of a stage, the value is serialized immediately so later changes to it are not cached
+
+        Params
+        ======
+        stage (string) = Name of stage
+        key   (string) = Key of stage returned by key()
+        value (object) = Result of stage
+        """
+
+        import tempfile
+
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+
+            # Write to a temporary file and rename it so that concurrent builds never see partial entries
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.__path(stage, key))
+        except Exception:
+            # Failing to cache should never fail the build
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.__trim_once()
+
+    def file_path(self, stage, key, extension):
+        """
+        Returns the path of a file cached for a stage, like an object file compiled by the C compiler
+
+        Params
+        ======
+        stage     (string) = Name of stage
+        key       (string) = Key of stage returned by key()
+        extension (string) = Extension of file including the dot
+
+        Returns
+        =======
+        string: Path of file in cache, it exists only if the file was stored
+        """
+
+        return os.path.join(self.cache_dir, stage + "-" + key + extension)
+
+    def store_file(self, stage, key, extension, path):
+        """
+        Store a copy of a file produced by a stage
+
+        Params
+        ======
+        stage     (string) = Name of stage
+        key       (string) = Key of stage returned by key()
+        extension (string) = Extension of file including the dot
+        path      (string) = Path of file to be stored
+
+        Returns
+        =======
+        string: Path of file in cache, None if it could not be stored
+        """
+
+        import shutil
+        import tempfile
+
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file, open(path, "rb") as source:
+                shutil.copyfileobj(source, file)
+
+            # Executables stay executable when they are restored
+            shutil.copymode(path, temp_path)
+
+            cached_path = self.file_path(stage, key, extension)
+            os.replace(temp_path, cached_path)
+        except Exception:
+            # Failing to cache should never fail the build
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+            return None
+
+        self.__trim_once()
+
+        return cached_path
+
+    def restore_file(self, stage, key, extension, path):
+        """
+        Copy a file stored for a stage to where the stage would have produced it
+
+        The file is copied next to its destination and renamed over it, so an executable which is running
+        can be replaced
+
+        Params
+        ======
+        stage     (string) = Name of stage
+        key       (string) = Key of stage returned by key()
+        extension (string) = Extension of file including the dot
+        path      (string) = Path to which the file is copied
+
+        Returns
+        =======
+        bool: Whether the file was restored, False if it was never stored (or can't be copied)
+        """
+
+        cached_path = self.file_path(stage, key, extension)
+        if not os.path.isfile(cached_path):
+            return False
+
+        import shutil
+        import tempfile
+
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path) or ".", suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as file, open(cached_path, "rb") as source:
+                shutil.copyfileobj(source, file)
+            shutil.copymode(cached_path, temp_path)
+            os.replace(temp_path, path)
+            self.__touch(cached_path)
+
+            return True
+        except Exception:
+            # The file is built again if it can't be restored
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+            return False
+
+    def __touch(self, path):
+        """
+        Mark an entry as used, entries which were used least recently are removed first when the cache is trimmed
+        """
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def __trim_once(self):
+        if not self.trimmed:
+            self.trimmed = True
+            self.trim()
+
+    def entries(self):
+        """
+        Returns the files stored in the cache
+
+        Returns
+        =======
+        list: (modification time, size, path) of every file in cache directory, least recently used first
+        """
+
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                status = os.stat(path)
+            except OSError:
+                # Removed by another build in the meantime
+                continue
+
+            entries.append((status.st_mtime, status.st_size, path))
+
+        entries.sort()
+
+        return entries
+
+    def trim(self):
+        """
+        Remove the least recently used entries until the cache directory is smaller than its size limit
+
+        Returns
+        =======
+        int: Number of entries removed
+        """
+
+        entries = self.entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+
+        removed = 0
+        for _, entry_size, path in entries:
+            if size <= self.size_limit:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            size -= entry_size
+            removed += 1
+
+        return removed
+
+    def clear(self):
+        """
+        Remove every entry of the cache
+
+        Returns
+        =======
+        int: Number of entries removed
+        """
+
+        removed = 0
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+
+        return removed
@@ -0,0 +1,243 @@
+# Module for regular expression to find identifiers in C code kept as text
+import re
+
+# Module for nodes of syntax tree
+from .syntax_tree import Name, Constant, FormatString, Text, Call, Index
+
+# Identifiers in C code like names of variables, functions and structures
+IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+# Fields of statements (strings of C code) which can refer to identifiers, other than the expressions of statement
+REFERENCE_FIELDS = {
+    "assign": ("name",),
+    "ptr_only_assign": ("name",),
+    "array_only_assign": ("name", "size"),
+    "array_assign": ("size",),
+    "array_no_assign": ("size",),
+    "struct_instantiate": ("struct_name",),
+    "for": ("start", "end", "change"),
+    "raw": ("text",),
+}
+
+# Opcodes which declare a global variable when they are outside of functions and structures
+GLOBAL_DECLARATIONS = [
+    "var_assign",
+    "ptr_assign",
+    "var_no_assign",
+    "ptr_no_assign",
+    "array_assign",
+    "array_no_assign",
+]
+
+
+class ModuleItem:
+    """
+    ModuleItem class is a top level part of a module, like a function, a structure or a global variable, with
+    the names it declares and the names its code refers to
+    """
+
+    __slots__ = ("opcodes", "declares", "_references")
+
+    def __init__(self, opcodes, declares):
+        """
+        Class initializer
+
+        Params
+        ======
+        opcodes  (list) = Statements of item
+        declares (list) = Names declared by item, empty if the item must always be kept (like an import)
+        """
+
+        self.opcodes = opcodes
+        self.declares = declares
+        self._references = None
+
+    @property
+    def references(self):
+        """
+        Names used by the code of item, found when first needed since walking the expressions of every statement
+        is the costly part of splitting a module (the backends of modules split it only to group the opcodes)
+        """
+
+        if self._references is None:
+            self._references = set()
+            for opcode in self.opcodes:
+                self._references.update(statement_references(opcode))
+
+        return self._references
+
+    @property
+    def prunable(self):
+        """
+        Whether the item can be removed when none of its names are used
+        """
+
+        return len(self.declares) > 0
+
+
+def expression_references(expr):
+    """
+    Returns the names of identifiers used in an expression
+
+    Params
+    ======
+    expr (Expr) = Expression
+
+    Returns
+    =======
+    set: Names used in expression
+    """
+
+    names = set()
+    for node in expr.walk():
+        if isinstance(node, Call):
+            names.add(node.name)
+        elif isinstance(node, FormatString):
+            names.update(node.names)
+        elif isinstance(node, (Name, Index, Text)):
+            # Names can be members of structures or dereferenced pointers like p.x or *p
+            names.update(IDENTIFIER.findall(node.render()))
+        elif isinstance(node, Constant) and node.text[:1] not in ['"', "'"]:
+            names.update(IDENTIFIER.findall(node.text))
+
+    return names
+
+
+def statement_references(statement):
+    """
+    Returns the names of identifiers used in a statement
+
+    Params
+    ======
+    statement (Statement) = Statement of syntax tree
+
+    Returns
+    =======
+    set: Names used in statement
+    """
+
+    names = set()
+    for expr in statement.expressions():
+        names.update(expression_references(expr))
+
+    for field in REFERENCE_FIELDS.get(statement.type, ()):
+        names.update(IDENTIFIER.findall(str(getattr(statement, field))))
+
+    return names
+
+
+def split_items(module_opcodes):
+    """
+    Split the opcodes of a module into top level items, a function or a structure ends with the scope that
+    follows its declaration
+
+    Params
+    ======
+    module_opcodes (list) = Opcodes of module
+
+    Returns
+    =======
+    list: Items (ModuleItem) of module in order
+    """
+
+    items = []
+    i = 0
+    while i < len(module_opcodes):
+        opcode = module_opcodes[i]
+        opcode_type = opcode.type
+        start = i
+        i += 1
+
+        if opcode_type in ["func_decl", "struct_decl"]:
+            # Scopes nested in the body (like if or while blocks) are skipped by counting the depth
+            depth = 0
+            while i < len(module_opcodes):
+                body_type = module_opcodes[i].type
+                i += 1
+                if body_type == "scope_begin":
+                    depth += 1
+                elif body_type in ["scope_over", "struct_scope_over"]:
+                    depth -= 1
+                    if depth == 0:
+                        break
+
+            opcodes = module_opcodes[start:i]
+            declares = [opcode.name]
+            if opcode_type == "struct_decl" and opcodes[-1].type == "struct_scope_over":
+                declares.extend(opcodes[-1].instance_names)
+        elif opcode_type in GLOBAL_DECLARATIONS:
+            opcodes = [opcode]
+            declares = [opcode.name]
+        elif opcode_type == "struct_instantiate":
+            opcodes = [opcode]
+            declares = [opcode.instance_name]
+        else:
+            opcodes = [opcode]
+            declares = []
+
+        items.append(ModuleItem(opcodes, declares))
+
+    return items
+
+
+def prune_unreachable(op_codes, all_module_opcodes):
+    """
+    Remove functions, structures and global variables of modules which can't be reached from the source code
+
+    The call graph spans the source code and all the modules, so functions which are only called by other module
+    functions are kept. Everything in the source code and module items which can't be removed (like imports) are
+    the roots, the items declaring a name used by a reached item are reached as well.
+
+    Params
+    ======
+    op_codes           (list) = Opcodes of source code
+    all_module_opcodes (dict) = Module name -> opcodes of module
+
+    Returns
+    =======
+    dict: Module name -> opcodes of module without unreachable items
+    """
+
+    all_module_items = {
+        module_name: split_items(module_opcodes)
+        for module_name, module_opcodes in all_module_opcodes.items()
+    }
+
+    # Names used by roots, the items declaring a name are found through declared_by
+    pending = []
+    declared_by = {}
+    for opcode in op_codes:
+        pending.extend(statement_references(opcode))
+
+    for items in all_module_items.values():
+        for item in items:
+            if item.prunable:
+                for name in item.declares:
+                    declared_by.setdefault(name, []).append(item)
+            else:
+                pending.extend(item.references)
+
+    # Worklist over names, each name and each item is visited once
+    visited_names = set()
+    reached = set()
+    while pending:
+        name = pending.pop()
+        if name in visited_names:
+            continue
+        visited_names.add(name)
+
+        for item in declared_by.get(name, []):
+            if id(item) not in reached:
+                reached.add(id(item))
+                pending.extend(item.references)
+
+    all_module_opcodes_pruned = {}
+    for module_name, items in all_module_items.items():
+        all_module_opcodes_pruned[module_name] = [
+            opcode
+            for item in items
+            if not item.prunable or id(item) in reached
+            for opcode in item.opcodes
+        ]
+
+    return all_module_opcodes_pruned
@@ -0,0 +1,299 @@
+# Module for measuring time taken by stages of compiler, tracemalloc and json are imported when memory is traced
+# or stats are written as JSON
+import time
+
+# Module for adding stages to the trace of compilation
+from .tracing import current_tracer
+
+
+class StageStats:
+    """
+    StageStats class stores what a stage of compiler (like lexing or parsing) took for a single module
+    """
+
+    __slots__ = (
+        "stage",
+        "module",
+        "wall",
+        "cpu",
+        "tokens",
+        "opcodes",
+        "symbols",
+        "peak_memory",
+    )
+
+    def __init__(self, stage, module):
+        """
+        Class initializer
+
+        Params
+        ======
+        stage  (string) = Name of stage
+        module (string) = Name of module, main for the source code
+        """
+
+        self.stage = stage
+        self.module = module
+
+        # Seconds of wall clock and of CPU time of current process
+        self.wall = 0.0
+        self.cpu = 0.0
+
+        # Sizes of results of stage, None if the stage doesn't produce them
+        self.tokens = None
+        self.opcodes = None
+        self.symbols = None
+
+        # Peak size of memory (in bytes) allocated by Python during stage, None if memory is not traced
+        self.peak_memory = None
+
+    def to_dict(self):
+        """
+        Returns stats of stage as a dictionary (used for JSON output)
+
+        Returns
+        =======
+        dict: Fields of stage
+        """
+
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _StageTimer:
+    """
+    Context manager which measures a stage and adds it to the stats when the stage is over
+    """
+
+    def __init__(self, stats, stage):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        if self.stats.trace_memory:
+            import tracemalloc
+
+            # reset_peak is new in Python 3.9, before it tracing is restarted which resets the peak too (memory
+            # allocated before the stage is forgotten instead of subtracted)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.stop()
+                tracemalloc.start()
+            self.start_memory = tracemalloc.get_traced_memory()[0]
+
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+
+        return self.stage
+
+    def __exit__(self, *exc_info):
+        end_wall = time.perf_counter()
+        self.stage.wall = end_wall - self.start_wall
+        self.stage.cpu = time.process_time() - self.start_cpu
+
+        # Memory which was already allocated before the stage is not counted
+        if self.stats.trace_memory:
+            import tracemalloc
+
+            self.stage.peak_memory = max(
+                0, tracemalloc.get_traced_memory()[1] - self.start_memory
+            )
+
+        self.stats.stages.append(self.stage)
+
+        tracer = current_tracer()
+        if tracer is not None:
+            tracer.complete(
+                self.stage.stage,
+                "stage",
+                self.start_wall,
+                end_wall,
+                module=self.stage.module,
+            )
+
+        return False
+
+
+class CompileStats:
+    """
+    CompileStats class records the time, CPU time, sizes of results and peak memory of every stage of a
+    compilation for the source code and each module
+
+    Usage
+    =====
+    stats = CompileStats(trace_memory=True)
+    compile_file(filename, stats=stats)
+    print(stats.format_table())
+    """
+
+    def __init__(self, trace_memory=False):
+        """
+        Class initializer
+
+        Params
+        ======
+        trace_memory (bool) = Whether peak memory of stages is measured with tracemalloc, this slows down
+                              compilation a lot
+        """
+
+        self.trace_memory = trace_memory
+        self.stages = []
+
+        # Tracing is stopped by the stats which started it
+        self.started_tracing = False
+
+    def start(self):
+        """
+        Start tracing memory if it is enabled
+        """
+
+        if not self.trace_memory:
+            return
+
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def stop(self):
+        """
+        Stop tracing memory if it was started by these stats
+        """
+
+        if self.started_tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+        return False
+
+    def stage(self, stage, module="main"):
+        """
+        Returns a context manager measuring a stage, sizes of results can be set on the StageStats it gives
+
+        Params
+        ======
+        stage  (string) = Name of stage
+        module (string) = Name of module
+
+        Returns
+        =======
+        context manager: Timer of stage, entering it gives the StageStats of stage
+        """
+
+        return _StageTimer(self, StageStats(stage, module))
+
+    def extend(self, stages):
+        """
+        Add stages measured somewhere else (like in another process)
+
+        Params
+        ======
+        stages (list) = StageStats of stages
+        """
+
+        self.stages.extend(stages)
+
+    def totals(self):
+        """
+        Returns the time and CPU time of all stages
+
+        Returns
+        =======
+        float: Seconds of wall clock
+        float: Seconds of CPU time
+        """
+
+        return (
+            sum(stage.wall for stage in self.stages),
+            sum(stage.cpu for stage in self.stages),
+        )
+
+    def to_dict(self):
+        """
+        Returns the stats as a dictionary (used for JSON output)
+
+        Returns
+        =======
+        dict: Stages and totals
+        """
+
+        wall, cpu = self.totals()
+
+        return {
+            "stages": [stage.to_dict() for stage in self.stages],
+            "total": {"wall": wall, "cpu": cpu},
+        }
+
+    def to_json(self):
+        """
+        Returns the stats as JSON
+
+        Returns
+        =======
+        string: JSON of stats
+        """
+
+        import json
+
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format_table(self):
+        """
+        Returns the stats as a table with a row for every stage of every module
+
+        Returns
+        =======
+        string: Table of stats
+        """
+
+        def count(value):
+            return "-" if value is None else str(value)
+
+        rows = [
+            "%-16s  %-20s  %10s  %10s  %8s  %8s  %8s  %10s"
+            % (
+                "stage",
+                "module",
+                "wall ms",
+                "cpu ms",
+                "tokens",
+                "opcodes",
+                "symbols",
+                "peak KiB",
+            )
+        ]
+
+        for stage in self.stages:
+            rows.append(
+                "%-16s  %-20s  %10.2f  %10.2f  %8s  %8s  %8s  %10s"
+                % (
+                    stage.stage,
+                    stage.module,
+                    stage.wall * 1000,
+                    stage.cpu * 1000,
+                    count(stage.tokens),
+                    count(stage.opcodes),
+                    count(stage.symbols),
+                    "-"
+                    if stage.peak_memory is None
+                    else "%.1f" % (stage.peak_memory / 1024),
+                )
+            )
+
+        wall, cpu = self.totals()
+        rows.append(
+            "%-16s  %-20s  %10.2f  %10.2f" % ("total", "", wall * 1000, cpu * 1000)
+        )
+
+        return "\n".join(rows)
@@ -1,45 +1,109 @@
-# Module to import OpCode class
-from .op_code import OpCode
+# Module for renaming generated files
+import os
 
+# Module for making names of modules valid in macros
+import re
 
-def check_include(opcodes):
+# Module for in-memory text sink
+import io
+
+# Module for timestamps of traced functions
+import time
+
+# Module for writing generated files through a temporary file
+from contextlib import contextmanager
+
+# Module for nodes of syntax tree
+from .syntax_tree import Input, StructInstantiate, MATH_NAMES, uses_math
+
+# Module for splitting module code into functions, structures and global variables
+from .call_graph import split_items
+
+# Module for tracing functions while they are compiled
+from .tracing import current_tracer
+
+
+def add_includes(opcode, includes):
     """
-    Checks if any opcode requires standard libraries to be included
+    Checks if an opcode requires standard libraries to be included
 
     Params
     ======
-    opcodes (list) = List of opcodes
+    opcode   (Statement) = Opcode (statement of syntax tree)
+    includes (set)       = Include lines required so far, the ones required by opcode are added to it
+    """
 
-    Returns
-    =======
-    string: The string representation of unique include files
+    # If opcode is of type print, then it requires stdio.h to be included
+    if opcode.type == "print":
+        includes.add("#include <stdio.h>")
+
+    # If there is any boolean assignment opcode then include stdbool.h
+    if opcode.dtype == "bool":
+        includes.add("#include <stdbool.h>")
+
+    # Raw C code may use math functions and constants too
+    if opcode.type == "raw" and any(
+        math in opcode.text for math in MATH_NAMES + ["pow("]
+    ):
+        includes.add("#include <math.h>")
+
+    for expr in opcode.expressions():
+        # If the opcode is a statement of type input, then it requires stdio.h to be included
+        if isinstance(expr, Input):
+            includes.add("#include <stdio.h>")
+
+        if uses_math(expr):
+            includes.add("#include <math.h>")
+
+
+# Number of pieces of code after which a code buffer joins them into a single chunk
+CHUNK_SIZE = 1024
+
+
+class CodeBuffer:
     """
+    CodeBuffer class holds a section of generated code (like the main function) until it is written
 
-    # List of includes
-    includes = []
+    Code is kept as a list of strings, which are joined into larger chunks as the list grows so that a section
+    takes about as much memory as its code and is never concatenated as a whole
+    """
 
-    # List of math constants
-    math_func_const = ["M_PI", "M_E", "pow(", "INFINITY", "NAN"]
+    __slots__ = ("chunks", "pending")
 
-    # Loop through all opcodes
-    for opcode in opcodes:
-        # If opcode is of type print, then it requires stdio.h to be included
-        if opcode.type == "print":
-            includes.append("#include <stdio.h>")
+    def __init__(self):
+        """
+        Class initializer
+        """
 
-        # If there is any boolean assignment opcode then include stdbool.h
-        if opcode.dtype == "bool":
-            includes.append("#include <stdbool.h>")
+        self.chunks = []
+        self.pending = []
 
-        # If the opcode is a statement of type input, then it requires stdio.h to be included
-        if len(opcode.val.split("---")) >= 3 and len(opcode.val.split('---')[-1]) == 1:
-            includes.append("#include <stdio.h>")
+    def append(self, code):
+        """
+        Add code at the end of section
+
+        Params
+        ======
+        code (string) = Generated C code
+        """
+
+        self.pending.append(code)
 
-        if any(math in opcode.val for math in math_func_const):
-            includes.append("#include <math.h>")
+        if len(self.pending) >= CHUNK_SIZE:
+            self.chunks.append("".join(self.pending))
+            self.pending = []
 
-    # Return string representation of unique elements of includes list separated by newline characters
-    return "\n".join(list(set(includes)))
+    def write_to(self, sink):
+        """
+        Write the code of section to a sink
+
+        Params
+        ======
+        sink (io.TextIOBase) = File or other text stream
+        """
+
+        sink.writelines(self.chunks)
+        sink.write("".join(self.pending))
 
 
 def compile_func_main_code(outside_code, ccode, outside_main, code):
@@ -48,418 +112,831 @@ def compile_func_main_code(outside_code, ccode, outside_main, code):
 
     Params
     ======
-    outside_code (string)        = Code to be put outside main function
-    ccode        (string)        = Code to be put inside main function
-    outside_main (bool)          = Decides where the code should go (true - outside, false - inside)
-    code         (string)        = Compiled code
-
-    Returns
-    =======
-    string, string: The outside and main C code strings
+    outside_code (CodeBuffer) = Code to be put outside main function, code is appended to it
+    ccode        (CodeBuffer) = Code to be put inside main function, code is appended to it
+    outside_main (bool)       = Decides where the code should go (true - outside, false - inside)
+    code         (string)     = Compiled code
     """
 
     # If outside_main is true then code goes outside main
     if outside_main:
-        outside_code += code
+        outside_code.append(code)
     else:
         if code == "}\n":
             code = "\t" + code
-        ccode += code
-
-    # Return code strings
-    return outside_code, ccode
+        ccode.append(code)
 
 
-def compile(opcodes, c_filename, table):
+def compile(opcodes, c_filename, table, backend=None):
     """
-    Compiles opcodes produced by parser into C code
+    Compiles opcodes produced by parser into C code and writes it into a file
 
     Params
     ======
     opcodes    (list)        = List of opcodes
     c_filename (string)      = Name of C file to write C code into
     table      (SymbolTable) = Symbol table constructed during lexical analysis and parsing
+    backend    (Backend)     = Backend generating the code, the C backend if not given
     """
 
-    # Check for includes
-    compiled_code = check_include(opcodes) + "\n"
-
-    # Put the code in main function
-    ccode = ""
-
-    # Function code is compiled into separate list
-    outside_code = ""
-
-    # Check if function body has started or not
-    outside_main = True
-
-    # Check if the function has returned or not
-    has_returned = False
-
-    # Loop through all opcodes
-    for opcode in opcodes:
-        code = ""
-        # If opcode is of type print then generate a printf statement
-        if opcode.type == "print":
-
-            if (
-                opcode.val == '"%s", i'
-            ):  # Temporary solution to the printf( ) statement being used on strings
-                opcode.val = '"%s", &i'
-                # Generation of opcode is flawed as it fails to add the reference addess of the string being printed
-
-            code = "\tprintf(%s);\n" % opcode.val
-
-        # If opcode is of type import then generate include statement
-        if opcode.type == "import":
-            code = '#include "' + opcode.val + '.h"\n'
-
-        # If opcode is of type var_assign then generate a declaration [/initialization] statement
-        elif opcode.type == "var_assign":
-            code = ""
-
-            # val contains - <identifier>---<expression>, split that into a list
-            val = opcode.val.split("---")
-
-            # Get the datatye of the variable
-            dtype = opcode.dtype
-            if dtype == "declared":
-                _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(val[0]))
-
-            # Helper Dictionaries
-            get_data_type = {
-                "i": "int",
-                "s": "char*",
-                "f": "float",
-                "d": "double",
-                "c": "char",
-            }
-            get_placeholder = {"i": "d", "s": "s", "f": "f", "d": "lf", "c": "c"}
-
-            # If it is of string type then change it to char <identifier>[]
-            if dtype == "string":
-                dtype = "char*"
-            # Check if the statement is of type input or not
-            if len(val) < 3:
-                code += "\t" + dtype + " " + str(val[0]) + " = " + str(val[1]) + ";\n"
-            else:
-                # If the statement is of type input -
-                dtype = get_data_type[val[2]]
-                placeholder = get_placeholder[val[2]]
-                code += "\t" + dtype + " " + str(val[0]) + ";\n"
-                if val[1] != "":
-                    code += "\t" + 'printf("' + str(val[1]) + '");\n'
-                code += "\t" + 'scanf("%' + placeholder
-
-                if dtype == "char*":
-                    # If the datatype is character array, we need to pass in the reference address into scanf( )
-                    code += '", &' + str(val[0]) + ");\n"
-                elif "*" in dtype:
-                    code += '", ' + str(val[0]) + ");\n"
-                else:
-                    code += '", &' + str(val[0]) + ");\n"
-        # If opcode is of type ptr_assign then generate a declarative statement
-        elif opcode.type == "ptr_assign":
-            code = ""
-
-            # val contains - <identifier>---<expression>---<count_ast>, split that into a list
-            val = opcode.val.split("---")
-
-            # Get the datatye of the variable
-            _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(val[0]))
-
-            # Helper Dictionaries
-            get_data_type = {
-                "i": "int",
-                "s": "char*",
-                "f": "float",
-                "d": "double",
-                "c": "char",
-            }
-            get_placeholder = {"i": "d", "s": "s", "f": "f", "d": "lf", "c": "c"}
-
-            # If it is of string type then change it to char <identifier>[]
-            if dtype == "string":
-                dtype = "char*"
-            code += (
-                "\t"
-                + dtype
-                + " "
-                + "*" * int(val[2])
-                + str(val[0])
-                + " = "
-                + str(val[1])
-                + ";\n"
-            )
-
-        # If opcode is of type var_no_assign then generate a declaration statement
-        elif opcode.type == "var_no_assign":
-            # val contains - <identifier>---<expression>, split that into a list
-            val = opcode.val.split("---")
-
-            # Get the datatye of the variable
-            _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(val[0]))
-            # Check if dtype could be inferred or not
-            opcode.dtype = str(dtype) if dtype is not None else "not_known"
-            code += "\t" + opcode.dtype + " " + str(opcode.val) + ";\n"
-        elif opcode.type == "array_no_assign":
-            # val contains - <identifier>---<expression>, split that into a list
-            val = opcode.val.split("---")
-            # Get the datatye of the variable
-            _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(val[0]))
-            # Check if dtype could be inferred or not
-            opcode.dtype = str(dtype) if dtype is not None else "not_known"
-            code += "\t" + opcode.dtype + " *" + str(val[0]) + ";\n"
-        elif opcode.type == "array_assign":
-            # val contains - <identifier>---<expression>, split that into a list
-            val = opcode.val.split("---")
-            # Get the datatye of the variable
-            _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(val[0]))
-            # Check if dtype could be inferred or not
-            opcode.dtype = str(dtype) if dtype is not None else "not_known"
-            code += (
-                "\t"
-                + opcode.dtype
-                + " "
-                + str(val[0])
-                + "["
-                + (val[1])
-                + "]"
-                + " = "
-                + val[2]
-                + ";\n"
-            )
-        elif opcode.type == "array_only_assign":
-            # val contains - <identifier>---=(<type> [<size>])<initializer-list>, split that into a list
-            val = opcode.val.split("---")
-
-            # val[0] contains identifier and val[1] contains =(<type> [<size>])<initializer-list>
-            code += "\t" + val[0] + val[1] + ";\n"
-        # If opcode is of type ptr_no_assign then generate declaration statement
-        elif opcode.type == "ptr_no_assign":
-            val = opcode.val.split("---")
-            # Get the datatye of the variable
-            _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(val[0]))
-            # Check if dtype could be inferred or not
-            opcode.dtype = str(dtype) if dtype is not None else "not_known"
-            if opcode.dtype == "string":
-                opcode.dtype = "char"
-            code += "\t" + opcode.dtype + " *" + str(opcode.val) + ";\n"
-
-        # If opcode is of type assign then generate an assignment statement
-        elif opcode.type == "assign":
-            # val contains - <identifier>---<expression>, split that into a list
-            val = opcode.val.split("---")
-            # Helper Dictionaries
-            get_data_type = {
-                "i": "int",
-                "s": "char *",
-                "f": "float",
-                "d": "double",
-                "c": "char",
-            }
-            get_placeholder = {"i": "d", "s": "s", "f": "f", "d": "lf", "c": "c"}
-            # Check if the statement is of type input or not
-            if len(val) == 3:
-                code += "\t" + val[0] + " " + val[1] + " " + val[2] + ";\n"
-            else:
-                # If the statement is of type input
-                dtype = get_data_type[val[3]]
-                placeholder = get_placeholder[val[3]]
-                if val[2] != "":
-                    code += "\t" + 'printf("' + str(val[2]) + '");\n'
-                code += "\t" + 'scanf("%' + placeholder + '", &' + str(val[0]) + ");\n"
-
-        # If opcode is of type ptr_only_assign then generate an assignment statement
-        elif opcode.type == "ptr_only_assign":
-            # val contains - <identifier>---<expression>---<count_ast>, split that into a list
-            val = opcode.val.split("---")
-            code += "\t" + int(val[3]) * "*" + val[0] + " = " + val[2] + ";\n"
-
-        # If opcode is of type unary then generate an uanry statement
-        elif opcode.type == "unary":
-            # val contains - <identifier>---<expression>, split that into a list
-            val = opcode.val.split("---")
-            print_val = ""
-            for i in val:
-                i = i.replace(" ", "")
-                print_val += str(i)
-            code += "\t" + print_val + ";\n"
-        # If opcode is of type func_decl then generate function declaration statement
-        elif opcode.type == "func_decl":
-            # val contains - <identifier>---<params>, split that into list
-            val = opcode.val.split("---")
-
-            # Check if function has params
-            params = val[1].split("&&&") if len(val[1]) > 0 else []
-
-            # Get the return type of the function
-            _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(val[0]))
-            dtype = dtype if dtype != "var" else "void"
-
-            # Append the function return type and name to code
-            code += "\n" + dtype + " " + val[0] + "("
-
-            # Compile the formal params
-            has_param = False
-            for i in range(len(params)):
-                if len(params[i]) > 0:
-                    has_param = True
-                    _, dtype, _, _, _ = table.get_by_id(table.get_by_symbol(params[i]))
-                    dtype = dtype if dtype != "var" else "not_known"
-                    dtype = "char*" if dtype == "string" else dtype
-                    code += dtype + " " + params[i] + ", "
-            if has_param:
-                code = code[:-2]
-            else:
-                code += "void"
-
-            # Finally add opening brace to start the function body
-            code += ") "
-        # If the opcode is of type func_call then generate function calling statement
-        elif opcode.type == "func_call":
-            # val contains - <identifier>---<params>, split that into list
-            val = opcode.val.split("---")
-
-            # Check if function has params
-            params = val[1].split("&&&") if len(val[1]) > 0 else []
-
-            # Compile function name
-            code = "\t" + val[0] + "("
-
-            # Compile the actual params
-            has_param = False
-            for param in params:
-                if len(params) > 0:
-                    has_param = True
-                    code += param + ", "
-            if has_param:
-                code = code[:-2]
-
-            # Finally add opening brace to start the function body
-            code += ");\n"
-        # If opcode is of type struct_decl then generate structure declaration statement
-        elif opcode.type == "struct_decl":
-            # extracting struct name from val
-            struct_name = opcode.val
-
-            # append the struct keyword and structure nameto the code
-            code += "\n" + "struct" + " " + struct_name + " "
-        # If opcode is of type struct_instantiate then generate structure instantiation statement
-        elif opcode.type == "struct_instantiate":
-            # Extract the identifier name of instance variable
-            struct_name, instance_var_name = opcode.val.split("---")
-
-            code += (
-                "\t"
-                + "struct "
-                + struct_name.strip()
-                + " "
-                + instance_var_name.strip()
-                + ";\n"
-            )
-        # If opcode is of type scope_begin then generate open brace statement
-        elif opcode.type == "scope_begin":
-            code += "\t{\n"
-        # If opcode is of type scope_over then generate closing brace statement
-        elif opcode.type == "scope_over":
-            code += "}\n"
-        # If opcode is of type struct_scope_over then generate closing brace, name of struct instance (if any) and add a semi-colon
-        elif opcode.type == "struct_scope_over":
-            code += "} " + opcode.val + ";\n"
-        # If opcode is of type scope_over then generate closing brace statement
-        elif opcode.type == "MAIN":
-            code += "\nint main() {\n"
-            outside_main = False
-            has_returned = False
-        # If opcode is of type scope_over then generate closing brace statement
-        elif opcode.type == "END_MAIN":
-            if not has_returned:
-                code += "\n\treturn 0;"
-            code += "\n}\n"
-            outside_code, ccode = compile_func_main_code(
-                outside_code, ccode, outside_main, code
-            )
-            outside_main = True
-            continue
-        # If opcode is of type for
-        elif opcode.type == "for":
-            val = opcode.val.split("&&&")
-            code += (
-                "\tfor(int "
-                + val[0]
-                + " = "
-                + val[1]
-                + "; "
-                + val[0]
-                + " "
-                + val[4]
-                + " "
-                + val[2]
-                + "; "
-                + val[0]
-                + val[3]
-                + "="
-                + val[5]
-                + ") "
-            )
-        # If opcode is of type while then generate while loop statement
-        elif opcode.type == "while":
-            code = "\twhile(%s) " % opcode.val
-        # If opcode is of type do then generate do statement
-        elif opcode.type == "do":
-            code = "\tdo "
-        # If opcode is of type while_do then generate while for do-while statement
-        elif opcode.type == "while_do":
-            code = "\twhile(%s);" % opcode.val
-        # If opcode is of type if then generate if statement
-        elif opcode.type == "if":
-            code = "\tif(%s) " % opcode.val
-        # If opcode is of type exit then generate exit statement
-        elif opcode.type == "exit":
-            code = "\texit(%s);\n" % opcode.val
-        # If opcode is of type else_if then generate else if statement
-        elif opcode.type == "else_if":
-            code = "\telse if(%s) " % opcode.val
-        # If opcode is of type else then generate else statement
-        elif opcode.type == "else":
-            code = "\telse "
-        # If opcode is of type return then generate return statement
-        elif opcode.type == "return":
-            code += "\n\treturn " + opcode.val + ";\n"
-            has_returned = True
-        # If opcode is of type break then generate break statement
-        elif opcode.type == "break":
-            code += "\tbreak;\n"
-        # If opcode is of type continue then generate continue statement
-        elif opcode.type == "continue":
-            code += "\tcontinue;\n"
-        # If opcode is of type single_line_comment the generate single comment line
-        elif opcode.type == "single_line_comment":
-            code += "\t// %s \n" % opcode.val
-        # If opcode is of type multi_line_comment the generate single comment line
-        elif opcode.type == "multi_line_comment":
-            code += "/* %s*/\n" % opcode.val
-        # If opcode is of type switch then generate switch statement
-        elif opcode.type == "switch":
-            code += "\tswitch(" + opcode.val + ") "
-        # If opcode is of type case then generate case statement
-        elif opcode.type == "case":
-            code += "\tcase " + opcode.val + ":\n"
-        # If opcode is of type default then generate default statement
-        elif opcode.type == "default":
-            code += "\tdefault:\n"
-        # If opcode is of type RAW_c, simpaly copy the value
-        elif opcode.type == "raw":
-            code += opcode.val + "\n"
-
-        outside_code, ccode = compile_func_main_code(
-            outside_code, ccode, outside_main, code
-        )
-
-    # Add return 0 to the end of code
-    compiled_code += outside_code + ccode
-
-    # Write generated code into C file
-    with open(c_filename, "w") as file:
+    with open_code_file(c_filename) as file:
+        emit_code(opcodes, table, file, backend)
+
+
+def write_code(compiled_code, c_filename):
+    """
+    Writes generated C code into a file
+
+    Params
+    ======
+    compiled_code (string) = Generated C code
+    c_filename    (string) = Name of C file to write C code into
+    """
+
+    with open_code_file(c_filename) as file:
         file.write(compiled_code)
+
+
+@contextmanager
+def open_code_file(c_filename):
+    """
+    Opens a temporary file to write generated code into, it is renamed to the C file once writing is complete
+
+    Builds running in parallel which generate the same module header never see a partially written file, and
+    a failed build leaves the previous file in place
+
+    Params
+    ======
+    c_filename (string) = Name of C file to write C code into
+
+    Returns
+    =======
+    file: The temporary file opened for writing
+    """
+
+    temp_filename = "%s.%d.tmp" % (c_filename, os.getpid())
+    try:
+        with open(temp_filename, "w") as file:
+            yield file
+        os.replace(temp_filename, c_filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+def generate_code(opcodes, table, backend=None):
+    """
+    Compiles opcodes produced by parser into C code
+
+    Params
+    ======
+    opcodes (list)        = List of opcodes (statements of syntax tree)
+    table   (SymbolTable) = Symbol table constructed during lexical analysis and parsing
+    backend (Backend)     = Backend generating the code, the C backend if not given
+
+    Returns
+    =======
+    string: The generated C code
+    """
+
+    sink = io.StringIO()
+    emit_code(opcodes, table, sink, backend)
+
+    return sink.getvalue()
+
+
+def emit_code(opcodes, table, sink, backend=None):
+    """
+    Compiles opcodes produced by parser into C code and writes it to a sink
+
+    Params
+    ======
+    opcodes (list)          = List of opcodes (statements of syntax tree)
+    table   (SymbolTable)   = Symbol table constructed during lexical analysis and parsing
+    sink    (io.TextIOBase) = File or other text stream to write the C code into
+    backend (Backend)       = Backend generating the code, the C backend if not given
+    """
+
+    if backend is None:
+        backend = C_BACKEND
+
+    backend.emit(opcodes, table, sink)
+
+
+# Datatype of variable read by input statement for each format
+INPUT_DATA_TYPES = {
+    "i": "int",
+    "s": "char*",
+    "f": "float",
+    "d": "double",
+    "c": "char",
+}
+
+# Placeholder of scanf for each format of input statement
+INPUT_PLACEHOLDERS = {"i": "d", "s": "s", "f": "f", "d": "lf", "c": "c"}
+
+
+class EmitState:
+    """
+    EmitState class holds the state of code generation which is shared by the emitters of opcodes
+    """
+
+    __slots__ = ("table", "outside_code", "ccode", "outside_main", "has_returned")
+
+    def __init__(self, table):
+        """
+        Class initializer
+
+        Params
+        ======
+        table (SymbolTable) = Symbol table constructed during lexical analysis and parsing
+        """
+
+        self.table = table
+
+        # Put the code in main function
+        self.ccode = CodeBuffer()
+
+        # Function code is compiled into separate buffer
+        self.outside_code = CodeBuffer()
+
+        # Check if function body has started or not
+        self.outside_main = True
+
+        # Check if the function has returned or not
+        self.has_returned = False
+
+    def place(self, code):
+        """
+        Add code outside of main or inside main, depending on where code generation is
+
+        Params
+        ======
+        code (string) = Compiled code
+        """
+
+        compile_func_main_code(self.outside_code, self.ccode, self.outside_main, code)
+
+    def declared_type(self, name):
+        """
+        Returns the datatype of an identifier from symbol table
+
+        Params
+        ======
+        name (string) = Name of identifier
+
+        Returns
+        =======
+        string: The datatype, not_known if it could not be inferred
+        """
+
+        dtype = self.table.get_by_id(self.table.get_by_symbol(name))[1]
+
+        # Check if dtype could be inferred or not
+        return str(dtype) if dtype is not None else "not_known"
+
+
+def emit_print(opcode, state):
+    print_val = opcode.val
+
+    if (
+        print_val == '"%s", i'
+    ):  # Temporary solution to the printf( ) statement being used on strings
+        print_val = '"%s", &i'
+        # Generation of opcode is flawed as it fails to add the reference addess of the string being printed
+
+    return "\tprintf(%s);\n" % print_val
+
+
+def emit_import(opcode, state):
+    return '#include "' + opcode.module + '.h"\n'
+
+
+def emit_input(name, value, dtype=None):
+    """
+    Returns the code reading a value from standard input into a variable
+
+    Params
+    ======
+    name  (string) = Name of variable, or the variable with its index
+    value (Input)  = Input expression
+    dtype (string) = Datatype of variable if it is declared by the statement, None for assignments
+
+    Returns
+    =======
+    string: The generated C code
+    """
+
+    placeholder = INPUT_PLACEHOLDERS[value.format]
+
+    code = ""
+    if dtype is not None:
+        code += "\t" + dtype + " " + name + ";\n"
+    if value.prompt != "":
+        code += "\t" + 'printf("' + value.prompt + '");\n'
+    code += "\t" + 'scanf("%' + placeholder
+
+    # If the datatype is character array, we need to pass in the reference address into scanf( )
+    if dtype is not None and dtype != "char*" and "*" in dtype:
+        return code + '", ' + name + ");\n"
+
+    return code + '", &' + name + ");\n"
+
+
+def emit_var_assign(opcode, state):
+    # Get the datatye of the variable
+    dtype = opcode.dtype
+    if dtype == "declared":
+        dtype = state.table.get_by_id(state.table.get_by_symbol(opcode.name))[1]
+
+    # If it is of string type then change it to char <identifier>[]
+    if dtype == "string":
+        dtype = "char*"
+
+    # Check if the statement is of type input or not
+    if isinstance(opcode.value, Input):
+        return emit_input(opcode.name, opcode.value, INPUT_DATA_TYPES[opcode.value.format])
+
+    return "\t" + dtype + " " + opcode.name + " = " + opcode.value.render() + ";\n"
+
+
+def emit_ptr_assign(opcode, state):
+    # Get the datatye of the variable
+    dtype = state.table.get_by_id(state.table.get_by_symbol(opcode.name))[1]
+
+    # If it is of string type then change it to char <identifier>[]
+    if dtype == "string":
+        dtype = "char*"
+
+    return (
+        "\t"
+        + dtype
+        + " "
+        + "*" * opcode.depth
+        + opcode.name
+        + " = "
+        + opcode.value.render()
+        + ";\n"
+    )
+
+
+def emit_var_no_assign(opcode, state):
+    return "\t" + state.declared_type(opcode.name) + " " + opcode.name + ";\n"
+
+
+def emit_array_no_assign(opcode, state):
+    return "\t" + state.declared_type(opcode.name) + " *" + opcode.name + ";\n"
+
+
+def emit_array_assign(opcode, state):
+    return (
+        "\t"
+        + state.declared_type(opcode.name)
+        + " "
+        + opcode.name
+        + "["
+        + opcode.size
+        + "]"
+        + " = "
+        + opcode.initializer.render()
+        + ";\n"
+    )
+
+
+def emit_array_only_assign(opcode, state):
+    # Name of array followed by = (<type> [<size>])<initializer-list>
+    return "\t" + opcode.name + opcode.code + ";\n"
+
+
+def emit_ptr_no_assign(opcode, state):
+    dtype = state.declared_type(opcode.name)
+    if dtype == "string":
+        dtype = "char"
+
+    return "\t" + dtype + " *" + opcode.name + ";\n"
+
+
+def emit_assign(opcode, state):
+    # Check if the statement is of type input or not
+    if isinstance(opcode.value, Input):
+        return emit_input(opcode.target, opcode.value)
+
+    return (
+        "\t"
+        + opcode.target
+        + " "
+        + opcode.operator
+        + " "
+        + opcode.value.render()
+        + ";\n"
+    )
+
+
+def emit_ptr_only_assign(opcode, state):
+    return (
+        "\t"
+        + opcode.depth * "*"
+        + opcode.target
+        + " = "
+        + opcode.value.render()
+        + ";\n"
+    )
+
+
+def emit_unary(opcode, state):
+    return "\t" + opcode.value.render().replace(" ", "") + ";\n"
+
+
+def emit_func_decl(opcode, state):
+    # Get the return type of the function
+    func_entry = state.table.get_by_id(state.table.get_by_symbol(opcode.name))
+    dtype = func_entry[1]
+    dtype = dtype if dtype != "var" else "void"
+
+    # Append the function return type and name to code
+    code = "\n" + dtype + " " + opcode.name + "("
+
+    # Compile the formal params
+    params = []
+    for param, param_id in zip(opcode.params, func_entry.param_ids):
+        if len(param) > 0:
+            dtype = state.table.get_by_id(param_id)[1]
+            dtype = dtype if dtype != "var" else "not_known"
+            dtype = "char*" if dtype == "string" else dtype
+            params.append(dtype + " " + param)
+
+    code += ", ".join(params) if params else "void"
+
+    # Finally add opening brace to start the function body
+    return code + ") "
+
+
+def emit_func_call(opcode, state):
+    return "\t" + opcode.call.render() + ";\n"
+
+
+def emit_struct_decl(opcode, state):
+    # append the struct keyword and structure name to the code
+    return "\n" + "struct" + " " + opcode.name + " "
+
+
+def emit_struct_instantiate(opcode, state):
+    return (
+        "\t"
+        + "struct "
+        + opcode.struct_name.strip()
+        + " "
+        + opcode.instance_name.strip()
+        + ";\n"
+    )
+
+
+def emit_struct_scope_over(opcode, state):
+    # Closing brace, name of struct instance (if any) and a semi-colon
+    return "} " + opcode.val + ";\n"
+
+
+def emit_main(opcode, state):
+    state.outside_main = False
+    state.has_returned = False
+
+    return "\nint main() {\n"
+
+
+def emit_end_main(opcode, state):
+    code = "\n}\n"
+    if not state.has_returned:
+        code = "\n\treturn 0;" + code
+
+    # The closing brace is the last code of main
+    state.place(code)
+    state.outside_main = True
+
+    return ""
+
+
+def emit_for(opcode, state):
+    return (
+        "\tfor(int "
+        + opcode.var
+        + " = "
+        + opcode.start
+        + "; "
+        + opcode.var
+        + " "
+        + opcode.sign
+        + " "
+        + opcode.end
+        + "; "
+        + opcode.var
+        + opcode.operator
+        + "="
+        + opcode.change
+        + ") "
+    )
+
+
+def emit_return(opcode, state):
+    state.has_returned = True
+
+    return "\n\treturn " + opcode.value.render() + ";\n"
+
+
+def emit_raw(opcode, state):
+    # Raw C code is simply copied
+    return opcode.text + "\n"
+
+
+def emit_fixed(code):
+    """
+    Returns an emitter for opcodes whose code is always the same
+
+    Params
+    ======
+    code (string) = Code of opcode
+
+    Returns
+    =======
+    function: The emitter
+    """
+
+    return lambda opcode, state: code
+
+
+def emit_with_value(template):
+    """
+    Returns an emitter for opcodes whose code is their expression put into a template
+
+    Params
+    ======
+    template (string) = Code of opcode with %s in place of expression
+
+    Returns
+    =======
+    function: The emitter
+    """
+
+    return lambda opcode, state: template % opcode.value.render()
+
+
+def emit_with_text(template):
+    """
+    Returns an emitter for comments, whose code is their text put into a template
+
+    Params
+    ======
+    template (string) = Code of opcode with %s in place of text
+
+    Returns
+    =======
+    function: The emitter
+    """
+
+    return lambda opcode, state: template % opcode.text
+
+
+# Type of opcode -> function(opcode, state) returning the C code of opcode
+C_EMITTERS = {
+    "print": emit_print,
+    "import": emit_import,
+    "var_assign": emit_var_assign,
+    "ptr_assign": emit_ptr_assign,
+    "var_no_assign": emit_var_no_assign,
+    "array_no_assign": emit_array_no_assign,
+    "array_assign": emit_array_assign,
+    "array_only_assign": emit_array_only_assign,
+    "ptr_no_assign": emit_ptr_no_assign,
+    "assign": emit_assign,
+    "ptr_only_assign": emit_ptr_only_assign,
+    "unary": emit_unary,
+    "func_decl": emit_func_decl,
+    "func_call": emit_func_call,
+    "struct_decl": emit_struct_decl,
+    "struct_instantiate": emit_struct_instantiate,
+    "scope_begin": emit_fixed("\t{\n"),
+    "scope_over": emit_fixed("}\n"),
+    "struct_scope_over": emit_struct_scope_over,
+    "MAIN": emit_main,
+    "END_MAIN": emit_end_main,
+    "for": emit_for,
+    "while": emit_with_value("\twhile(%s) "),
+    "do": emit_fixed("\tdo "),
+    "while_do": emit_with_value("\twhile(%s);"),
+    "if": emit_with_value("\tif(%s) "),
+    "exit": emit_with_value("\texit(%s);\n"),
+    "else_if": emit_with_value("\telse if(%s) "),
+    "else": emit_fixed("\telse "),
+    "return": emit_return,
+    "break": emit_fixed("\tbreak;\n"),
+    "continue": emit_fixed("\tcontinue;\n"),
+    "single_line_comment": emit_with_text("\t// %s \n"),
+    "multi_line_comment": emit_with_text("/* %s*/\n"),
+    "switch": emit_with_value("\tswitch(%s) "),
+    "case": emit_with_value("\tcase %s:\n"),
+    "default": emit_fixed("\tdefault:\n"),
+    "raw": emit_raw,
+}
+
+
+class Backend:
+    """
+    Backend class generates code from opcodes, the code of each type of opcode is generated by the emitter
+    registered for it, so finding the code of an opcode is a single dictionary lookup
+
+    Other backends (like C code instrumented for debugging) are made by registering different emitters, or by
+    subclassing and overriding how includes are found and how the sections of code are written
+    """
+
+    def __init__(self, emitters=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        emitters (dict) = Type of opcode -> function(opcode, state) returning code of opcode, the C emitters if
+                          not given
+        """
+
+        self.emitters = dict(C_EMITTERS if emitters is None else emitters)
+
+    def register(self, opcode_type, emitter):
+        """
+        Register the emitter of a type of opcode, replacing the existing one
+
+        Params
+        ======
+        opcode_type (string)   = Type of opcode
+        emitter     (function) = Function(opcode, state) returning code of opcode
+        """
+
+        self.emitters[opcode_type] = emitter
+
+    def add_includes(self, opcode, includes):
+        """
+        Add the include lines required by an opcode
+
+        Params
+        ======
+        opcode   (Statement) = Opcode (statement of syntax tree)
+        includes (set)       = Include lines required so far
+        """
+
+        add_includes(opcode, includes)
+
+    def emit(self, opcodes, table, sink):
+        """
+        Generate code of opcodes and write it to a sink
+
+        Params
+        ======
+        opcodes (list)          = List of opcodes (statements of syntax tree)
+        table   (SymbolTable)   = Symbol table constructed during lexical analysis and parsing
+        sink    (io.TextIOBase) = File or other text stream to write the code into
+        """
+
+        state = EmitState(table)
+
+        # Include lines required by opcodes
+        includes = set()
+
+        # Functions are only traced if compilation is being traced
+        tracer = current_tracer()
+        function_spans = FunctionSpans(tracer) if tracer is not None else None
+
+        emitters = self.emitters
+        for opcode in opcodes:
+            self.add_includes(opcode, includes)
+
+            if function_spans is not None:
+                function_spans.before(opcode)
+
+            # Opcodes without an emitter generate no code
+            emitter = emitters.get(opcode.type)
+            if emitter is not None:
+                state.place(emitter(opcode, state))
+
+            if function_spans is not None:
+                function_spans.after(opcode)
+
+        self.write(state, includes, sink)
+
+    def write(self, state, includes, sink):
+        """
+        Write the generated code to a sink, includes followed by code outside main and the main function
+
+        Params
+        ======
+        state    (EmitState)     = State after all opcodes were compiled
+        includes (set)           = Include lines required by opcodes
+        sink     (io.TextIOBase) = File or other text stream
+        """
+
+        # Includes are written in a fixed order, system headers before headers of modules, so that the same
+        # program always generates the same code (binaries are cached by a hash of it)
+        ordered = sorted(includes, key=lambda include: ('"' in include, include))
+        sink.write("\n".join(ordered) + "\n")
+        state.outside_code.write_to(sink)
+        state.ccode.write_to(sink)
+
+
+# Backend used when no other backend is given
+C_BACKEND = Backend()
+
+
+class FunctionSpans:
+    """
+    FunctionSpans class adds a span to the trace of compilation for every function (and the main function) from
+    its declaration to the end of its body
+    """
+
+    def __init__(self, tracer):
+        """
+        Class initializer
+
+        Params
+        ======
+        tracer (Tracer) = Active tracer
+        """
+
+        self.tracer = tracer
+
+        # Name of function being compiled, None outside of functions
+        self.name = None
+        self.start = 0.0
+        self.depth = 0
+
+        # The body of main ends with END_MAIN instead of a scope
+        self.in_main = False
+
+    def before(self, opcode):
+        """
+        Start the span of a function at its declaration
+
+        Params
+        ======
+        opcode (Statement) = Opcode about to be compiled
+        """
+
+        if opcode.type == "func_decl":
+            self.name = opcode.name
+        elif opcode.type == "MAIN":
+            self.name = "main"
+        else:
+            return
+
+        self.start = time.perf_counter()
+        self.depth = 0
+        self.in_main = opcode.type == "MAIN"
+
+    def after(self, opcode):
+        """
+        End the span of a function once its body is compiled
+
+        Params
+        ======
+        opcode (Statement) = Opcode which was compiled
+        """
+
+        if self.name is None:
+            return
+
+        if opcode.type == "scope_begin":
+            self.depth += 1
+        elif opcode.type == "scope_over":
+            self.depth -= 1
+
+        # Nested blocks (like if or while) end with scope_over too
+        if self.in_main:
+            ended = opcode.type == "END_MAIN"
+        else:
+            ended = opcode.type == "scope_over" and self.depth == 0
+
+        if ended:
+            self.tracer.complete(self.name, "compile", self.start)
+            self.name = None
+
+
+def extern_declaration(code):
+    """
+    Returns the extern declaration of a global variable given the C code defining it
+
+    Params
+    ======
+    code (string) = C code defining the global variable, like int x = 1;
+
+    Returns
+    =======
+    string: The declaration, like extern int x;
+    """
+
+    return "extern " + code.strip().rstrip(";").split(" = ")[0] + ";\n"
+
+
+def header_guard(module_name):
+    """
+    Returns the macro guarding a module header against being included twice
+
+    Params
+    ======
+    module_name (string) = Name of module
+
+    Returns
+    =======
+    string: Name of macro
+    """
+
+    return "SIMC_" + re.sub(r"\W", "_", module_name).upper() + "_H"
+
+
+class HeaderBackend(Backend):
+    """
+    HeaderBackend class generates the header of a module compiled separately, the header only declares the
+    functions and global variables of module (and defines its structures), so any number of C files can
+    include it and the definitions are compiled once in the C file of module
+    """
+
+    def __init__(self, module_name, emitters=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        module_name (string) = Name of module
+        emitters    (dict)   = Type of opcode -> emitter, the C emitters if not given
+        """
+
+        super().__init__(emitters)
+        self.module_name = module_name
+
+    def emit(self, opcodes, table, sink):
+        state = EmitState(table)
+        includes = set()
+
+        emitters = self.emitters
+        for item in split_items(opcodes):
+            for opcode in item.opcodes:
+                self.add_includes(opcode, includes)
+
+            first = item.opcodes[0]
+            if first.type == "func_decl":
+                # Prototype of function, the body is in the C file of module
+                state.place(emitters["func_decl"](first, state).rstrip() + ";\n")
+            elif first.type == "struct_decl":
+                # Structures are defined in the header, their instances are declared like global variables
+                for opcode in item.opcodes[:-1]:
+                    state.place(emitters[opcode.type](opcode, state))
+                state.place("};\n")
+
+                for instance_name in item.declares[1:]:
+                    state.place("extern struct %s %s;\n" % (first.name, instance_name))
+            elif item.prunable:
+                state.place(extern_declaration(emitters[first.type](first, state)))
+            elif first.type == "import":
+                state.place(emitters["import"](first, state))
+
+        guard = header_guard(self.module_name)
+        sink.write("#ifndef %s\n#define %s\n" % (guard, guard))
+        self.write(state, includes, sink)
+        sink.write("\n#endif\n")
+
+
+class ModuleSourceBackend(Backend):
+    """
+    ModuleSourceBackend class generates the C file of a module compiled separately, which includes the header of
+    module (see HeaderBackend) followed by the definitions of functions and global variables
+    """
+
+    def __init__(self, module_name, emitters=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        module_name (string) = Name of module
+        emitters    (dict)   = Type of opcode -> emitter, the C emitters if not given
+        """
+
+        super().__init__(emitters)
+        self.module_name = module_name
+
+    def add_includes(self, opcode, includes):
+        # The header of module included first already has the include lines required by every opcode
+        pass
+
+    def emit(self, opcodes, table, sink):
+        definitions = []
+        for item in split_items(opcodes):
+            first = item.opcodes[0]
+
+            # Structures and imports are part of the header, instances of structures are defined here
+            if first.type == "struct_decl":
+                definitions.extend(
+                    StructInstantiate(first.name, instance_name)
+                    for instance_name in item.declares[1:]
+                )
+            elif first.type != "import":
+                definitions.extend(item.opcodes)
+
+        sink.write('#include "%s.h"\n' % self.module_name)
+        super().emit(definitions, table, sink)
@@ -0,0 +1,237 @@
+# Modules for the per thread collector and exiting on errors
+import sys
+import threading
+
+
+class Diagnostic:
+    """
+    Diagnostic class stores a single error (or warning) reported by the compiler
+    """
+
+    __slots__ = ("msg", "filename", "line_num", "column", "severity")
+
+    def __init__(self, msg, filename=None, line_num=-1, column=None, severity="error"):
+        """
+        Class initializer
+
+        Params
+        ======
+        msg      (string) = Message describing the problem
+        filename (string) = Path of source file, None if the problem is not related to a file
+        line_num (int)    = Line number, -1 if the problem is not related to a line
+        column   (int)    = Column number starting at 1, None if it is not known
+        severity (string) = Either error or warning
+        """
+
+        self.msg = msg
+        self.filename = filename
+        self.line_num = line_num
+        self.column = column
+        self.severity = severity
+
+    def location(self):
+        """
+        Returns location of the problem as file:line:column, parts which are not known are left out
+
+        Returns
+        =======
+        string: Location of the problem
+        """
+
+        location = self.filename or ""
+        if self.line_num is not None and self.line_num >= 0:
+            location += ":%d" % self.line_num
+            if self.column is not None:
+                location += ":%d" % self.column
+
+        return location.lstrip(":")
+
+    def to_dict(self):
+        """
+        Returns diagnostic as a dictionary (used for JSON output)
+
+        Returns
+        =======
+        dict: Fields of diagnostic
+        """
+
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        """
+        String representation of a Diagnostic
+
+        Returns
+        =======
+        string: The diagnostic as location: severity: message
+        """
+
+        location = self.location()
+        if location == "":
+            return "%s: %s" % (self.severity, self.msg)
+
+        return "%s: %s: %s" % (location, self.severity, self.msg)
+
+    def __repr__(self):
+        return "Diagnostic(%r, %r, %r, %r, %r)" % (
+            self.msg,
+            self.filename,
+            self.line_num,
+            self.column,
+            self.severity,
+        )
+
+
+class CompileError(Exception):
+    """
+    CompileError is raised when source code could not be compiled, it carries every diagnostic reported
+    """
+
+    def __init__(self, diagnostics):
+        """
+        Class initializer
+
+        Params
+        ======
+        diagnostics (Diagnostic/list) = Diagnostic(s) describing why compilation failed
+        """
+
+        if isinstance(diagnostics, Diagnostic):
+            diagnostics = [diagnostics]
+
+        self.diagnostics = list(diagnostics)
+
+        super().__init__("\n".join(str(diagnostic) for diagnostic in self.diagnostics))
+
+    def __reduce__(self):
+        # Errors of modules are sent back from processes of the pool with their diagnostics
+        return (CompileError, (self.diagnostics,))
+
+
+class DiagnosticCollector:
+    """
+    DiagnosticCollector class collects diagnostics so that many problems can be reported in a single pass
+    """
+
+    def __init__(self, filename=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        filename (string) = Path of source file currently being compiled
+        """
+
+        self.filename = filename
+        self.diagnostics = []
+
+    def add(self, diagnostics):
+        """
+        Add diagnostics to collector
+
+        Params
+        ======
+        diagnostics (Diagnostic/list) = Diagnostic(s) to be added
+        """
+
+        if isinstance(diagnostics, Diagnostic):
+            diagnostics = [diagnostics]
+
+        self.diagnostics.extend(diagnostics)
+
+    def num_errors(self):
+        """
+        Returns number of errors collected
+
+        Returns
+        =======
+        int: Number of diagnostics with error severity
+        """
+
+        return sum(1 for diagnostic in self.diagnostics if diagnostic.severity == "error")
+
+    def raise_if_errors(self, start=0):
+        """
+        Raise CompileError if any error was collected
+
+        Params
+        ======
+        start (int) = Only diagnostics collected after the first start diagnostics are considered
+        """
+
+        diagnostics = self.diagnostics[start:]
+        if any(diagnostic.severity == "error" for diagnostic in diagnostics):
+            raise CompileError(diagnostics)
+
+
+# Collector of the compilation running in current thread
+_state = threading.local()
+
+
+def current_collector():
+    """
+    Returns the collector of the compilation running in the current thread, a new one is created if needed
+
+    Returns
+    =======
+    DiagnosticCollector: Active collector
+    """
+
+    collector = getattr(_state, "collector", None)
+    if collector is None:
+        collector = _state.collector = DiagnosticCollector()
+
+    return collector
+
+
+class collecting:
+    """
+    Context manager which makes a collector active in the current thread
+
+    Usage
+    =====
+    with collecting(filename) as collector:
+        ...
+    """
+
+    def __init__(self, filename=None):
+        self.collector = DiagnosticCollector(filename)
+
+    def __enter__(self):
+        self.previous = getattr(_state, "collector", None)
+        _state.collector = self.collector
+
+        return self.collector
+
+    def __exit__(self, *exc_info):
+        _state.collector = self.previous
+
+        return False
+
+
+def print_diagnostics(diagnostics):
+    """
+    Shows diagnostics in red color (errors) or yellow color (warnings)
+
+    Params
+    ======
+    diagnostics (list) = Diagnostics to be shown
+    """
+
+    for diagnostic in diagnostics:
+        color = "\033[91m" if diagnostic.severity == "error" else "\033[93m"
+        print("%s%s" % (color, diagnostic), end=" ")
+        print(" \033[m")
+
+
+def exit_with_diagnostics(compile_error):
+    """
+    Shows diagnostics of a CompileError and exits the current process, used by command line entry points
+
+    Params
+    ======
+    compile_error (CompileError) = Error raised during compilation
+    """
+
+    print_diagnostics(compile_error.diagnostics)
+    sys.exit(1)
@@ -1,10 +1,13 @@
-# Library to exit code when error occurs
-import sys
+# Module for reporting errors
+from .diagnostics import CompileError, Diagnostic, current_collector
 
+# Characters which are part of numbers (0-9 and .)
+DIGIT_CHARS = frozenset("0123456789.")
 
-def check_if(got_type, should_be_types, error_msg, line_num):
+
+def check_if(got_type, should_be_types, error_msg, line_num, column=None):
     """
-    Check if type matches what it should be otherwise throw an error and exit
+    Check if type matches what it should be otherwise throw an error
 
     Params
     ======
@@ -12,31 +15,32 @@ def check_if(got_type, should_be_types, error_msg, line_num):
     should_be_types (string/list) = Type(s) to be compared with
     msg             (string)      = Error message to print in case some case fails
     line_num        (int)         = Line number
+    column          (int)         = Column number starting at 1, if it is known
     """
 
     # Convert to list if type is string
     if type(should_be_types) == str:
         should_be_types = [should_be_types]
 
-    # If the given_type is not part of should_be_types then throw error and exit
+    # If the given_type is not part of should_be_types then throw error
     if got_type not in should_be_types:
-        error(error_msg, line_num)
+        error(error_msg, line_num, column)
 
 
-def error(msg, line_num):
+def error(msg, line_num, column=None):
     """
-    Shows error message in red color and exits the current process
+    Raises CompileError for an error in the file currently being compiled
 
     Params
     ======
     msg      (string) = The message to be shown as error message
     line_num (int)    = Line number
+    column   (int)    = Column number starting at 1, if it is known
     """
 
-    # Prints the error to screen in red color and then exits tokenizer
-    print("\033[91m[Line %d] Error: %s" % (line_num, msg), end=" ")
-    print(" \033[m")
-    sys.exit()
+    raise CompileError(
+        Diagnostic(msg, current_collector().filename, line_num, column)
+    )
 
 
 def is_digit(char):
@@ -52,7 +56,7 @@ def is_digit(char):
     bool: Checks whether the character is number or not
     """
 
-    return char in ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "."]
+    return char in DIGIT_CHARS
 
 
 def is_alpha(char):
@@ -84,8 +88,4 @@ def is_alnum(char):
     bool: Checks whether the character is alphabet/digit not
     """
 
-    return (
-        char.isalpha()
-        or char == "_"
-        or char in ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "."]
-    )
+    return char.isalpha() or char == "_" or char in DIGIT_CHARS
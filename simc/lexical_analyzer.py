@@ -1,7 +1,9 @@
 # Standard library to take input as command line argument
 import sys
 import os
-from collections import namedtuple
+import io
+import re
+import string
 
 # Module to import some helper functions
 from .global_helpers import error, is_alpha, is_alnum, is_digit
@@ -9,13 +11,94 @@ from .global_helpers import error, is_alpha, is_alnum, is_digit
 # Module to import Token class
 from .token_class import Token
 
+# Module for resolving identifiers to their declarations while tokens are generated
+from .scope_resolve import ScopeResolver
+
+
+# Directory where installed modules can be found
+MODULE_DIR = os.path.join(os.path.dirname(__file__), "modules")
+
+# Boolean and math constants, value -> (data type, token type)
+CONST_WITH_TYPES = {
+    "true": ("bool", "bool"),
+    "false": ("bool", "bool"),
+    "PI": ("double", "number"),
+    "E": ("double", "number"),
+    "inf": ("double", "number"),
+    "NaN": ("double", "number"),
+}
+
+# Data types which can be used for explicit type casting
+ALLOWED_DTYPES_FOR_CASTING = ["int", "float", "double"]
+
+# Escape sequences which make a single character
+ESCAPE_SEQUENCES = [
+    "\\\\",
+    "\\0",
+    "\\n",
+    "\\a",
+    "\\b",
+    "\\f",
+    "\\r",
+    "\\t",
+    "\\v",
+    "\\?",
+    "\\'",
+    '\\"',
+]
+
+# Operators which can be followed by a second character
+# character -> ([(next character, token type if it follows)], token type otherwise)
+OPERATOR_TOKENS = {
+    "=": ([("=", "equal")], "assignment"),
+    "+": ([("=", "plus_equal"), ("+", "increment")], "plus"),
+    "-": ([("=", "minus_equal"), ("-", "decrement")], "minus"),
+    "*": ([("=", "multiply_equal"), ("*", "power")], "multiply"),
+    "^": ([("=", "bitwise_xor_equal")], "bitwise_xor"),
+    "|": ([("|", "or"), ("=", "bitwise_or_equal")], "bitwise_or"),
+    "%": ([("=", "modulus_equal")], "modulus"),
+    ">": ([(">", "right_shift"), ("=", "greater_than_equal")], "greater_than"),
+    "<": ([("<", "left_shift"), ("=", "less_than_equal")], "less_than"),
+}
+
+# Compiled patterns used by the table driven scanner to slice lexemes out of the source
+NUMBER_PATTERN = re.compile(r"[0-9.]*")
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z0-9_.]*")
+STRING_BODY_PATTERNS = {
+    '"': re.compile(r'(?:\\"|[^"\n\0])*'),
+    "'": re.compile(r"(?:\\'|[^'\n\0])*"),
+}
+LINE_PATTERN = re.compile(r"[^\n\0]*")
+SPACES_PATTERN = re.compile(r" *")
+WHITESPACE_PATTERN = re.compile(r"[ \t\r]*")
+
+# Opening bracket -> token type
+OPENING_BRACKET_TOKENS = {"(": "left_paren", "{": "left_brace", "[": "left_bracket"}
+
+# Closing bracket -> (matching opening bracket, token type, name used in error messages)
+CLOSING_BRACKETS = {
+    ")": ("(", "right_paren", "parentheses"),
+    "}": ("{", "right_brace", "braces"),
+    "]": ("[", "right_bracket", "brackets"),
+}
+
+# Punctuation character -> token type
+PUNCTUATION_TOKENS = {",": "comma", ":": "colon"}
+
 
 class LexicalAnalyzer:
     """
     Lexical analyzer class is responsible for performing lexical analysis and generating tokens
     """
 
-    def __init__(self, source_filename, symbol_table):
+    def __init__(
+        self,
+        source_filename,
+        symbol_table,
+        scanner="table",
+        source_code=None,
+        module_sources=None,
+    ):
         """
         Class initializer
 
@@ -23,11 +106,24 @@ class LexicalAnalyzer:
         ======
         source_filename (string)                        = Name of file containing sim-C source code
         symbol_table    (simc.symbol_table.SymbolTable) = Shared symbol table
+        scanner         (string)                        = Scanning engine, "table" (table driven, default) or
+                                                          "legacy" (character by character), both generate
+                                                          the same tokens
+        source_code     (string)                        = sim-C source code, if given the file is not read
+        module_sources  (dict)                          = Module name -> sim-C source code of modules which
+                                                          are not installed, their source path is
+                                                          <module name>.simc
         """
 
         self.source_filename = source_filename
+        self.source_text = source_code
+        self.module_sources = module_sources or {}
         self.symbol_table = symbol_table
 
+        if scanner not in ["table", "legacy"]:
+            error("Unknown scanner %s" % scanner, -1)
+        self.scanner = scanner
+
         self.common_simc_c_keywords = [
             "break",
             "case",
@@ -86,6 +182,10 @@ class LexicalAnalyzer:
             "volatile",
         ]
 
+        # Sets for constant time keyword checks
+        self.keywords = set(self.common_simc_c_keywords + self.simc_unique_keywords)
+        self.c_keywords = set(self.c_unique_keywords + self.common_simc_c_keywords)
+
     def __read_source_code(self):
         """
         Read source code from source file path and return it in a string
@@ -95,9 +195,9 @@ class LexicalAnalyzer:
         str: sim-C source code
         """
 
-        # Open file and read sim-C source code
+        # Open file (or source code given as string) and read sim-C source code
         source_code = ""
-        with open(self.source_filename, "r") as file:
+        with self.__open_source() as file:
             source_code = file.read()
 
         # Add end of string character to indicate end of source code
@@ -105,14 +205,43 @@ class LexicalAnalyzer:
 
         return source_code
 
-    def update_filename(self, source_filename):
+    def __error(self, msg):
+        """
+        Report an error at the current line and column of source code
+
+        Params
+        ======
+        msg (string) = The message to be shown as error message
+        """
+
+        index = min(self.current_source_index, len(self.source_code))
+        column = index - self.source_code.rfind("\n", 0, index)
+
+        error(msg, self.line_num, column)
+
+    def __open_source(self):
+        """
+        Open source code for reading, line endings are translated the same way for files and strings
+
+        Returns
+        =======
+        file: sim-C source code opened in text mode
+        """
+
+        if self.source_text is not None:
+            return io.StringIO(self.source_text, newline=None)
+
+        return open(self.source_filename, "r")
+
+    def update_filename(self, source_filename, source_code=None):
         """
-        Update sim-C source file path
+        Update sim-C source file path (and source code if it is not read from the file)
 
         Used during lexical analysis of module sources
         """
 
         self.source_filename = source_filename
+        self.source_text = source_code
 
     def __update_source_index(self, by=1):
         """
@@ -145,11 +274,19 @@ class LexicalAnalyzer:
         self.tokens.append(Token(token_if_false, "", self.line_num))
         self.__update_source_index()
 
-    def __initialize_flags_counters(self):
+    def __initialize_flags_counters(self, module_name):
         """
         Initialize flags and counter variables used for lexical analysis
+
+        Params
+        ======
+        module_name (string) = Name of module whose source code is analyzed
         """
 
+        # Scope tree of module, tokens before num_resolved have been resolved
+        self.scope_resolver = ScopeResolver(self.symbol_table, module_name)
+        self.num_resolved = 0
+
         # Line number
         self.line_num = 1
 
@@ -160,7 +297,7 @@ class LexicalAnalyzer:
         self.comment_str = ""
 
         # Directory where installed modules can be found
-        self.module_dir = os.path.join(os.path.dirname(__file__), "modules")
+        self.module_dir = MODULE_DIR
 
         # Path to source code of all the modules
         self.module_source_paths = []
@@ -198,7 +335,7 @@ class LexicalAnalyzer:
         bool: Whether the value passed is a keyword or not
         """
 
-        return value in (self.common_simc_c_keywords + self.simc_unique_keywords)
+        return value in self.keywords
 
     def __numeric_val(self):
         """
@@ -212,12 +349,22 @@ class LexicalAnalyzer:
             numeric_constant += self.source_code[self.current_source_index]
             self.__update_source_index()
 
+        self.__add_numeric_token(numeric_constant)
+
+    def __add_numeric_token(self, numeric_constant):
+        """
+        Makes entry for numeric constant in symbol table and generates number token
+
+        Params
+        ======
+        numeric_constant (string) = Numeric constant as it appears in source code
+        """
+
         # If a numeric constant contains more than 1 decimal point (.) then that is invalid
         if numeric_constant.count(".") > 1:
-            error(
+            self.__error(
                 "Invalid numeric constant, cannot have more than one decimal point in a"
-                " number!",
-                self.line_num,
+                " number!"
             )
 
         # Check the length after . to distinguish between float and double
@@ -256,7 +403,7 @@ class LexicalAnalyzer:
         ):
             # If we reach the end of source code then the string is unterminated
             if self.source_code[self.current_source_index] in ["\0", "\n"]:
-                error("Unterminated string", self.line_num)
+                self.__error("Unterminated string")
 
             # Process \" and \' escape sequences
             if (
@@ -274,30 +421,26 @@ class LexicalAnalyzer:
 
         # If we reached end of source code without terminating string then it is unterminated
         if self.current_source_index == len(self.source_code):
-            error("Unterminated string", self.line_num)
+            self.__error("Unterminated string")
 
         # Skip the " or ' character so that it does not loop back to this function incorrectly
         self.__update_source_index()
 
+        self.__add_string_token(string_constant)
+
+    def __add_string_token(self, string_constant):
+        """
+        Makes entry for string constant in symbol table and generates string token
+
+        Params
+        ======
+        string_constant (string) = Contents of string without quotes
+        """
+
         # Determine the type of data
         type_ = "char"
 
-        escape_sequences = [
-            "\\\\",
-            "\\0",
-            "\\n",
-            "\\a",
-            "\\b",
-            "\\f",
-            "\\r",
-            "\\t",
-            "\\v",
-            "\\?",
-            "\\'",
-            '\\"',
-        ]
-
-        if len(string_constant) > 1 and string_constant not in escape_sequences:
+        if len(string_constant) > 1 and string_constant not in ESCAPE_SEQUENCES:
             type_ = "string"
 
         # Put appropriate quote
@@ -326,36 +469,31 @@ class LexicalAnalyzer:
             value += self.source_code[self.current_source_index]
             self.__update_source_index()
 
-        # Check if value (name of type) is valid or not
-        allowed_dtypes_for_casting = ["int", "float", "double"]
+        self.__add_keyword_identifier_token(
+            value, self.source_code[self.current_source_index], force_add_to_table
+        )
+
+    def __add_keyword_identifier_token(self, value, next_char, force_add_to_table):
+        """
+        Generates keyword, constant, type cast or identifier token for a word in source code
+
+        Params
+        ======
+        value              (string) = The word as it appears in source code
+        next_char          (string) = Character following the word
+        force_add_to_table (bool)   = Make a new symbol table entry even if the identifier is present
+        """
 
         # Check if next character is (, then it can possibly be explicit typecasting
         allow_c_keyword = False
-        if (
-            self.source_code[self.current_source_index] == "("
-            and value in allowed_dtypes_for_casting
-        ):
+        if next_char == "(" and value in ALLOWED_DTYPES_FOR_CASTING:
             allow_c_keyword = True
 
-        # For generating bool or math constant type tokens
-        types = namedtuple("types", ["data_type", "token_type"])
-        const_with_types = {
-            "true": types("bool", "bool"),
-            "false": types("bool", "bool"),
-            "PI": types("double", "number"),
-            "E": types("double", "number"),
-            "inf": types("double", "number"),
-            "NaN": types("double", "number"),
-        }
-
         # Handle boolean and math constants
-        if value in const_with_types.keys():
-            id_ = self.symbol_table.entry(
-                value, const_with_types[value].data_type, "constant"
-            )
-            self.tokens.append(
-                Token(const_with_types[value].token_type, id_, self.line_num)
-            )
+        if value in CONST_WITH_TYPES:
+            data_type, token_type = CONST_WITH_TYPES[value]
+            id_ = self.symbol_table.entry(value, data_type, "constant")
+            self.tokens.append(Token(token_type, id_, self.line_num))
             return
 
         # Check if value is keyword or not
@@ -363,35 +501,73 @@ class LexicalAnalyzer:
             self.tokens.append(Token(value, "", self.line_num))
             return
 
-        C_keywords = self.c_unique_keywords + self.common_simc_c_keywords
-
         # If this flag is true then we won't throw error when C keyword is used as id
         # This helps in case of explicit type casting
         if allow_c_keyword:
             self.tokens.append(Token("type_cast", value, self.line_num))
             return
         else:
-            if value in C_keywords:
-                error("A keyword cannot be an identifier - %s" % value, self.line_num)
+            if value in self.c_keywords:
+                self.__error("A keyword cannot be an identifier - %s" % value)
 
         # Check if identifier is in symbol self.symbol_table
         id_ = self.symbol_table.get_by_symbol(value)
 
-        id_info = (
-            self.symbol_table.symbol_table[id_][-1].split("-") if id_ != -1 else [""]
-        )
-        if id_ != -1 and len(id_info) == 3:
-            force_add_to_table = True
+        # Identifiers declared in another module (or the main source) get their own entry
+        if id_ != -1:
+            scope = self.symbol_table.symbol_table[id_].scope
+            if scope and scope.module_name != self.scope_resolver.module_name:
+                force_add_to_table = True
 
         # If identifier is not in symbol self.symbol_table then give a placeholder datatype var
         if id_ == -1 or force_add_to_table:
-            id_ = self.symbol_table.entry(
-                value, "var", "variable", scope=str(self.line_num)
-            )
+            id_ = self.symbol_table.entry(value, "var", "variable")
 
         # Return id token and current index in source code
         self.tokens.append(Token("id", id_, self.line_num))
 
+    def __process_word_token(self):
+        """
+        Updates lexer state after a keyword or identifier token has been generated
+        """
+
+        # If token is an id it might be name of a module
+        if self.tokens[-1].type == "id":
+            self.got_num_or_var = True
+
+            if self.is_id_module_name:
+                # Switch off the flag
+                self.is_id_module_name = not self.is_id_module_name
+
+                # Get name of module from symbol table
+                module_name, _, _, _, _ = self.symbol_table.get_by_id(
+                    self.tokens[-1].val
+                )
+
+                module_path = os.path.join(self.module_dir, module_name + ".simc")
+
+                # Modules given as source code take precedence over installed modules
+                if module_name in self.module_sources:
+                    self.module_source_paths.append(module_name + ".simc")
+                # Check if module is installed
+                elif os.path.exists(module_path):
+                    self.module_source_paths.append(module_path)
+                else:
+                    self.__error(
+                        "Module "
+                        + str(module_name)
+                        + " not found, install it before using"
+                    )
+        # Identify BEGIN_C token
+        elif self.tokens[-1].type == "BEGIN_C":
+            self.raw_c_begin = True
+        # Identify END_C token
+        elif self.tokens[-1].type == "END_C":
+            self.raw_c_begin = False
+        # Identify import token
+        elif self.tokens[-1].type == "import":
+            self.is_id_module_name = True
+
     def __get_raw_tokens(self):
         """
         Makes RAW_C tokens for each line of C code written between BEGIN_C and END_C
@@ -411,7 +587,7 @@ class LexicalAnalyzer:
                 self.line_num += 1
                 return
             elif self.source_code[self.current_source_index] == "\0":
-                error("No matching END_C found to BEGIN_C", self.line_num)
+                self.__error("No matching END_C found to BEGIN_C")
             else:
                 self.tokens.append(Token("RAW_C", raw_c_code, self.line_num))
 
@@ -419,24 +595,11 @@ class LexicalAnalyzer:
             self.__update_source_index()
             self.line_num += 1
 
-    def lexical_analyze(self):
+    def __scan_legacy(self):
         """
-        Generate tokens from source code
-
-        Returns
-        ========
-        list: A list of tokens of the source code, if the code is lexically correct
-        list: A list of module source paths
+        Generate tokens by examining the source code one character at a time
         """
 
-        # Read source code from file, initialize flags and counters
-        self.source_code = self.__read_source_code()
-        self.current_source_index = 0
-
-        self.__initialize_flags_counters()
-
-        self.tokens = []
-
         # Loop until end of source code
         while self.source_code[self.current_source_index] != "\0":
 
@@ -448,6 +611,10 @@ class LexicalAnalyzer:
                 self.__get_raw_tokens()
                 self.raw_c_begin = False
 
+            # Resolve scopes of tokens generated in the last step
+            if len(self.tokens) > self.num_resolved:
+                self.__resolve_new_tokens()
+
             # If a digit appears, call numeric_val function and add the numeric token to list
             if is_digit(self.source_code[self.current_source_index]):
                 self.__numeric_val()
@@ -467,45 +634,7 @@ class LexicalAnalyzer:
                 if len(self.tokens) > 0 and self.tokens[-1].type == "var":
                     force_add_to_table = True
                 self.__keyword_identifier(force_add_to_table=force_add_to_table)
-
-                # If token is an id it might be name of a module
-                if self.tokens[-1].type == "id":
-                    self.got_num_or_var = True
-
-                    if self.is_id_module_name:
-                        # Switch off the flag
-                        self.is_id_module_name = not self.is_id_module_name
-
-                        # Get name of module from symbol table
-                        module_name, _, _, _, _ = self.symbol_table.get_by_id(
-                            self.tokens[-1].val
-                        )
-
-                        module_path = os.path.join(
-                            self.module_dir, module_name + ".simc"
-                        )
-
-                        # Check if module is installed
-                        if os.path.exists(module_path):
-                            self.module_source_paths.append(module_path)
-                        else:
-                            error(
-                                "Module "
-                                + str(module_name)
-                                + " not found, install it before using",
-                                self.line_num,
-                            )
-                # Identify BEGIN_C token
-                elif self.tokens[-1].type == "BEGIN_C":
-                    self.raw_c_begin = True
-                    continue
-                # Identify END_C token
-                elif self.tokens[-1].type == "END_C":
-                    self.raw_c_begin = False
-                    continue
-                # Identify import token
-                elif self.tokens[-1].type == "import":
-                    self.is_id_module_name = True
+                self.__process_word_token()
 
             # Identifying left paren token
             elif self.source_code[self.current_source_index] == "(":
@@ -524,9 +653,9 @@ class LexicalAnalyzer:
                     # If at any time there is underflow, there are too many closing parantheses.
                     self.top -= 1
                     self.balanced_brackets_stack = self.balanced_brackets_stack[:-1]
-                    error("Too many closing parentheses", self.line_num)
+                    self.__error("Too many closing parentheses")
                 elif self.balanced_brackets_stack[self.top] != "(":
-                    error("Unbalanced parentheses error", self.line_num)
+                    self.__error("Unbalanced parentheses error")
                 else:
                     self.top -= 1
                     self.balanced_brackets_stack = self.balanced_brackets_stack[:-1]
@@ -549,7 +678,7 @@ class LexicalAnalyzer:
                         self.tokens.append(Token("call_end", "", self.line_num))
 
                 else:
-                    error("Parentheses does not match", self.line_num)
+                    self.__error("Parentheses does not match")
 
                 self.__update_source_index()
 
@@ -558,7 +687,7 @@ class LexicalAnalyzer:
                 if self.parantheses_count == 0:
                     self.tokens.append(Token("newline", "", self.line_num))
                 else:
-                    error("Parentheses does not match.", self.line_num)
+                    self.__error("Parentheses does not match.")
 
                 self.__update_source_index()
                 self.line_num += 1
@@ -582,9 +711,9 @@ class LexicalAnalyzer:
                     # If at any time there is underflow, there are too many closing braces.
                     self.top -= 1
                     self.balanced_brackets_stack = self.balanced_brackets_stack[:-1]
-                    error("Too many closing braces", self.line_num)
+                    self.__error("Too many closing braces")
                 elif self.balanced_brackets_stack[self.top] != "{":
-                    error("Unbalanced braces error", self.line_num)
+                    self.__error("Unbalanced braces error")
 
                 else:
                     self.top -= 1
@@ -611,9 +740,9 @@ class LexicalAnalyzer:
                     # If at any time there is underflow, there are too many closing brackets.
                     self.top -= 1
                     self.balanced_brackets_stack = self.balanced_brackets_stack[:-1]
-                    error("Too many closing brackets", self.line_num)
+                    self.__error("Too many closing brackets")
                 elif self.balanced_brackets_stack[self.top] != "[":
-                    error("Unbalanced brackets error", self.line_num)
+                    self.__error("Unbalanced brackets error")
 
                 else:
                     self.top -= 1
@@ -745,9 +874,520 @@ class LexicalAnalyzer:
             else:
                 self.__update_source_index()
 
+    def __read_source_lines(self):
+        """
+        Read source code from source file path one line at a time
+
+        Yields
+        ======
+        str: A line of sim-C source code, the end of string character is added to the last line
+        """
+
+        with self.__open_source() as file:
+            previous_line = None
+
+            # Stay one line behind so that the last line can be identified
+            for line in file:
+                if previous_line is not None:
+                    yield previous_line
+                previous_line = line
+
+        yield (previous_line or "") + "\0"
+
+    def __next_source_window(self):
+        """
+        Replace the current window of source code with the next line when streaming
+
+        Returns
+        =======
+        bool: Whether there was a next line or not
+        """
+
+        if self.source_lines is None:
+            return False
+
+        line = next(self.source_lines, None)
+        if line is None:
+            return False
+
+        self.source_code = line
+        self.current_source_index = 0
+
+        return True
+
+    def __extend_source_window(self):
+        """
+        Append the next line to the current window of source code when streaming
+
+        Returns
+        =======
+        bool: Whether there was a next line or not
+        """
+
+        if self.source_lines is None:
+            return False
+
+        line = next(self.source_lines, None)
+        if line is None:
+            return False
+
+        self.source_code += line
+
+        return True
+
+    def __scan_table(self):
+        """
+        Generate tokens using a dispatch table from the first character of a token to the method which scans it,
+        lexemes are sliced out of the source code using compiled patterns
+
+        The source code is scanned as a window (either the whole source or a single line when streaming), this
+        is a generator which yields each time a window has been completely scanned
+        """
+
+        # Dispatch table from character to scanning method
+        dispatch = {
+            '"': self.__scan_string,
+            "'": self.__scan_string,
+            "(": self.__scan_opening_bracket,
+            "{": self.__scan_opening_bracket,
+            "[": self.__scan_opening_bracket,
+            ")": self.__scan_closing_bracket,
+            "}": self.__scan_closing_bracket,
+            "]": self.__scan_closing_bracket,
+            "\n": self.__scan_newline,
+            "&": self.__scan_ampersand,
+            "/": self.__scan_slash,
+            "!": self.__scan_exclamation,
+            ",": self.__scan_punctuation,
+            ":": self.__scan_punctuation,
+        }
+        for char in "0123456789.":
+            dispatch[char] = self.__scan_number
+        for char in string.ascii_letters + "_":
+            dispatch[char] = self.__scan_word
+        for char in OPERATOR_TOKENS:
+            dispatch[char] = self.__scan_operator
+        for char in " \t\r":
+            dispatch[char] = self.__scan_whitespace
+
+        # Loop until end of source code
+        while True:
+
+            # Resolve scopes of tokens generated in the last step
+            if len(self.tokens) > self.num_resolved:
+                self.__resolve_new_tokens()
+
+            # Once the current window of source code has been scanned pause so that the caller can
+            # consume the tokens, and then move to the next window
+            if self.current_source_index >= len(self.source_code):
+                yield
+                if not self.__next_source_window():
+                    break
+
+            char = self.source_code[self.current_source_index]
+            if char == "\0":
+                break
+
+            # If we have encountered BEGIN_C, copy everything exactly same until END_C
+            if self.raw_c_begin:
+                self.__scan_raw_lines()
+                self.raw_c_begin = False
+                continue
+
+            scan = dispatch.get(char)
+
+            # Tokens generated by a step begin at the character it started from
+            start = self.current_source_index
+            num_tokens = len(self.tokens)
+
+            if scan is not None:
+                scan()
+            # Non ascii letters can start an identifier as well
+            elif char.isalpha():
+                self.__scan_word()
+            # Otherwise skip the character
+            else:
+                self.current_source_index += 1
+
+            if len(self.tokens) > num_tokens:
+                column = start - self.source_code.rfind("\n", 0, start)
+                for token in self.tokens[num_tokens:]:
+                    token.column = column
+
+    def __scan_number(self):
+        """
+        Scans numeric constant
+        """
+
+        match = NUMBER_PATTERN.match(self.source_code, self.current_source_index)
+        self.current_source_index = match.end()
+
+        self.__add_numeric_token(match.group())
+        self.got_num_or_var = True
+
+    def __scan_string(self):
+        """
+        Scans string constant enclosed in " or '
+        """
+
+        start_char = self.source_code[self.current_source_index]
+
+        # Skip the first " or ' and match the contents of string
+        match = STRING_BODY_PATTERNS[start_char].match(
+            self.source_code, self.current_source_index + 1
+        )
+
+        # If string is not closed before end of line or source code then the string is unterminated
+        if self.source_code[match.end()] != start_char:
+            self.__error("Unterminated string")
+
+        # Skip the closing " or ' character
+        self.current_source_index = match.end() + 1
+
+        self.__add_string_token(match.group())
+
+    def __scan_word(self):
+        """
+        Scans keyword or identifier
+        """
+
+        source_code = self.source_code
+
+        force_add_to_table = False
+        if len(self.tokens) > 0 and self.tokens[-1].type == "var":
+            force_add_to_table = True
+
+        # Ascii characters are matched by pattern, non ascii letters are consumed one at a time
+        end = self.current_source_index
+        while True:
+            end = IDENTIFIER_PATTERN.match(source_code, end).end()
+            if not source_code[end].isalpha():
+                break
+            end += 1
+
+        value = source_code[self.current_source_index : end]
+        self.current_source_index = end
+
+        self.__add_keyword_identifier_token(
+            value, source_code[end], force_add_to_table
+        )
+        self.__process_word_token()
+
+    def __scan_opening_bracket(self):
+        """
+        Scans (, { or [
+        """
+
+        char = self.source_code[self.current_source_index]
+
+        # To check if brackets are balanced
+        self.top += 1
+        self.balanced_brackets_stack.append(char)
+
+        if char == "(":
+            self.parantheses_count += 1
+        elif char == "{":
+            self.local_brace_count += 1
+            self.global_left_brace_count += 1
+
+        self.tokens.append(Token(OPENING_BRACKET_TOKENS[char], "", self.line_num))
+        self.current_source_index += 1
+
+    def __scan_closing_bracket(self):
+        """
+        Scans ), } or ]
+        """
+
+        char = self.source_code[self.current_source_index]
+        opening_char, token_type, name = CLOSING_BRACKETS[char]
+
+        # To check if brackets are balanced
+        if self.top == -1:
+            # If at any time there is underflow, there are too many closing brackets
+            self.__error("Too many closing %s" % name)
+        elif self.balanced_brackets_stack[self.top] != opening_char:
+            self.__error("Unbalanced %s error" % name)
+        else:
+            self.top -= 1
+            self.balanced_brackets_stack.pop()
+
+        if char == ")":
+            if self.parantheses_count > 0:
+                self.parantheses_count -= 1
+                self.tokens.append(Token(token_type, "", self.line_num))
+
+                # Skip spaces between ) and next code
+                next_index = SPACES_PATTERN.match(
+                    self.source_code, self.current_source_index + 1
+                ).end()
+
+                # Add call_end at end of an expression, which is detected as ")" followed by end line or "{"
+                if self.source_code[next_index] in ["\n", "{", "}", ","]:
+                    self.tokens.append(Token("call_end", "", self.line_num))
+
+                self.current_source_index = next_index
+                return
+            else:
+                self.__error("Parentheses does not match")
+
+        if char == "}":
+            self.local_brace_count -= 1
+
+        self.tokens.append(Token(token_type, "", self.line_num))
+        self.current_source_index += 1
+
+    def __scan_newline(self):
+        """
+        Scans end of line
+        """
+
+        if self.parantheses_count == 0:
+            self.tokens.append(Token("newline", "", self.line_num))
+        else:
+            self.__error("Parentheses does not match.")
+
+        self.current_source_index += 1
+        self.line_num += 1
+
+    def __scan_operator(self):
+        """
+        Scans operators which can be followed by a second character
+        """
+
+        char = self.source_code[self.current_source_index]
+        next_char = self.source_code[self.current_source_index + 1]
+
+        next_chars_tokens, token_otherwise = OPERATOR_TOKENS[char]
+
+        for possible_next_char, token_type in next_chars_tokens:
+            if next_char == possible_next_char:
+                self.tokens.append(Token(token_type, "", self.line_num))
+                self.current_source_index += 2
+                return
+
+        self.tokens.append(Token(token_otherwise, "", self.line_num))
+        self.current_source_index += 1
+
+    def __scan_ampersand(self):
+        """
+        Scans and, bitwise and, bitwise and equal or address of operator
+        """
+
+        next_char = self.source_code[self.current_source_index + 1]
+
+        if next_char == "&":
+            self.tokens.append(Token("and", "", self.line_num))
+            self.current_source_index += 2
+        elif self.got_num_or_var:
+            if next_char == "=":
+                self.tokens.append(Token("bitwise_and_equal", "", self.line_num))
+                self.current_source_index += 2
+            else:
+                self.tokens.append(Token("bitwise_and", "", self.line_num))
+                self.current_source_index += 1
+        else:
+            self.tokens.append(Token("address_of", "", self.line_num))
+            self.current_source_index += 1
+
+    def __scan_slash(self):
+        """
+        Scans divide, divide equal, single line comments and multi line comments
+        """
+
+        source_code = self.source_code
+        next_char = source_code[self.current_source_index + 1]
+
+        if next_char == "=":
+            self.tokens.append(Token("divide_equal", "", self.line_num))
+            self.current_source_index += 2
+        # Single line comment runs until end of line
+        elif next_char == "/":
+            start = self.current_source_index + 2
+            end = source_code.find("\n", start)
+
+            # Comment on the last line ends at the end of source code
+            if end == -1:
+                end = len(source_code) - 1
+
+            self.tokens.append(
+                Token("single_line_comment", source_code[start:end], self.line_num)
+            )
+            self.current_source_index = end
+        # Multi line comment runs until */
+        elif next_char == "*":
+            start = self.current_source_index + 2
+            end = source_code.find("*/", start)
+
+            # When streaming, the comment may continue in the following lines
+            while end == -1 and self.__extend_source_window():
+                end = self.source_code.find("*/", len(source_code) - 1)
+                source_code = self.source_code
+
+            if end == -1:
+                self.__error("Unterminated multi line comment")
+
+            comment_str = source_code[start:end]
+            self.line_num += comment_str.count("\n")
+
+            self.tokens.append(
+                Token("multi_line_comment", comment_str, self.line_num)
+            )
+            self.current_source_index = end + 2
+        else:
+            self.tokens.append(Token("divide", "", self.line_num))
+            self.current_source_index += 1
+
+    def __scan_exclamation(self):
+        """
+        Scans not equal operator, ! on its own is skipped
+        """
+
+        if self.source_code[self.current_source_index + 1] == "=":
+            self.tokens.append(Token("not_equal", "", self.line_num))
+            self.current_source_index += 2
+        else:
+            self.current_source_index += 1
+
+    def __scan_punctuation(self):
+        """
+        Scans comma and colon
+        """
+
+        char = self.source_code[self.current_source_index]
+
+        self.tokens.append(Token(PUNCTUATION_TOKENS[char], "", self.line_num))
+        self.current_source_index += 1
+
+    def __scan_whitespace(self):
+        """
+        Skips spaces, tabs and carriage returns
+        """
+
+        self.current_source_index = WHITESPACE_PATTERN.match(
+            self.source_code, self.current_source_index
+        ).end()
+
+    def __scan_raw_lines(self):
+        """
+        Makes RAW_C tokens for each line of C code written between BEGIN_C and END_C
+        """
+
+        while True:
+            source_code = self.source_code
+
+            end = LINE_PATTERN.match(source_code, self.current_source_index).end()
+            raw_c_code = source_code[self.current_source_index : end]
+            self.current_source_index = end
+
+            # If END_C found, skip the newline, and return
+            if raw_c_code.strip() == "END_C":
+                if source_code[end] == "\n":
+                    self.current_source_index += 1
+                self.line_num += 1
+                return
+            elif source_code[end] == "\0":
+                self.__error("No matching END_C found to BEGIN_C")
+            else:
+                self.tokens.append(Token("RAW_C", raw_c_code, self.line_num))
+
+            # Go to next line
+            self.current_source_index += 1
+            self.line_num += 1
+
+            if self.current_source_index >= len(source_code):
+                self.__next_source_window()
+
+    def __resolve_new_tokens(self):
+        """
+        Resolve scopes of the tokens which have been generated since the last call
+        """
+
+        tokens = self.tokens
+        resolve = self.scope_resolver.resolve
+
+        for index in range(self.num_resolved, len(tokens)):
+            resolve(tokens[index])
+
+        self.num_resolved = len(tokens)
+
+    def lexical_analyze(self, module_name="main"):
+        """
+        Generate tokens from source code, identifiers are resolved to the declarations visible from their scope
+
+        Params
+        ======
+        module_name (string) = Name of module whose source code is analyzed
+
+        Returns
+        ========
+        list: A list of tokens of the source code, if the code is lexically correct
+        list: A list of module source paths
+        """
+
+        # Read source code from file, initialize flags and counters
+        self.source_code = self.__read_source_code()
+        self.source_lines = None
+        self.current_source_index = 0
+
+        self.__initialize_flags_counters(module_name)
+
+        self.tokens = []
+
+        if self.scanner == "legacy":
+            self.__scan_legacy()
+        else:
+            for _ in self.__scan_table():
+                pass
+
+        self.__resolve_new_tokens()
+        self.scope_resolver.finish()
+
         # By the end, if stack is not empty, there are extra opening brackets
         if self.top != -1:
-            error("Unbalanced parentheses/braces/brackets error", self.line_num)
+            self.__error("Unbalanced parentheses/braces/brackets error")
 
         # Return the generated tokens and module source paths
         return self.tokens, self.module_source_paths
+
+    def iter_tokens(self, module_name="main"):
+        """
+        Generate tokens from source code lazily
+
+        The source code is read and scanned one line at a time (multi line comments and raw C blocks are
+        read until they end) with the table driven scanner, so memory does not grow with the size of
+        the source. Module source paths are available in module_source_paths once the generator is exhausted.
+
+        Yields
+        ======
+        Token: The tokens of the source code in order, if the code is lexically correct
+        """
+
+        self.source_lines = self.__read_source_lines()
+        self.source_code = ""
+        self.current_source_index = 0
+
+        self.__initialize_flags_counters(module_name)
+
+        self.tokens = []
+
+        # Number of tokens at the beginning of self.tokens which have already been yielded
+        num_yielded = 0
+
+        for _ in self.__scan_table():
+            for token in self.tokens[num_yielded:]:
+                yield token
+
+            # Only the last token is kept as it decides how the next word is processed
+            del self.tokens[:-1]
+            num_yielded = len(self.tokens)
+            self.num_resolved = len(self.tokens)
+
+        self.__resolve_new_tokens()
+        self.scope_resolver.finish()
+
+        for token in self.tokens[num_yielded:]:
+            yield token
+
+        # By the end, if stack is not empty, there are extra opening brackets
+        if self.top != -1:
+            self.__error("Unbalanced parentheses/braces/brackets error")
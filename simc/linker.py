@@ -0,0 +1,386 @@
+# Modules for finding names of modules and of functions defined by modules, and hashing them
+import os
+import re
+import json
+import hashlib
+
+# Module for reporting errors of a module with the path of module
+from .diagnostics import collecting
+
+# Module for measuring the front end of each module
+from .compile_stats import CompileStats
+
+# Module for the symbol table of each module
+from .symbol_table import SymbolTable
+
+# Module for tokens stored compactly while they are passed between processes
+from .token_class import TokenStream, TOKEN_KINDS
+
+# Module for using lexical analyzer
+from .lexical_analyzer import LexicalAnalyzer
+
+# Module for using parser
+from .parser.simc_parser import parse
+
+# Definitions of functions in sim-C source code
+FUNCTION_DEFINITION = re.compile(r"\bfun\s+([A-Za-z_]\w*)")
+
+# Kinds of tokens starting the definition of a function
+FUN_KIND = TOKEN_KINDS["fun"]
+ID_KIND = TOKEN_KINDS["id"]
+
+# Size of source code of modules (in bytes) below which starting processes costs more than it saves
+PARALLEL_FRONT_END_MIN_SIZE = 64 * 1024
+
+
+class ModuleUnit:
+    """
+    ModuleUnit class is the result of front end of a module, its tokens, opcodes and type graph refer to the ids
+    of a symbol table of its own until the module is linked into the symbol table of program
+    """
+
+    __slots__ = ("name", "filename", "stream", "opcodes", "table", "stages")
+
+    def __init__(self, name, filename, stream, opcodes, table, stages=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        name     (string)      = Name of module
+        filename (string)      = Source path of module
+        stream   (TokenStream) = Tokens of module
+        opcodes  (list)        = Opcodes of module, None if the module calls functions of modules imported
+                                 before it, it is parsed after it is linked then
+        table    (SymbolTable) = Symbol table of module
+        stages   (list)        = StageStats of lexing and parsing module
+        """
+
+        self.name = name
+        self.filename = filename
+        self.stream = stream
+        self.opcodes = opcodes
+        self.table = table
+        self.stages = stages or []
+
+
+def defined_functions(source_code):
+    """
+    Returns names of functions defined in sim-C source code, without lexing it
+
+    Params
+    ======
+    source_code (string) = sim-C source code
+
+    Returns
+    =======
+    set: Names of functions (names in comments or strings are included as well)
+    """
+
+    return set(FUNCTION_DEFINITION.findall(source_code))
+
+
+def module_front_end(
+    module_name, filename, source_code, imported_functions, trace_memory=False
+):
+    """
+    Lex and parse a module with a symbol table of its own, this runs in a process of the pool
+
+    Params
+    ======
+    module_name        (string) = Name of module
+    filename           (string) = Source path of module
+    source_code        (string) = sim-C source code of module
+    imported_functions (set)    = Names of functions defined by modules imported before this one
+    trace_memory       (bool)   = Whether peak memory of lexing and parsing is measured
+
+    Returns
+    =======
+    ModuleUnit: Tokens, opcodes and symbol table of module
+    """
+
+    table = SymbolTable()
+    stats = CompileStats(trace_memory)
+
+    with stats, collecting(filename):
+        with stats.stage("lex", module_name) as stage:
+            lexical_analyzer = LexicalAnalyzer(
+                filename, table, source_code=source_code
+            )
+            tokens, _ = lexical_analyzer.lexical_analyze(module_name=module_name)
+            stage.tokens = len(tokens)
+            stage.symbols = len(table.symbol_table)
+
+        # Calls to functions of other modules can only be parsed once their definitions are linked
+        opcodes = None
+        if not any(
+            entry.value in imported_functions
+            for entry in table.symbol_table.values()
+            if entry.typedata == "variable" and not entry.scope
+        ):
+            with stats.stage("parse", module_name) as stage:
+                opcodes = parse(tokens, table)
+                stage.opcodes = len(opcodes)
+                stage.symbols = len(table.symbol_table)
+
+    return ModuleUnit(
+        module_name, filename, TokenStream(tokens), opcodes, table, stats.stages
+    )
+
+
+def module_key(module_name, filename, source_code, imported_functions):
+    """
+    Returns the key of result of front end of a module, it depends on the functions of modules imported before
+    as they decide whether the module is parsed before it is linked
+
+    Params
+    ======
+    module_name        (string) = Name of module
+    filename           (string) = Source path of module
+    source_code        (string) = sim-C source code of module
+    imported_functions (set)    = Names of functions defined by modules imported before this one
+
+    Returns
+    =======
+    string: Hex digest identifying the front end of module
+    """
+
+    parts = [module_name, filename, source_code, sorted(imported_functions)]
+
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def module_front_ends(
+    module_source_paths, module_sources=None, jobs=1, trace_memory=False, cache=None
+):
+    """
+    Run the front end of imported modules, modules are independent of each other so they run in parallel
+
+    Params
+    ======
+    module_source_paths (list)   = Source paths of imported modules
+    module_sources      (dict)   = Module name -> sim-C source code of modules which are not installed
+    jobs                (int)    = Number of processes
+    trace_memory        (bool)   = Whether peak memory of lexing and parsing modules is measured
+    cache               (object) = Cache of ModuleUnits with load(stage, key) and store(stage, key, value) like
+                                   BuildCache, every load must return a new copy as linking changes the unit,
+                                   None to always run the front end
+
+    Returns
+    =======
+    list: ModuleUnit of each module in order of imports
+    """
+
+    module_sources = module_sources or {}
+
+    names = []
+    sources = []
+    imported = []
+    functions = set()
+    for module_source_path in module_source_paths:
+        module_name = os.path.basename(module_source_path).split(".")[0]
+        source_code = module_sources.get(module_name)
+        if source_code is None:
+            with open(module_source_path, "r") as file:
+                source_code = file.read()
+
+        names.append(module_name)
+        sources.append(source_code)
+        imported.append(set(functions))
+        functions |= defined_functions(source_code)
+
+    units = [None] * len(names)
+    keys = [None] * len(names)
+    if cache is not None:
+        for index, module_source_path in enumerate(module_source_paths):
+            keys[index] = module_key(
+                names[index], module_source_path, sources[index], imported[index]
+            )
+            units[index] = cache.load("module", keys[index])
+            if units[index] is not None:
+                # Stages of a cached module were measured by the compilation which ran them
+                units[index].stages = []
+
+    missing = [index for index, unit in enumerate(units) if unit is None]
+    arguments = [
+        [names[index] for index in missing],
+        [module_source_paths[index] for index in missing],
+        [sources[index] for index in missing],
+        [imported[index] for index in missing],
+        [trace_memory] * len(missing),
+    ]
+
+    jobs = min(jobs, len(missing))
+    if jobs <= 1 or sum(map(len, arguments[2])) < PARALLEL_FRONT_END_MIN_SIZE:
+        results = list(map(module_front_end, *arguments))
+    else:
+        # Imported here as starting the pool is only worth it for large modules
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(module_front_end, *arguments))
+
+    for index, unit in zip(missing, results):
+        # Units are stored before linking changes them
+        if cache is not None:
+            cache.store("module", keys[index], unit)
+        units[index] = unit
+
+    return units
+
+
+class ModuleLinker:
+    """
+    ModuleLinker class merges the symbol tables of modules into the symbol table of program, in order of imports
+    so that ids are the same however the modules were compiled
+
+    Entries of a module get ids after the entries of program and of modules linked before it, except for
+    - constants which are already in the table, they share its entry
+    - functions and global variables of module which the program uses (but doesn't declare), the entry of
+      module takes the place of the entry made for the name in program
+    - names which the module uses (but doesn't declare) that are functions of modules linked before it
+    """
+
+    def __init__(self, table):
+        """
+        Class initializer
+
+        Params
+        ======
+        table (SymbolTable) = Symbol table of program, after lexical analysis of source code
+        """
+
+        self.table = table
+
+        # Name -> id of functions of linked modules
+        self.functions = {}
+
+    def __exported_id(self, entry):
+        # Id of the entry made for a name which is used but not declared by program (or a module linked before)
+        id_ = self.table.get_by_symbol(entry.value)
+        if id_ == -1:
+            return None
+
+        used = self.table.symbol_table[id_]
+        if used.typedata != "variable" or used.scope:
+            return None
+
+        return id_
+
+    def __id_map(self, module_symbols, functions):
+        table = self.table
+        id_map = {}
+
+        for module_id in sorted(module_symbols):
+            entry = module_symbols[module_id]
+            id_ = None
+
+            if entry.typedata == "constant" and table.intern_constants:
+                id_ = table.constants.get((entry.value, entry.type, "constant"))
+            elif module_id in functions or (entry.scope and entry.scope.parent is None):
+                id_ = self.__exported_id(entry)
+            elif entry.typedata == "variable" and not entry.scope:
+                id_ = self.functions.get(entry.value)
+
+            if id_ is None:
+                id_ = table.id
+                table.id += 1
+
+            id_map[module_id] = id_
+
+        return id_map
+
+    def link(self, unit):
+        """
+        Merge the symbol table of a module into the symbol table of program, ids in tokens, entries, scopes and
+        the type graph of module are renumbered in place
+
+        Params
+        ======
+        unit (ModuleUnit) = Result of front end of module
+        """
+
+        table = self.table
+        module_symbols = unit.table.symbol_table
+        kinds = unit.stream.kinds
+        vals = unit.stream.vals
+
+        # Ids of functions defined by module, modules parsed after linking don't have function entries yet
+        functions = {
+            vals[i + 1]
+            for i in range(len(kinds) - 1)
+            if kinds[i] == FUN_KIND and kinds[i + 1] == ID_KIND
+        }
+
+        id_map = self.__id_map(module_symbols, functions)
+
+        scopes = set()
+        for module_id, entry in module_symbols.items():
+            id_ = id_map[module_id]
+
+            entry.dependencies = [id_map[dep] for dep in entry.dependencies]
+            entry.members = [id_map[member] for member in entry.members]
+            entry.params = [
+                (name, id_map[default] if default is not None else None)
+                for name, default in entry.params
+            ]
+            entry.param_ids = [id_map[param_id] for param_id in entry.param_ids]
+
+            if entry.scope:
+                scopes.add(entry.scope)
+
+            if module_id in functions:
+                self.functions[entry.value] = id_
+
+            # Shared constants and names of other modules keep their entry
+            if id_ in table.symbol_table and table.symbol_table[id_].typedata != "variable":
+                continue
+
+            if id_ not in table.symbol_table:
+                table.symbol_ids.setdefault(entry.value, []).append(id_)
+                if entry.typedata == "constant" and table.intern_constants:
+                    table.constants.setdefault(
+                        (entry.value, entry.type, "constant"), id_
+                    )
+            table.symbol_table[id_] = entry
+
+        # Names declared in scopes of module (scopes are shared by entries, enclosing scopes have entries too)
+        for scope in scopes:
+            scope.names = {name: id_map[id_] for name, id_ in scope.names.items()}
+
+        for i, val in enumerate(vals):
+            if val > 0:
+                vals[i] = id_map[val]
+
+        graph = unit.table.type_graph
+        program_graph = table.type_graph
+        for func_id, terms in graph.returns.items():
+            program_graph.returns.setdefault(id_map[func_id], []).extend(
+                renumber_term(term, id_map) for term in terms
+            )
+        program_graph.called.update(id_map[func_id] for func_id in graph.called)
+        for deferred in graph.deferred:
+            deferred.term = renumber_term(deferred.term, id_map)
+            program_graph.deferred.append(deferred)
+
+        unit.table = table
+
+
+def renumber_term(term, id_map):
+    """
+    Returns the steps of an expression recorded for type inference with ids of another symbol table
+
+    Params
+    ======
+    term   (list) = Steps of expression
+    id_map (dict) = Old id -> new id
+
+    Returns
+    =======
+    list: Steps of expression with new ids
+    """
+
+    return [
+        (step[0], id_map[step[1]]) if step[0] in ["operand", "call"] else step
+        for step in term
+    ]
@@ -1,8 +1,65 @@
+# Module for small int opcode kinds
+from enum import IntEnum
+
+# Every type of opcode that can be generated by the parser
+OPCODE_TYPES = [
+    "MAIN",
+    "END_MAIN",
+    "array_assign",
+    "array_no_assign",
+    "array_only_assign",
+    "assign",
+    "break",
+    "case",
+    "continue",
+    "default",
+    "do",
+    "else",
+    "else_if",
+    "exit",
+    "for",
+    "func_call",
+    "func_decl",
+    "if",
+    "import",
+    "multi_line_comment",
+    "print",
+    "ptr_assign",
+    "ptr_no_assign",
+    "ptr_only_assign",
+    "raw",
+    "return",
+    "scope_begin",
+    "scope_over",
+    "single_line_comment",
+    "struct_decl",
+    "struct_instantiate",
+    "struct_scope_over",
+    "switch",
+    "unary",
+    "var_assign",
+    "var_no_assign",
+    "while",
+    "while_do",
+]
+
+# Opcode kinds are small ints, the member name is the string type of opcode
+OpCodeKind = IntEnum("OpCodeKind", OPCODE_TYPES)
+
+# Kind -> string type of opcode, indexed directly with the kind
+OPCODE_KIND_NAMES = tuple([""] + OPCODE_TYPES)
+
+# String type of opcode -> kind, plain dict lookup is faster than OpCodeKind[type]
+OPCODE_KINDS = dict(OpCodeKind.__members__)
+
+
 class OpCode:
     """
     OpCode class is responsible for creating opcodes
     """
 
+    __slots__ = ("type", "val", "dtype")
+
     def __init__(self, opcode, val, dtype=None):
         """
         Initializer of OpCode class
@@ -18,6 +75,14 @@ class OpCode:
         self.val = val
         self.dtype = dtype
 
+    @property
+    def kind(self):
+        """
+        Kind of opcode (OpCodeKind)
+        """
+
+        return OPCODE_KINDS[self.type]
+
     def __str__(self):
         """
         Returns string representation of OpCode
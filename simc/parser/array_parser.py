@@ -1,9 +1,9 @@
 from ..global_helpers import error, check_if
 
-from ..op_code import OpCode
+from ..syntax_tree import Group, Operator
 
 
-def array_initializer(tokens, i, table, size_of_array, msg, func_ret_type):
+def array_initializer(tokens, i, table, size_of_array, msg):
     """
     Parse array initializer list
 
@@ -17,14 +17,14 @@ def array_initializer(tokens, i, table, size_of_array, msg, func_ret_type):
 
     Returns
     =======
-    string, string, int: The expression, datatype of the expression and the current index in source
-                         code after parsing
+    Group, string, int: The initializer list, datatype of the expression and the current index in source
+                        code after parsing
     """
     from .simc_parser import expression
     from .function_parser import function_call_statement
 
     # Initial values
-    op_value = ""
+    op_value = Group()
     op_type = -1
 
     # Mapping for precedence checking (double > float > int)
@@ -48,10 +48,11 @@ def array_initializer(tokens, i, table, size_of_array, msg, func_ret_type):
         should_be_types="left_brace",
         error_msg="Expected  {",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Begin array initializer
-    op_value += "{"
+    op_value.parts.append(Operator("{"))
 
     # Maximum possible length of array
     max_length_array = 2 ** 32
@@ -65,29 +66,30 @@ def array_initializer(tokens, i, table, size_of_array, msg, func_ret_type):
 
         # Check end  of expression, stop loop
         if tokens[i].type == "right_brace":
-            op_value += "}"
+            op_value.parts.append(Operator("}"))
             break
 
         # The values overflow size of declared array
         if initialized_value_counts > max_length_array:
-            error("Too many initializers ", tokens[i].line_num)
+            error("Too many initializers ", tokens[i].line_num, tokens[i].column)
 
         # If is a new line, go to next
         if tokens[i].type == "newline":
-            op_value += "\n"
+            op_value.parts.append(Operator("\n"))
             i += 1
             continue
 
         # Check for comma before next element
         if expected_comma and tokens[i].type == "comma":
             expected_comma = False
-            op_value += ","
+            op_value.parts.append(Operator(","))
             i += 1
             continue
         elif expected_comma or (expected_comma is False and tokens[i].type == "comma"):
             error(
                 "Expected values to be separated by comma in initializer list",
                 tokens[i].line_num,
+                tokens[i].column,
             )
 
         # If token is identifier or constant
@@ -96,30 +98,41 @@ def array_initializer(tokens, i, table, size_of_array, msg, func_ret_type):
             value, type_, typedata, _, _ = table.get_by_id(tokens[i].val)
 
             if type_ == "var":
-                error("Variable %s used before declaration" % value, tokens[i].line_num)
+                error(
+                    "Variable %s used before declaration" % value,
+                    tokens[i].line_num,
+                    tokens[i].column,
+                )
 
             # Check if there is more than one type in initializers
             if initialized_value_counts > 1 and type_ != type_of_id:
-                error("Too many unique types in initializers", tokens[i].line_num)
+                error(
+                    "Too many unique types in initializers",
+                    tokens[i].line_num,
+                    tokens[i].column,
+                )
             else:
                 type_of_id = type_
 
             error_message = "Array Initializer parsed incorrectly"
-            op_value_temp, op_type, i_temp, func_ret_type = expression(
+            op_value_temp, op_type, i_temp = expression(
                 tokens,
                 i,
                 table,
                 error_message,
                 block_type_promotion=True,
-                func_ret_type=func_ret_type,
             )
-            op_value += op_value_temp
+            op_value.parts.append(op_value_temp)
 
             # If after splitting by comma there are more than one empty field then throw error
             # One is allowed since there can be one comma at the end like - {1, 2, }
             split_by_comma = op_value_temp.split(",")
-            if split_by_comma.count('') > 1:
-                error("Too many commas at the end of initializer list", line_num=tokens[i].line_num)
+            if [len(group.parts) for group in split_by_comma].count(0) > 1:
+                error(
+                    "Too many commas at the end of initializer list",
+                    tokens[i].line_num,
+                    tokens[i].column,
+                )
 
             # If the size of the array is defined, and if the number of tokens parsed is not equal to
             # what it should be, then display error
@@ -137,7 +150,7 @@ def array_initializer(tokens, i, table, size_of_array, msg, func_ret_type):
                     " entries instead."
                 )
 
-                error(error_message, tokens[i].line_num)
+                error(error_message, tokens[i].line_num, tokens[i].column)
 
             # We need to update the total number of tokens parsed (i) according to the number of tokens
             # parsed in expression( ), which depends on if the second last token is a comma or not.
@@ -173,6 +186,7 @@ def array_initializer(tokens, i, table, size_of_array, msg, func_ret_type):
         should_be_types="right_brace",
         error_msg="Expected  }",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     return op_value, op_type, i + 1
@@ -1,9 +1,9 @@
 from ..global_helpers import error, check_if
 
-from ..op_code import OpCode
+from ..syntax_tree import Keyword, unwrap
 
 
-def if_statement(tokens, i, table, func_ret_type):
+def if_statement(tokens, i, table):
     """
     Parse if statement
 
@@ -12,11 +12,10 @@ def if_statement(tokens, i, table, func_ret_type):
     tokens        (list)        = List of tokens
     i             (int)         = Current index in token
     table         (SymbolTable) = Symbol table constructed holding information about identifiers and constants
-    func_ret_type (dict)        = Dict of functions whose return type could not be resolved immediately
 
     Returns
     =======
-    OpCode, int: The opcode for the assign code and the index after parsing if statement
+    Keyword, int: The statement for the if code and the index after parsing if statement
     """
 
     from .simc_parser import expression, skip_all_nextlines
@@ -27,15 +26,15 @@ def if_statement(tokens, i, table, func_ret_type):
         should_be_types="left_paren",
         error_msg="Expected ( after if statement",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # check if expression follows ( in if statement
-    op_value, op_type, i, func_ret_type = expression(
+    op_value, op_type, i = expression(
         tokens,
         i,
         table,
         "Expected expression inside if statement",
-        func_ret_type=func_ret_type,
     )
 
     # check if ) follows expression in if statement
@@ -44,6 +43,7 @@ def if_statement(tokens, i, table, func_ret_type):
         should_be_types="right_paren",
         error_msg="Expected ) after expression in if statement",
         line_num=tokens[i - 1].line_num,
+        column=tokens[i - 1].column,
     )
 
     # If \n follows ) then skip all the \n characters
@@ -69,10 +69,10 @@ def if_statement(tokens, i, table, func_ret_type):
         if i != len(tokens) and tokens[i].type == "right_brace":
             found_right_brace = True
 
-    return OpCode("if", op_value[1:-1]), ret_idx - 1, func_ret_type
+    return Keyword("if", unwrap(op_value)), ret_idx - 1
 
 
-def switch_statement(tokens, i, table, func_ret_type):
+def switch_statement(tokens, i, table):
     """
     Parse switch statement
 
@@ -81,11 +81,10 @@ def switch_statement(tokens, i, table, func_ret_type):
     tokens        (list)        = List of tokens
     i             (int)         = Current index in token
     table         (SymbolTable) = Symbol table constructed holding information about identifiers and constants
-    func_ret_type (dict)        = Dict of functions whose return type could not be resolved immediately
 
     Returns
     =======
-    OpCode, int: The opcode for the assign code and the index after parsing switch statement
+    Keyword, int: The statement for the switch code and the index after parsing switch statement
     """
 
     from .simc_parser import expression, skip_all_nextlines
@@ -96,15 +95,15 @@ def switch_statement(tokens, i, table, func_ret_type):
         should_be_types="left_paren",
         error_msg="Expected ( after switch",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Expected expression after ( in switch
-    op_value, _, i, func_ret_type = expression(
+    op_value, _, i = expression(
         tokens,
         i,
         table,
         "Expected expression inside switch statement",
-        func_ret_type=func_ret_type,
     )
 
     # Check if ) is present after expression in switch
@@ -113,6 +112,7 @@ def switch_statement(tokens, i, table, func_ret_type):
         should_be_types="right_paren",
         error_msg="Expected ) after expression in switch",
         line_num=tokens[i - 1].line_num,
+        column=tokens[i - 1].column,
     )
 
     # Skip all next lines before {
@@ -126,12 +126,13 @@ def switch_statement(tokens, i, table, func_ret_type):
         should_be_types="left_brace",
         error_msg="Expected { after switch statement",
         line_num=tokens[i + 1].line_num,
+        column=tokens[i + 1].column,
     )
 
-    return OpCode("switch", op_value[1:-1], ""), i, func_ret_type
+    return Keyword("switch", unwrap(op_value), ""), i
 
 
-def case_statement(tokens, i, table, func_ret_type):
+def case_statement(tokens, i, table):
     """
     Parse case statement
 
@@ -140,23 +141,21 @@ def case_statement(tokens, i, table, func_ret_type):
     tokens        (list)        = List of tokens
     i             (int)         = Current index in token
     table         (SymbolTable) = Symbol table constructed holding information about identifiers and constants
-    func_ret_type (dict)        = Dict of functions whose return type could not be resolved immediately
 
     Returns
     =======
-    OpCode, int: The opcode for the assign code and the index after parsing case statement
+    Keyword, int: The statement for the case code and the index after parsing case statement
     """
 
     from .simc_parser import expression
 
     # Expected expression after case keyword
-    op_value, _, i, func_ret_type = expression(
+    op_value, _, i = expression(
         tokens,
         i,
         table,
         "Expected expected expression after case",
         expect_paren=False,
-        func_ret_type=func_ret_type,
     )
 
     # Check if expression is followed by : (colon) in case statement
@@ -165,6 +164,7 @@ def case_statement(tokens, i, table, func_ret_type):
         should_be_types="colon",
         error_msg="Expected : after case in switch statement",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
-    return OpCode("case", op_value, ""), i + 1, func_ret_type
+    return Keyword("case", op_value, ""), i + 1
@@ -0,0 +1,225 @@
+# Module for nodes of syntax tree
+from ..syntax_tree import Group, BinaryOp, UnaryOp
+
+# Import parser constants
+from .parser_constants import (
+    BINARY_OP_PRECEDENCE,
+    DEFAULT_OP_PRECEDENCE,
+    PREFIX_OP_PRECEDENCE,
+    RIGHT_ASSOCIATIVE_OPS,
+    POSTFIX_OPS,
+)
+
+
+class ExpressionBuilder:
+    """
+    ExpressionBuilder class builds the syntax tree of a sequence of operands and operators (enclosed in a pair
+    of parentheses) by precedence climbing
+
+    Operators wait on a stack until an operator with lower precedence (or the end of sequence) shows that their
+    operands are complete, so building a tree takes linear time and no recursion. Commas separate the parts of
+    sequence (like arguments of a call), they are kept between the trees of parts in the resulting group.
+    """
+
+    __slots__ = ("parts", "operands", "operators", "expect_operand", "paren")
+
+    def __init__(self, paren=False):
+        """
+        Class initializer
+
+        Params
+        ======
+        paren (bool) = Whether the sequence is enclosed in parentheses
+        """
+
+        self.parts = []
+        self.operands = []
+
+        # Stack of (operator, precedence, is_prefix)
+        self.operators = []
+
+        self.expect_operand = True
+        self.paren = paren
+
+    def add_operand(self, node):
+        """
+        Add an identifier, constant or a complete sub expression to the sequence
+
+        Params
+        ======
+        node (Expr) = Operand
+        """
+
+        # Operands which are not separated by an operator are kept next to each other in the group
+        if not self.expect_operand:
+            self.finish_part()
+
+        self.operands.append(node)
+        self.expect_operand = False
+
+    def pop_operand(self):
+        """
+        Remove the last operand of sequence, like the base of ^
+
+        Returns
+        =======
+        Expr: The last operand, None if an operand is expected
+        """
+
+        if self.expect_operand:
+            return None
+
+        self.expect_operand = True
+        return self.operands.pop()
+
+    def add_operator(self, node, op_type):
+        """
+        Add an operator to the sequence
+
+        Params
+        ======
+        node    (Operator) = Operator
+        op_type (string)   = Type of token of operator
+        """
+
+        # An operator in place of an operand is a prefix operator
+        if self.expect_operand:
+            self.operators.append((node, PREFIX_OP_PRECEDENCE, True))
+            return
+
+        if op_type in POSTFIX_OPS:
+            self.operands.append(UnaryOp(node, self.operands.pop(), postfix=True))
+            return
+
+        prec = BINARY_OP_PRECEDENCE.get(op_type, DEFAULT_OP_PRECEDENCE)
+        right_assoc = op_type in RIGHT_ASSOCIATIVE_OPS
+
+        # Operators with higher precedence on the stack have all of their operands now
+        while self.operators and (
+            self.operators[-1][1] > prec
+            or (self.operators[-1][1] == prec and not right_assoc)
+        ):
+            self.reduce()
+
+        self.operators.append((node, prec, False))
+        self.expect_operand = True
+
+    def add_comma(self, node):
+        """
+        Add a comma separating two parts of the sequence
+
+        Params
+        ======
+        node (Operator) = Comma
+        """
+
+        self.finish_part()
+        self.parts.append(node)
+
+    def reduce(self):
+        """
+        Replace the operator on top of the stack and its operands with a node
+        """
+
+        operator, _, is_prefix = self.operators.pop()
+        right = self.operands.pop()
+
+        if is_prefix:
+            self.operands.append(UnaryOp(operator, right))
+        else:
+            left = self.operands.pop()
+            self.operands.append(BinaryOp(left, operator, right))
+
+    def finish_part(self):
+        """
+        Reduce all the operators on the stack, the tree of operands and operators so far becomes a part
+        """
+
+        if not self.operands and not self.operators:
+            return
+
+        # An operator at the end is missing its operand
+        if self.expect_operand:
+            self.operands.append(Group())
+
+        while self.operators:
+            self.reduce()
+
+        self.parts.append(self.operands.pop())
+        self.expect_operand = True
+
+    def build(self):
+        """
+        Returns the syntax tree of sequence
+
+        Returns
+        =======
+        Group: The trees of parts of sequence separated by commas
+        """
+
+        self.finish_part()
+
+        return Group(self.parts, self.paren)
+
+
+class ExpressionContext:
+    """
+    ExpressionContext class holds the state of an expression being parsed, the arguments of a call, the operand
+    of a type cast or of size and type statements are parsed in a context of their own
+    """
+
+    __slots__ = (
+        "kind",
+        "start",
+        "op_type",
+        "term",
+        "can_defer",
+        "target_id",
+        "accept_unknown",
+        "block_type_promotion",
+        "previous_type",
+        "count_paren",
+        "builders",
+    )
+
+    def __init__(
+        self,
+        kind,
+        start,
+        target_id,
+        term=None,
+        accept_unknown=False,
+        block_type_promotion=False,
+    ):
+        """
+        Class initializer
+
+        Params
+        ======
+        kind                 (string) = Kind of expression (expression, call, type_cast, size or type)
+        start                (int)    = Index of first token of expression
+        target_id            (int)    = Id of identifier being assigned to, None if there is none
+        term                 (list)   = If given then steps of expression are appended to it, so that its
+                                        type can be inferred after parsing
+        accept_unknown       (bool)   = Accept unknown type for variable or not
+        block_type_promotion (bool)   = Whether operands must all have the same type
+        """
+
+        self.kind = kind
+        self.start = start
+        self.op_type = -1
+
+        # F-strings can only wait for types to be inferred if the caller keeps the steps of expression
+        self.can_defer = term is not None
+        self.term = term if term is not None else []
+
+        self.target_id = target_id
+        self.accept_unknown = accept_unknown
+        self.block_type_promotion = block_type_promotion
+
+        # To keep track of Type Promotion
+        self.previous_type = ""
+
+        # Parentheses which are not closed yet, each one builds the tree of its sequence
+        self.count_paren = 0
+        self.builders = [ExpressionBuilder()]
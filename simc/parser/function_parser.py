@@ -1,9 +1,16 @@
 from ..global_helpers import error, check_if
 
-from ..op_code import OpCode
+from ..syntax_tree import Call, Constant, FuncCall, FuncDecl, Marker
 
+from ..type_inference import (
+    UNKNOWN_TYPES,
+    PREC_TO_RETURN_TYPE,
+    term_prec,
+    propagate_types,
+)
 
-def function_call_statement(tokens, i, table, func_ret_type):
+
+def function_call_statement(tokens, i, table):
     """
     Parse function calling statement
 
@@ -12,59 +19,110 @@ def function_call_statement(tokens, i, table, func_ret_type):
     tokens        (list)        = List of tokens
     i             (int)         = Current index in token
     table         (SymbolTable) = Symbol table constructed holding information about identifiers and constants
-    func_ret_type (dict)        = If return type of function is not figured yet
 
     Returns
     =======
-    OpCode, int, dict: The opcode for the assign code, index after parsing function calling statement and function return type
+    FuncCall, int: The statement for the function call and index after parsing function calling statement
     """
 
     from .simc_parser import expression
 
-    # Store the beginning index for function call from imported libraries
-    beg_idx = i
+    check_function_defined(tokens, i, table)
+
+    # Parse the arguments, the expression ends at the ) closing the call
+    op_value, _, end_idx = expression(
+        tokens,
+        i + 1,
+        table,
+        "",
+        accept_empty_expression=True,
+        expect_paren=True,
+        break_at_last_closed_paren=True,
+    )
+
+    call = complete_function_call(tokens, i, end_idx, call_arguments(op_value), table)
+
+    return FuncCall(call), end_idx + 1
+
+
+def check_function_defined(tokens, i, table):
+    """
+    Check that the identifier being called is a function
+
+    Params
+    ======
+    tokens (list)        = List of tokens
+    i      (int)         = Index of name of function in tokens
+    table  (SymbolTable) = Symbol table
+    """
+
+    func_name, _, typedata, _, _ = table.get_by_id(tokens[i].val)
+
+    if typedata == "variable":
+        error(
+            f"No definition found for function {func_name}",
+            tokens[i].line_num,
+            tokens[i].column,
+        )
+
+
+def call_arguments(op_value):
+    """
+    Split the parsed parentheses of a function call into arguments
+
+    Params
+    ======
+    op_value (Group) = Expression holding the parentheses of call
+
+    Returns
+    =======
+    list: Expressions of arguments
+    """
+
+    # Arguments are separated by commas inside the parentheses of call
+    args = op_value.parts[0].split(",") if op_value.parts else []
+    if len(args) == 1 and not args[0].parts:
+        args = []
+
+    return args
+
+
+def complete_function_call(tokens, i, end_idx, args, table):
+    """
+    Check the arguments of a parsed function call and pass their types on to the parameters of function
+
+    Params
+    ======
+    tokens  (list)        = List of tokens
+    i       (int)         = Index of name of function in tokens
+    end_idx (int)         = Index of ) closing the call in tokens
+    args    (list)        = Expressions of arguments
+    table   (SymbolTable) = Symbol table
+
+    Returns
+    =======
+    Call: The function call with missing arguments filled with default values
+    """
 
     # Get information about the function from symbol table
     func_info = table.get_by_id(tokens[i].val)
     func_id = tokens[i].val
     func_name = func_info[0]
-    metadata = func_info[2]
-
-    if metadata == "variable":
-        error(f"No definition found for function {func_name}", tokens[i].line_num)
 
     # Get all parameter ids (default and non-default) and the default values (if any)
-    params, default_values = extract_func_typedata(metadata, table)
+    params, default_values = extract_func_typedata(func_info, table)
     num_formal_params = len(params)
     num_required_args = num_formal_params - len(default_values)
 
-    params_start_idx = i + 1
-
-    # Parse the arguments
-    op_value, op_type, i, func_ret_type = expression(
-        tokens,
-        i + 1,
-        table,
-        "",
-        accept_empty_expression=True,
-        expect_paren=True,
-        func_ret_type=func_ret_type,
-    )
-
-    params_end_idx = i
+    # Identifiers between the parentheses of call, only the first one for each parameter is used
     actual_param_tokens = []
+    for param_idx in range(i + 1, end_idx):
+        if len(actual_param_tokens) == num_formal_params:
+            break
+        if tokens[param_idx].type == "id":
+            actual_param_tokens.append(tokens[param_idx])
 
-    for i in range(params_start_idx, params_end_idx):
-        if tokens[i].type == "id":
-            actual_param_tokens.append(tokens[i])
-
-    # op_value start in 1 because it should start with "params)" not "(params)"
-    op_value = op_value[1:]
-    op_value_list = op_value.replace(" ", "").split(",")
-    op_value_list = (
-        op_value_list if len(op_value_list) > 0 and len(op_value_list[0]) > 0 else []
-    )
-    num_actual_params = len(op_value_list) if op_value_list != [")"] else 0
+    num_actual_params = len(args)
 
     # Check if number of actual and formal parameters match
     if num_actual_params != num_required_args:
@@ -72,12 +130,13 @@ def function_call_statement(tokens, i, table, func_ret_type):
             "Expected {} arguments but got {} in function {}".format(
                 num_required_args, num_actual_params, func_name
             ),
-            tokens[i].line_num,
+            tokens[end_idx].line_num,
+            tokens[end_idx].column,
         )
 
     # Fill the missing values in function call with default values
-    op_value_list = fill_missing_args_with_defaults(
-        op_value_list, default_values, num_actual_params, num_formal_params
+    args = fill_missing_args_with_defaults(
+        args, default_values, num_actual_params, num_formal_params
     )
 
     # Assign datatype to formal parameters
@@ -87,78 +146,46 @@ def function_call_statement(tokens, i, table, func_ret_type):
             continue
 
         # Fetch the datatype of corresponding actual parameter from symbol table
-        _, dtype, _, _, _ = table.get_by_id(
+        arg_id = (
             actual_param_tokens[j].val
             if (len(actual_param_tokens) > 0 and j < len(actual_param_tokens))
-            else table.get_by_symbol(op_value_list[j].replace(")", ""))
+            else table.get_by_symbol(args[j].render().replace(" ", ""))
         )
+        _, dtype, _, _, _ = table.get_by_id(arg_id)
 
-        # The id of the formal parameter will always be greater than the function's identifier in symbol table
-        param_id = table.get_by_symbol(params[j], id_greater_than=func_id)
+        # Id of the formal parameter, functions may have parameters with the same names
+        param_id = func_info.param_ids[j]
 
         # Set the datatype of the formal parameter
-        table.symbol_table[param_id][1] = dtype
-
-        # Resolve pendenting infer types
-        table.resolve_dependency(tokens, i, param_id)
-
-    use_module_tokens = False
-
-    # If it an imported function the type of the function will be a list containing tokens from module's lexing results
-    # Push all the function names and the corresponding position from where to parse
-    if func_info != -1 and type(func_info[1][2]) == list:
-        func_ret_type[func_name] = func_info[1][1]
-        use_module_tokens = True
-
-    # Handles delayed inference of return types, this can occur in two situations
-    # 1 - When the function is part of third party module, 2 - When the function's parameter are contained in return expression
-    if func_name in func_ret_type.keys():
-        # Case 1
-        if use_module_tokens:
-            # Parse the tokens which will help in deciding on the return type
-            _, op_type, _, _ = expression(
-                func_info[1][2],
-                func_ret_type[func_name],
-                table,
-                "",
-                func_ret_type=func_ret_type,
-            )
+        table.symbol_table[param_id].type = dtype
 
-        # Case 2
-        else:
-            _, op_type, _, _ = expression(
-                tokens, func_ret_type[func_name], table, "", func_ret_type=func_ret_type
-            )
+        # If type of actual parameter is not known yet, it is passed on after parsing
+        if dtype in UNKNOWN_TYPES:
+            table.add_dependency(arg_id, param_id)
 
-        #  Map datatype to appropriate datatype in C
-        prec_to_type = {
-            -1: "declared",
-            0: "char*",
-            1: "char*",
-            2: "char",
-            3: "int",
-            4: "float",
-            5: "double",
-            6: "bool",
-        }
-
-        table.symbol_table[table.get_by_symbol(func_name)][1] = prec_to_type[op_type]
-        del func_ret_type[func_name]
+        # Pass the type of parameter on to the identifiers which depend on it
+        propagate_types(table, [param_id])
 
-    return (
-        OpCode("func_call", func_name + "---" + "&&&".join(op_value_list)[:-1], ""),
-        i + 1,
-        func_ret_type,
-    )
+    # Return type may depend on the parameters, so try the recorded return expressions with their types now
+    table.type_graph.called.add(func_id)
+    func_entry = table.symbol_table[func_id]
+    if func_entry.type in UNKNOWN_TYPES:
+        for term in table.type_graph.returns.get(func_id, []):
+            op_type = term_prec(term, table)
+            if op_type != -1:
+                func_entry.type = PREC_TO_RETURN_TYPE[op_type]
+                break
 
+    return Call(func_name, args)
 
-def extract_func_typedata(typedata, table):
+
+def extract_func_typedata(func_info, table):
     """
     Extract typedata of function
 
     Params
     ======
-    typedata    (string)        = Typedata of function in format "function---param1---param2---...&&&default_val1&&&...
+    func_info   (SymbolEntry)   = Symbol table entry of function
     table       (SymbolTable)   = Symbol table
 
     Returns
@@ -167,45 +194,29 @@ def extract_func_typedata(typedata, table):
     default_values  (list)  = Default values
     """
 
-    func_typedata_split = typedata.split("&&&")
-
-    param_segment = func_typedata_split[0]
-
-    # Ignore the first index as it contains function's name
-    parameters = param_segment.split("---")[1:]
+    parameters = [name for name, _ in func_info.params]
 
     default_values = []
-    for seg in func_typedata_split[1:]:
-        default_value, _, _, _, _ = table.get_by_id(int(seg))
-        default_values.append(default_value)
+    for _, default_id in func_info.params:
+        if default_id is not None:
+            default_value, _, _, _, _ = table.get_by_id(default_id)
+            default_values.append(default_value)
 
     return parameters, default_values
 
 
 def fill_missing_args_with_defaults(
-    op_value_list, default_values, num_actual_params, num_formal_params
+    args, default_values, num_actual_params, num_formal_params
 ):
 
     # Compute the offset of default values according to the missing values count
     offset = len(default_values) - num_formal_params + num_actual_params
     default_values = default_values[offset:]
 
-    # If there are not default values to be filled
-    if not default_values:
-        return op_value_list
-
-    args = []
-    for op_value in op_value_list:
-        arg = op_value.replace(")", "")
-        if arg:
-            args.append(arg)
-    args += default_values
-    args[-1] = args[-1] + ")"
+    return args + [Constant(str(default_value)) for default_value in default_values]
 
-    return args
 
-
-def function_definition_statement(tokens, i, table, func_ret_type):
+def function_definition_statement(tokens, i, table):
     """
     Parse function definition statement
     Params
@@ -213,7 +224,6 @@ def function_definition_statement(tokens, i, table, func_ret_type):
     tokens      (list) = List of tokens
     i           (int)  = Current index in token
     table       (SymbolTable) = Symbol table constructed holding information about identifiers and constants
-    func_ret_type (string) = Function return type
     Returns
     =======
     OpCodes, int, string: The opcodes for the assign code, the index, and the name of the function after
@@ -235,6 +245,7 @@ def function_definition_statement(tokens, i, table, func_ret_type):
         should_be_types="id",
         error_msg="Expected function name",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Store the id of function name in symbol table
@@ -249,10 +260,17 @@ def function_definition_statement(tokens, i, table, func_ret_type):
         should_be_types="left_paren",
         error_msg="Expected ( after function name",
         line_num=tokens[i + 1].line_num,
+        column=tokens[i + 1].column,
     )
 
     # Get the function parameter [and default value] tuples
-    parameters, i = function_parameters(tokens, i + 2, table)
+    params_start = i + 2
+    parameters, i = function_parameters(tokens, params_start, table)
+
+    # Default values are numbers or strings, so identifiers in the parameter list are the parameters
+    parameter_ids = [
+        token.val for token in tokens[params_start:i] if token.type == "id"
+    ]
 
     # Check if ) follows expression in function
     check_if(
@@ -260,6 +278,7 @@ def function_definition_statement(tokens, i, table, func_ret_type):
         should_be_types="right_paren",
         error_msg="Expected ) after function params list",
         line_num=tokens[i - 1].line_num,
+        column=tokens[i - 1].column,
     )
 
     # If \n follows ) then skip all the \n characters
@@ -290,28 +309,18 @@ def function_definition_statement(tokens, i, table, func_ret_type):
 
         # If right brace is not found then produce error
         if not found_right_brace:
-            error("Expected } after function body", tokens[i].line_num)
+            error(
+                "Expected } after function body", tokens[i].line_num, tokens[i].column
+            )
 
     else:
-        op_codes.append(OpCode("scope_begin", "", ""))
+        op_codes.append(Marker("scope_begin"))
 
-    # Add the identifier types to function's typedata
+    # Add the parameters to function's entry
     parameter_names = [parameter[0] for parameter in parameters]
-    default_values = [
-        str(parameter[1]) for parameter in parameters if parameter[1] is not None
-    ]
-
-    func_typedata = "function"
-    if parameter_names:
-        func_typedata += "---" + "---".join(parameter_names)
-    if default_values:
-        func_typedata += "&&&" + "&&&".join(default_values)
+    table.symbol_table[func_idx].set_function(parameters, parameter_ids)
 
-    table.symbol_table[func_idx][2] = func_typedata
-
-    op_codes.append(
-        OpCode("func_decl", func_name + "---" + "&&&".join(parameter_names), "")
-    )
+    op_codes.append(FuncDecl(func_name, parameter_names))
 
     # The order now is scope_begin followed by func_decl, but the compiler expects the opposite order
     op_codes.reverse()
@@ -320,7 +329,6 @@ def function_definition_statement(tokens, i, table, func_ret_type):
         op_codes,
         ret_idx - 1,
         func_name,
-        func_ret_type,
     )
 
 
@@ -370,20 +378,29 @@ def function_parameters(tokens, i, table):
                     _, default_val = param_info
                     default_val_required = default_val is not None
             else:
-                error("Parameter expected after comma", tokens[i].line_num)
+                error(
+                    "Parameter expected after comma",
+                    tokens[i].line_num,
+                    tokens[i].column,
+                )
 
         check_if(
             got_type=tokens[i].type,
             should_be_types="right_paren",
             error_msg="Right parentheses expected",
             line_num=tokens[i].line_num,
+            column=tokens[i].column,
         )
 
         # Skip right parantheses
         i += 1
 
     else:
-        error("Function parameters must be identifiers", tokens[i].line_num)
+        error(
+            "Function parameters must be identifiers",
+            tokens[i].line_num,
+            tokens[i].column,
+        )
 
     return parameters, i
 
@@ -418,6 +435,7 @@ def function_parameter(tokens, i, table, default_val_required):
             should_be_types="assignment",
             error_msg="Default value expected for parameter {}".format(parameter),
             line_num=tokens[i].line_num,
+            column=tokens[i].column,
         )
 
         # Skip the assignment operator
@@ -431,6 +449,7 @@ def function_parameter(tokens, i, table, default_val_required):
             error(
                 "Only numbers and strings are allowed as default arguments",
                 tokens[i].line_num,
+                tokens[i].column,
             )
     elif tokens[i].type == "assignment":
         i += 1
@@ -441,6 +460,7 @@ def function_parameter(tokens, i, table, default_val_required):
             error(
                 "Only numbers and strings are allowed as default arguments",
                 tokens[i].line_num,
+                tokens[i].column,
             )
 
     return (parameter, default_val), i
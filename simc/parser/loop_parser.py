@@ -1,9 +1,9 @@
 from ..global_helpers import error, check_if
 
-from ..op_code import OpCode
+from ..syntax_tree import For, Keyword, unwrap
 
 
-def for_statement(tokens, i, table, func_ret_type):
+def for_statement(tokens, i, table):
     """
     Parse for for_loop
     Params
@@ -13,7 +13,7 @@ def for_statement(tokens, i, table, func_ret_type):
     table       (SymbolTable) = Symbol table constructed holding information about identifiers and constants
     Returns
     =======
-    OpCode, int: The opcode for the for loop code and the index after parsing for loop
+    For, int: The statement for the for loop code and the index after parsing for loop
     Grammar
     =======
     for_loop    -> for id in number to number by operator number
@@ -29,6 +29,7 @@ def for_statement(tokens, i, table, func_ret_type):
         should_be_types="id",
         error_msg="Expected variable name",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Check if in follows identifier
@@ -37,6 +38,7 @@ def for_statement(tokens, i, table, func_ret_type):
         should_be_types="in",
         error_msg="Expected in keyword",
         line_num=tokens[i + 1].line_num,
+        column=tokens[i + 1].column,
     )
 
     # Check if number follows in keyword
@@ -48,6 +50,7 @@ def for_statement(tokens, i, table, func_ret_type):
         should_be_types="to",
         error_msg="Expected to keyword",
         line_num=tokens[i + 3].line_num,
+        column=tokens[i + 3].column,
     )
 
     # Check if number follows in keyword
@@ -59,6 +62,7 @@ def for_statement(tokens, i, table, func_ret_type):
         should_be_types="by",
         error_msg="Expected by keyword",
         line_num=tokens[i + 5].line_num,
+        column=tokens[i + 5].column,
     )
 
     word_to_op = {"plus": "+", "minus": "-", "multiply": "*", "divide": "/"}
@@ -85,26 +89,19 @@ def for_statement(tokens, i, table, func_ret_type):
 
     # Return the opcode and i+1 (the token after for loop statement)
     return (
-        OpCode(
-            "for",
-            str(var_name)
-            + "&&&"
-            + str(starting_val)
-            + "&&&"
-            + str(ending_val)
-            + "&&&"
-            + str(operator_type)
-            + "&&&"
-            + sign_needed
-            + "&&&"
-            + str(change_val),
+        For(
+            str(var_name),
+            str(starting_val),
+            str(ending_val),
+            str(operator_type),
+            sign_needed,
+            str(change_val),
         ),
         i + 1,
-        func_ret_type,
     )
 
 
-def while_statement(tokens, i, table, in_do, func_ret_type):
+def while_statement(tokens, i, table, in_do):
     """
     Parse while statement
     Params
@@ -115,7 +112,7 @@ def while_statement(tokens, i, table, in_do, func_ret_type):
     in_do       (bool)        = While is part of do-while or is a separate while
     Returns
     =======
-    OpCode, int: The opcode for the assign code and the index after parsing while statement
+    Keyword, int: The statement for the while code and the index after parsing while statement
     Grammar
     =======
     while_statement -> while(condition) { body }
@@ -135,15 +132,15 @@ def while_statement(tokens, i, table, in_do, func_ret_type):
         should_be_types="left_paren",
         error_msg="Expected ( after while statement",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # check if expression follows ( in while statement
-    op_value, _, i, func_ret_type = expression(
+    op_value, _, i = expression(
         tokens,
         i,
         table,
         "Expected expression inside while statement",
-        func_ret_type=func_ret_type,
     )
 
     # check if ) follows expression in while statement
@@ -152,6 +149,7 @@ def while_statement(tokens, i, table, in_do, func_ret_type):
         should_be_types="right_paren",
         error_msg="Expected ) after expression in while statement",
         line_num=tokens[i - 1].line_num,
+        column=tokens[i - 1].column,
     )
 
     # If while is not part of do-while
@@ -179,8 +177,12 @@ def while_statement(tokens, i, table, in_do, func_ret_type):
 
             # If right brace is not found then produce error
             if not found_right_brace:
-                error("Expected } after while loop body", tokens[i].line_num)
+                error(
+                    "Expected } after while loop body",
+                    tokens[i].line_num,
+                    tokens[i].column,
+                )
 
-        return OpCode("while", op_value[1:-1]), ret_idx - 1, func_ret_type
+        return Keyword("while", unwrap(op_value)), ret_idx - 1
     else:
-        return OpCode("while_do", op_value[1:-1]), i + 1, func_ret_type
+        return Keyword("while_do", unwrap(op_value)), i + 1
@@ -1,4 +1,5 @@
-OP_TOKENS = [
+# Types of tokens which can be part of an expression
+OP_TOKENS = {
     "number",
     "input",
     "string",
@@ -46,7 +47,7 @@ OP_TOKENS = [
     "type_cast",
     "size",
     "type",
-]
+}
 
 WORD_TO_OP = {
     "plus": " + ",
@@ -87,3 +88,75 @@ WORD_TO_OP = {
     "right_shift": " >> ",
     "power": "",
 }
+
+# Precedence of binary operators in expressions, higher binds tighter (same order as in C)
+BINARY_OP_PRECEDENCE = {
+    "plus_equal": 1,
+    "minus_equal": 1,
+    "multiply_equal": 1,
+    "divide_equal": 1,
+    "modulus_equal": 1,
+    "power_equal": 1,
+    "bitwise_and_equal": 1,
+    "bitwise_xor_equal": 1,
+    "bitwise_or_equal": 1,
+    "or": 2,
+    "and": 3,
+    "bitwise_or": 4,
+    "bitwise_xor": 5,
+    "bitwise_and": 6,
+    "equal": 7,
+    "not_equal": 7,
+    "greater_than": 8,
+    "less_than": 8,
+    "greater_than_equal": 8,
+    "less_than_equal": 8,
+    "left_shift": 9,
+    "right_shift": 9,
+    "plus": 10,
+    "minus": 10,
+    "multiply": 11,
+    "divide": 11,
+    "modulus": 11,
+}
+
+# Precedence of operators which are not binary operators of C (like [ or address_of between operands)
+DEFAULT_OP_PRECEDENCE = 12
+
+# Precedence of prefix operators (like -, & or input)
+PREFIX_OP_PRECEDENCE = 13
+
+# Operators which group from right to left
+RIGHT_ASSOCIATIVE_OPS = [op for op, prec in BINARY_OP_PRECEDENCE.items() if prec == 1]
+
+# Operators which come after their operand
+POSTFIX_OPS = ["increment", "decrement", "right_bracket"]
+
+# Types of tokens which start a statement, a span is traced for each statement parsed
+STATEMENT_TOKENS = {
+    "RAW_C",
+    "print",
+    "import",
+    "var",
+    "id",
+    "fun",
+    "struct",
+    "MAIN",
+    "END_MAIN",
+    "for",
+    "do",
+    "while",
+    "if",
+    "else",
+    "exit",
+    "return",
+    "break",
+    "continue",
+    "single_line_comment",
+    "multi_line_comment",
+    "switch",
+    "case",
+    "default",
+    "increment",
+    "decrement",
+}
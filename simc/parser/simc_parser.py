@@ -1,11 +1,46 @@
+# Module for timestamps of traced statements
+import time
+
 # Module to import some helper functions
 from ..global_helpers import error, check_if
 
-# Module to import OpCode class
-from ..op_code import OpCode
+# Module for collecting errors while recovering from them
+from ..diagnostics import CompileError, current_collector
+
+# Module for tracing statements while they are parsed
+from ..tracing import current_tracer
+
+# Module for nodes of syntax tree
+from ..syntax_tree import (
+    Group,
+    Name,
+    Constant,
+    FormatString,
+    Operator,
+    Index,
+    Cast,
+    SizeOf,
+    Power,
+    Input,
+    unwrap,
+    Print,
+    Import,
+    Unary,
+    Keyword,
+    Marker,
+    Verbatim,
+    StructInstantiate,
+    StructScopeOver,
+)
 
 # Import various parsing functions
-from .function_parser import function_call_statement, function_definition_statement
+from .function_parser import (
+    function_call_statement,
+    function_definition_statement,
+    check_function_defined,
+    call_arguments,
+    complete_function_call,
+)
 from .array_parser import array_initializer
 from .loop_parser import for_statement, while_statement
 from .conditional_parser import if_statement, switch_statement, case_statement
@@ -13,7 +48,23 @@ from .variable_parser import var_statement, assign_statement
 from .struct_parser import struct_declaration_statement, initializate_struct
 
 # Import parser constants
-from .parser_constants import OP_TOKENS, WORD_TO_OP
+from .parser_constants import OP_TOKENS, WORD_TO_OP, STATEMENT_TOKENS
+
+# Module for building syntax trees of expressions
+from .expression_builder import ExpressionBuilder, ExpressionContext
+
+# Module for inferring types which are not known while parsing
+from ..type_inference import (
+    UNKNOWN_TYPES,
+    TYPE_TO_PREC,
+    CALL_TYPE_TO_PREC,
+    PREC_TO_TYPE_NAME,
+    PREC_TO_RETURN_TYPE,
+    PREC_TO_PRINT_FORMAT,
+    operand_prec,
+    convert_fstring,
+    infer_types,
+)
 
 
 def expression(
@@ -26,10 +77,14 @@ def expression(
     accept_empty_expression=False,
     expect_paren=True,
     break_at_last_closed_paren=False,
-    func_ret_type={},
+    term=None,
 ):
     """
     Parse and expression from tokens
+
+    The expression is parsed in a single loop over tokens, operators are placed in the syntax tree by precedence
+    climbing and function calls, type casts, size and type statements are parsed as nested contexts on a stack,
+    so long or deeply nested expressions take linear time and don't hit the recursion limit
     Params
     ======
     tokens                  (list)        = List of tokens
@@ -39,52 +94,48 @@ def expression(
     accept_unkown           (bool)        = Accept unknown type for variable or not
     accept_empty_expression (bool)        = Accept empty expression or not
     expect_paren            (bool)        = Expect parenthesis at the end
-    func_ret_type           (string)      = Functions return type
+    term                    (list)        = If given then steps of expression are appended to it, so that its
+                                            type can be inferred after parsing
     Returns
     =======
-    string, string, int: The expression, datatype of the expression and the current index in source
-                         code after parsing
+    Expr, string, int: The expression (syntax tree), datatype of the expression and the current index in source
+                       code after parsing
     """
-    # Initial values
-    op_value = ""
-    op_type = -1
 
-    # Mapping for precedence checking (double > float > int > bool)
-    type_to_prec = {"int": 3, "float": 4, "double": 5}
+    root = ExpressionContext(
+        "expression",
+        i,
+        assigned_id(tokens, i - 2),
+        term,
+        accept_unknown,
+        block_type_promotion,
+    )
 
-    # Mapping simc constant name to c constant name
-    math_constants = {"PI": "M_PI", "E": "M_E", "inf": "INFINITY", "NaN": "NAN"}
+    # Contexts of nested expressions which are not closed yet, tokens are added to the last one
+    contexts = [root]
+    context = root
 
-    # count parentheses
-    count_paren = 0
+    # Whether input is used outside of all parentheses
+    found_input = False
 
-    # To keep track of Type Promotion
-    previous_type = ""
+    # Loop until expression is not parsed completely
+    while i < len(tokens):
+        # Type of token is read once, it is looked up for every check below
+        token_type = tokens[i].type
+        if token_type not in OP_TOKENS:
+            break
 
-    id_idx = i - 2
+        next_type = tokens[i + 1].type if i + 1 < len(tokens) else None
+        builder = context.builders[-1]
 
-    # Loop until expression is not parsed completely
-    while i < len(tokens) and tokens[i].type in OP_TOKENS:
-        # Check for function call
-        if tokens[i].type == "id" and tokens[i + 1].type == "left_paren":
-            fun_opcode, i, func_ret_type = function_call_statement(
-                tokens, i, table, func_ret_type
-            )
-            val = fun_opcode.val.split("---")
-            params = val[1].split("&&&")
-            op_value += val[0] + "(" + ", ".join(params) + ")"
-            type_to_prec = {"char*": 1, "char": 2, "int": 3, "float": 4, "double": 5}
-            var_id = table.get_by_symbol(val[0])
-            op_type = type_to_prec[table.get_by_id(var_id)[1]]
-
-            # Resolve pendenting infer types
-            table.resolve_dependency(tokens, i, var_id)
-            i -= 1
+        # Check for function call, the arguments are parsed in a context of their own
+        if token_type == "id" and next_type == "left_paren":
+            check_function_defined(tokens, i, table)
+            context = ExpressionContext("call", i, assigned_id(tokens, i - 1))
+            contexts.append(context)
         # Array indexing
-        elif tokens[i].type == "id" and tokens[i + 1].type == "left_bracket":
+        elif token_type == "id" and next_type == "left_bracket":
             array_name, array_dtype, array_size, _, _ = table.get_by_id(tokens[i].val)
-            op_value += array_name
-            op_value += "["
             arr_id_idx = i
             i += 2
 
@@ -93,210 +144,170 @@ def expression(
             if tokens[i].type == "number" and type_ == "int":
                 index = table.get_by_id(tokens[i].val)[0]
 
-                if int(index) < int(array_size):
-                    op_value += index
-                else:
+                if int(index) >= int(array_size):
                     error(
                         f"Index {index} out of bounds for array {array_name}",
                         tokens[i].line_num,
+                        tokens[i].column,
                     )
             else:
                 arr_name, _, _, _, _ = table.get_by_id(tokens[arr_id_idx].val)
                 error(
                     f"Index of array {arr_name} should be an integer",
                     tokens[i].line_num,
+                    tokens[i].column,
                 )
 
-            op_type = type_to_prec[array_dtype]
-        # Explicit type casting
-        elif tokens[i].type == "type_cast" and tokens[i + 1].type == "left_paren":
-            # Store index i (index for type_cast token) to get the type of explicit typecast later
-            beg_idx = i
-
-            op_value, op_type, i, func_ret_type = expression(
-                tokens,
-                i + 1,
-                table,
-                "Expected expression inside explicit type casting",
-                expect_paren=True,
-                break_at_last_closed_paren=True,
-                func_ret_type=func_ret_type,
-            )
-
-            # To reassign type of expression
-            type_to_prec = {"int": 3, "float": 4, "double": 5}
-
-            explicit_dtype = tokens[beg_idx].val
-
-            # It won't ever fail to find the type in type_to_prec as we force it to these three values
-            # While creating type_cast token in lexical analyzer
-            op_type = type_to_prec[explicit_dtype]
-
-            # Convert (<expr>) to (<dtype>)(<expr>)
-            op_value = "(" + explicit_dtype + ")" + op_value
-
-        # sizeof operator - size in simC
-        elif tokens[i].type == "size" and tokens[i + 1].type == "left_paren":
-            op_value, op_type, i, func_ret_type = expression(
-                tokens,
-                i + 1,
-                table,
-                "Expected expression inside size statement",
-                expect_paren=True,
-                break_at_last_closed_paren=True,
-                func_ret_type=func_ret_type,
-            )
-
-            op_value = "sizeof" + op_value + ""
-
-            # sizeof returns int
-            op_type = 3
-
-        # type operator - To find the type, compiles to a string
-        elif tokens[i].type == "type" and tokens[i + 1].type == "left_paren":
-            op_value, op_type, i, func_ret_type = expression(
-                tokens,
-                i + 1,
-                table,
-                "Expected expression inside size statement",
-                expect_paren=True,
-                break_at_last_closed_paren=True,
-                func_ret_type=func_ret_type,
+            check_if(
+                got_type=tokens[i + 1].type,
+                should_be_types="right_bracket",
+                error_msg="Expected ] after index of array",
+                line_num=tokens[i + 1].line_num,
+                column=tokens[i + 1].column,
             )
+            i += 1
 
-            type_to_prec = {3: "int", 4: "float", 5: "double"}
-
-            # Convert the type of expression to string
-            op_value = op_value[: -len(op_value)]
-            op_value += '"' + type_to_prec[op_type] + '"'
-
-            # Change the type of expression (the expression containing type statement) to string
-            op_type = 0
-
+            builder.add_operand(Index(array_name, index))
+            context.op_type = CALL_TYPE_TO_PREC[array_dtype]
+            context.term.append(("set", context.op_type))
+        # Explicit type casting, sizeof operator (size in simC) and type operator, the expression in parentheses
+        # is parsed in a context of its own
+        elif (
+            token_type in ["type_cast", "size", "type"]
+            and next_type == "left_paren"
+        ):
+            context = ExpressionContext(token_type, i, assigned_id(tokens, i - 1))
+            contexts.append(context)
         # If token is identifier or constant
-        elif tokens[i].type in ["number", "string", "id", "bool"]:
-            # Fetch information from symbol table
-            value, type, typedata, _, _ = table.get_by_id(tokens[i].val)
+        elif token_type in ["number", "string", "id", "bool"]:
+            # Fetch information from symbol table, indexing the entry skips rendering its dependencies
+            entry = table.get_by_id(tokens[i].val)
+            value, type, typedata = entry[0], entry[1], entry[2]
             # Case to prevent Type Promotion:
-            if block_type_promotion == True:
-                if previous_type != type and previous_type != "":
+            if context.block_type_promotion == True:
+                if context.previous_type != type and context.previous_type != "":
                     error_message = "Cannot have more than one type in initializer list"
-                    error(error_message, tokens[i].line_num)
+                    error(error_message, tokens[i].line_num, tokens[i].column)
 
-            previous_type = type
+            context.previous_type = type
 
-            if type == "string" or type == "char*":
+            if type in ["string", "char*"] and "{" in value:
                 # If { in string then it is a f-string
-                if "{" in value:
-                    vars = []
-                    temp_var = ""
-                    enter = False
-
-                    # Collect the variable names
-                    for char in value:
-                        if char == "{":
-                            enter = True
-                        elif char == "}":
-                            vars.append(temp_var[1:])
-                            temp_var = ""
-                            enter = False
-
-                        if enter:
-                            temp_var += char
-
-                    # Determine the type of variables and append the name of variables at the end
-                    type_to_fs = {
-                        "char": "%c",
-                        "char*": "%s",
-                        "string": "%s",
-                        "int": "%d",
-                        "float": "%f",
-                        "double": "%lf",
-                        "bool": "%d",
-                    }
+                vars = []
+                temp_var = ""
+                enter = False
+
+                # Collect the variable names
+                for char in value:
+                    if char == "{":
+                        enter = True
+                    elif char == "}":
+                        vars.append(temp_var[1:])
+                        temp_var = ""
+                        enter = False
+
+                    if enter:
+                        temp_var += char
+
+                # Determine the type of variables and append the name of variables at the end
+                node = FormatString(value, vars, convert_fstring(value, vars, table))
+
+                # If type of a declared variable is not known yet, the string is converted after parsing
+                if node.converted is None:
                     for var in vars:
-                        _, type, _, _, _ = table.get_by_id(table.get_by_symbol(var))
-                        if type == "var":
-                            error("Unknown variable %s" % var, tokens[i].line_num)
-                        value = value.replace("{" + var + "}", type_to_fs[type])
-                        value += ", " + var
-
-                    # Replace all {} in string
-                    value = value.replace("{", "").replace("}", "")
-
-                op_value += value
-                op_type = 0 if typedata == "constant" else 1
-            elif type == "char":
-                op_value += value
-                op_type = 2
-            elif type == "bool":
-                op_value += value
-                op_type = 6
-            elif type == "int":
-                op_value += str(value)
-                op_type = (
-                    type_to_prec["int"] if type_to_prec["int"] > op_type else op_type
-                )
-            elif type == "float":
-                op_value += str(value)
-                op_type = (
-                    type_to_prec["float"]
-                    if type_to_prec["float"] > op_type
-                    else op_type
-                )
-            elif type == "double":
-                op_value += math_constants.get(str(value), str(value))
-                op_type = (
-                    type_to_prec["double"]
-                    if type_to_prec["double"] > op_type
-                    else op_type
-                )
-            elif type in ["var", "declared"] and not accept_unknown:
-                table.add_dependency(tokens[i].val, tokens[id_idx].val)
-                op_value += str(value)
-            elif type in ["var", "declared"] and accept_unknown:
-                op_value += str(value)
-        elif tokens[i].type in ["newline", "call_end"]:
+                        _, var_type, _, _, scope = table.get_by_id(table.get_by_symbol(var))
+                        if (
+                            not context.can_defer
+                            or var_type not in UNKNOWN_TYPES
+                            or not scope
+                        ):
+                            error(
+                                "Unknown variable %s" % var,
+                                tokens[i].line_num,
+                                tokens[i].column,
+                            )
+
+                    context.term.append(("fstring", node))
+
+                builder.add_operand(node)
+            elif type in ["string", "char*", "char", "bool", "int", "float", "double", "var", "declared"]:
+                # The type of operand is passed on to the identifier being assigned to after parsing
+                if (
+                    type in ["var", "declared"]
+                    and context.target_id is not None
+                    and not context.accept_unknown
+                ):
+                    table.add_dependency(tokens[i].val, context.target_id)
+
+                builder.add_operand(operand_node(tokens[i], value, type))
+
+            context.op_type = operand_prec(context.op_type, type, typedata)
+            context.term.append(("operand", tokens[i].val))
+        elif token_type in ["newline", "call_end"]:
             break
-        else:
-            if tokens[i].type == "power":
-                # Fetch information from symbol table for first operand
-                value_first, _, _, _, _ = table.get_by_id(tokens[i - 1].val)
+        elif token_type == "power":
+            # The operand before ^ is the base
+            base = builder.pop_operand() or Constant("")
 
-                # Fetch information from symbol table for second operand (exponent)
-                value_second, _, _, _, _ = table.get_by_id(tokens[i + 1].val)
+            # Fetch information from symbol table for second operand (exponent)
+            value_second, type_second, _, _, _ = table.get_by_id(tokens[i + 1].val)
 
-                # Remove the operand from before pow()
-                op_value = op_value[: -(len(value_first))]
-                op_value += f"pow({value_first}, {value_second})"
+            builder.add_operand(
+                Power(base, operand_node(tokens[i + 1], value_second, type_second))
+            )
 
-                i += 1
-            elif tokens[i].type == "left_paren":
-                count_paren += 1
-                op_value += WORD_TO_OP[tokens[i].type]
-            elif tokens[i].type == "right_paren":
-                count_paren -= 1
-
-                if count_paren < 0:
-                    error("Found unexpected ‘)’ in expression", tokens[i].line_num)
-                elif count_paren == 0 and break_at_last_closed_paren:
-                    op_value += ")"
+            i += 1
+        elif token_type == "left_paren":
+            context.count_paren += 1
+            context.builders.append(ExpressionBuilder(paren=True))
+        elif token_type == "right_paren":
+            context.count_paren -= 1
+
+            if context.count_paren < 0:
+                error(
+                    "Found unexpected ‘)’ in expression",
+                    tokens[i].line_num,
+                    tokens[i].column,
+                )
+
+            group = context.builders.pop().build()
+            context.builders[-1].add_operand(group)
+
+            if context.count_paren == 0:
+                if context is not root:
+                    # The nested expression is complete, it becomes an operand of the enclosing one
+                    contexts.pop()
+                    close_context(tokens, i, table, context, contexts[-1])
+                    context = contexts[-1]
+                elif break_at_last_closed_paren:
                     break
-                op_value += WORD_TO_OP[tokens[i].type]
-            else:
-                op_value += WORD_TO_OP[tokens[i].type]
+        elif token_type == "comma":
+            builder.add_comma(Operator(WORD_TO_OP["comma"]))
+        else:
+            if token_type == "input" and context is root and root.count_paren == 0:
+                found_input = True
+
+            builder.add_operator(Operator(WORD_TO_OP[token_type]), token_type)
 
         i += 1
 
-    if count_paren > 0:
-        error("Expected ‘)’ before end of expression", tokens[i].line_num)
+    if context is not root or root.count_paren > 0:
+        error(
+            "Expected ‘)’ before end of expression",
+            tokens[i].line_num,
+            tokens[i].column,
+        )
+
+    expr = root.builders[0].build()
+    op_type = root.op_type
 
     # If expression is empty then throw an error
-    if op_value == "" and not accept_empty_expression:
-        error(msg, tokens[i].line_num)
+    if not expr.parts and not accept_empty_expression:
+        error(msg, tokens[i].line_num, tokens[i].column)
 
     # Check if statement is of type input
-    if " scanf " in op_value:
+    if found_input:
+        op_value = expr.render()
 
         # Check if there exists a prompt message
         if '"' in op_value:
@@ -318,14 +329,123 @@ def expression(
             p_msg = ""
             dtype = "s"
         dtype_to_prec = {"i": 3, "f": 4, "d": 5, "s": 1, "c": 2}
-        op_value = str(p_msg) + "---" + str(dtype)
+        expr = Input(str(p_msg), str(dtype))
         op_type = dtype_to_prec[dtype]
+        root.term.append(("set", op_type))
 
     # Return the expression, type of expression, and current index in source codes
-    return op_value, op_type, i, func_ret_type
+    return expr, op_type, i
 
 
-def print_statement(tokens, i, table, func_ret_type, num_opcodes):
+def assigned_id(tokens, i):
+    """
+    Returns the identifier being assigned to by an expression
+
+    Params
+    ======
+    tokens (list) = List of tokens
+    i      (int)  = Index of token before the assignment operator
+
+    Returns
+    =======
+    int: Id of identifier in symbol table, None if the token is not an identifier
+    """
+
+    if i >= 0 and tokens[i].type == "id":
+        return tokens[i].val
+
+    return None
+
+
+def close_context(tokens, i, table, context, parent):
+    """
+    Add a complete call, type cast, size or type statement to the expression enclosing it
+
+    Params
+    ======
+    tokens  (list)              = List of tokens
+    i       (int)               = Index of ) closing the nested expression
+    table   (SymbolTable)       = Symbol table
+    context (ExpressionContext) = Context of nested expression
+    parent  (ExpressionContext) = Context of enclosing expression
+    """
+
+    operand = context.builders[0].build()
+    builder = parent.builders[-1]
+
+    if context.kind == "call":
+        call = complete_function_call(
+            tokens, context.start, i, call_arguments(operand), table
+        )
+        builder.add_operand(call)
+
+        var_id = table.get_by_symbol(call.name)
+        func_type = table.get_by_id(var_id)[1]
+
+        # If return type is not known yet then it is inferred after parsing
+        if func_type in UNKNOWN_TYPES:
+            if parent.target_id is not None and not parent.accept_unknown:
+                table.add_dependency(var_id, parent.target_id)
+        else:
+            parent.op_type = CALL_TYPE_TO_PREC[func_type]
+
+        parent.term.append(("call", var_id))
+        return
+
+    if context.kind == "type_cast":
+        # It won't ever fail to find the type in TYPE_TO_PREC as we force it to these three values
+        # While creating type_cast token in lexical analyzer
+        explicit_dtype = tokens[context.start].val
+        builder.add_operand(Cast(explicit_dtype, operand))
+        parent.op_type = TYPE_TO_PREC[explicit_dtype]
+    elif context.kind == "size":
+        builder.add_operand(SizeOf(operand))
+
+        # sizeof returns int
+        parent.op_type = 3
+    else:
+        if context.op_type not in PREC_TO_TYPE_NAME:
+            error(
+                "Cannot find type of expression", tokens[i].line_num, tokens[i].column
+            )
+
+        # Convert the type of expression to string
+        builder.add_operand(Constant('"' + PREC_TO_TYPE_NAME[context.op_type] + '"'))
+
+        # Change the type of expression (the expression containing type statement) to string
+        parent.op_type = 0
+
+    parent.term.append(("set", parent.op_type))
+
+
+def operand_node(token, value, type_):
+    """
+    Returns node of syntax tree for an identifier or constant
+
+    Params
+    ======
+    token (Token)  = Token of operand
+    value (string) = Value of operand in symbol table
+    type_ (string) = Datatype of operand
+
+    Returns
+    =======
+    Expr: Name of identifier or the constant
+    """
+
+    # Mapping simc constant name to c constant name
+    math_constants = {"PI": "M_PI", "E": "M_E", "inf": "INFINITY", "NaN": "NAN"}
+
+    if type_ == "double":
+        value = math_constants.get(str(value), str(value))
+
+    if token.type == "id":
+        return Name(str(value))
+
+    return Constant(str(value))
+
+
+def print_statement(tokens, i, table):
     """
     Parse print statement
     Params
@@ -333,10 +453,9 @@ def print_statement(tokens, i, table, func_ret_type, num_opcodes):
     tokens        (list)        = List of tokens
     i             (int)         = Current index in token
     table         (SymbolTable) = Symbol table constructed holding information about identifiers and constants
-    func_ret_type (string)      = Function return type
     Returns
     =======
-    OpCode, int: The opcode for the print code and the index after parsing print statement
+    Print, int: The statement for the print code and the index after parsing print statement
     Grammar
     =======
     print_statement -> print(expr)
@@ -355,35 +474,28 @@ def print_statement(tokens, i, table, func_ret_type, num_opcodes):
         should_be_types="left_paren",
         error_msg="Expected ( after print statement",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     beg_idx = i
 
     # Check if expression follows ( in print statement
-    op_value, op_type, i, func_ret_type = expression(
+    term = []
+    op_value, op_type, i = expression(
         tokens,
         i,
         table,
         "Expected expression inside print statement",
-        func_ret_type=func_ret_type,
+        term=term,
     )
 
-    end_idx = i
-
-    # Map datatype to appropriate format specifiers
-    prec_to_type = {
-        0: "",
-        1: '"%s", ',
-        2: '"%c", ',
-        3: '"%d", ',
-        4: '"%f", ',
-        5: '"%lf", ',
-        6: '"%d", ',
-    }
-    op_value = prec_to_type[op_type] + op_value[1:-1] if op_type != -1 else None
-
-    if op_value == None:
-        func_ret_type[f"print-{beg_idx}"] = [num_opcodes, beg_idx, end_idx]
+    # If type of expression is not known, the format specifier is added after types are inferred
+    if op_type != -1:
+        print_opcode = Print(PREC_TO_PRINT_FORMAT[op_type], unwrap(op_value))
+        table.type_graph.defer(print_opcode, term)
+    else:
+        print_opcode = Print(None, unwrap(op_value))
+        table.type_graph.defer(print_opcode, term, infer_format=True)
 
     # Check if print statement has closing )
     check_if(
@@ -391,13 +503,14 @@ def print_statement(tokens, i, table, func_ret_type, num_opcodes):
         should_be_types="right_paren",
         error_msg="Expected ) after expression in print statement",
         line_num=tokens[i - 1].line_num,
+        column=tokens[i - 1].column,
     )
 
     # Return the opcode and i+1 (the token after print statement)
-    return OpCode("print", op_value), i + 1, func_ret_type
+    return print_opcode, i + 1
 
 
-def unary_statement(tokens, i, table, func_ret_type):
+def unary_statement(tokens, i, table):
     """
     Parse unary statement
     Params
@@ -407,7 +520,7 @@ def unary_statement(tokens, i, table, func_ret_type):
     table       (SymbolTable) = Symbol table constructed holding information about identifiers and constants
     Returns
     =======
-    OpCode, int: The opcode for the unary code and the index after parsing unary statement
+    Unary, int: The statement for the unary code and the index after parsing unary statement
     Grammar
     =======
     unary_statement -> id operator
@@ -417,25 +530,23 @@ def unary_statement(tokens, i, table, func_ret_type):
 
     # Pre-increment/decrement
     if tokens[i].type in ["increment", "decrement"]:
-        op_value = -1
-
         if tokens[i].type == "increment":
-            op_value = "++ "
+            operator = "++ "
         else:
-            op_value = "-- "
+            operator = "-- "
 
         check_if(
             got_type=tokens[i + 1].type,
             should_be_types="id",
             error_msg="Expected identifier after unary operator",
             line_num=tokens[i + 1].line_num,
+            column=tokens[i + 1].column,
         )
 
         # Get the identifier name from symbol table
         value, _, _, _, _ = table.get_by_id(tokens[i + 1].val)
-        op_value += str(value)
 
-        return OpCode("unary", op_value), i + 2, func_ret_type
+        return Unary(Group([Operator(operator), Name(str(value))])), i + 2
 
     # Post-increment/decrement
     else:
@@ -444,24 +555,24 @@ def unary_statement(tokens, i, table, func_ret_type):
             should_be_types=["increment", "decrement"],
             error_msg="Expected unary operator after identifier",
             line_num=tokens[i + 1].line_num,
+            column=tokens[i + 1].column,
         )
 
         # Get expression of form <id>(++|--)
-        op_value, _, i, func_ret_type = expression(
+        op_value, _, i = expression(
             tokens,
             i,
             table,
             "",
             accept_empty_expression=True,
             expect_paren=False,
-            func_ret_type=func_ret_type,
         )
 
         # Return the opcode and i (the token after unary statement)
-        return OpCode("unary", op_value), i, func_ret_type
+        return Unary(op_value), i
 
 
-def exit_statement(tokens, i, table, func_ret_type):
+def exit_statement(tokens, i, table):
     """
     Parse exit statement
     Params
@@ -471,7 +582,7 @@ def exit_statement(tokens, i, table, func_ret_type):
     table       (SymbolTable) = Symbol table constructed holding information about identifiers and constants
     Returns
     =======
-    OpCode, int: The opcode for the assign code and the index after parsing exit statement
+    Keyword, int: The statement for the exit code and the index after parsing exit statement
     Grammar
     =======
     exit_statement -> exit(expr)
@@ -485,6 +596,7 @@ def exit_statement(tokens, i, table, func_ret_type):
         should_be_types="left_paren",
         error_msg="Expected ( after exit statement",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Check if number follows ( in exit statement
@@ -493,15 +605,15 @@ def exit_statement(tokens, i, table, func_ret_type):
         should_be_types="number",
         error_msg="Expected number after ( in exit statement",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # check if expression follows ( in exit statement
-    op_value, _, i, func_ret_type = expression(
+    op_value, _, i = expression(
         tokens,
         i,
         table,
         "Expected expression inside exit statement",
-        func_ret_type=func_ret_type,
     )
 
     # check if ) follows expression in exit statement
@@ -510,9 +622,10 @@ def exit_statement(tokens, i, table, func_ret_type):
         should_be_types="right_paren",
         error_msg="Expected ) after expression in exit statement",
         line_num=tokens[i - 1].line_num,
+        column=tokens[i - 1].column,
     )
 
-    return OpCode("exit", op_value[1:-1]), i, func_ret_type
+    return Keyword("exit", unwrap(op_value)), i
 
 
 def skip_all_nextlines(tokens, i):
@@ -523,20 +636,50 @@ def skip_all_nextlines(tokens, i):
     return i
 
 
+def recover(tokens, i):
+    """
+    Skip tokens of a statement which could not be parsed, parsing continues from the next newline, left brace
+    or right brace so that braces of the following code stay balanced
+
+    Params
+    ======
+    tokens (list) = List of tokens
+    i      (int)  = Index of token where the statement which could not be parsed begins
+
+    Returns
+    =======
+    int: Index of token from where parsing should continue
+    """
+
+    i += 1
+    while i < len(tokens) and tokens[i].type not in [
+        "newline",
+        "left_brace",
+        "right_brace",
+    ]:
+        i += 1
+
+    return i
+
+
 def parse(tokens, table):
     """
-    Parse tokens and generate opcodes
+    Parse tokens and generate opcodes, the opcodes are statements of syntax tree
     Params
     ======
     tokens (list) = List of tokens
     Returns
     =======
-    list: The list of opcodes
+    list: The list of opcodes (Statement objects)
     Grammar
     =======
     statement -> print_statement | var_statement | assign_statement | function_definition_statement
     """
 
+    # Errors are collected so that parsing can recover and continue
+    collector = current_collector()
+    num_diagnostics = len(collector.diagnostics)
+
     # List of opcodes
     op_codes = []
 
@@ -558,9 +701,6 @@ def parse(tokens, table):
     # Brace count
     brace_count = 0
 
-    # If function return type could not be figured out during return then do it while calling
-    func_ret_type = {}
-
     # Mapping scopes
     SCOPE_GLOBAL = 0
     SCOPE_MAIN = 1
@@ -572,642 +712,722 @@ def parse(tokens, table):
     # This is the state that indicate the actual scope
     scope_mapping = SCOPE_GLOBAL
 
+    # Statements are only traced if compilation is being traced
+    tracer = current_tracer()
+
     # Loop through all the tokens
     i = 0
     while i <= len(tokens) - 1:
+        if tracer is not None:
+            statement_start = time.perf_counter()
+            statement_token = tokens[i]
 
-        # If a function body has started
-        if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-            # If we encounter MAIN or a new function then the function body is empty
-            if (tokens[i].type == "MAIN") or (tokens[i].type == "fun"):
-                error("Function definition cannot be empty", tokens[i].line_num)
-        # Add end of scope
-        elif scope_mapping == SCOPE_SINGLE_FUNC_EN:
-            # If \n follows ) then skip all the \n characters
-            if tokens[i].type == "newline":
-                i = skip_all_nextlines(tokens, i)
-
-            op_codes.append(OpCode("scope_over", "", ""))
-
-            # The next line is the global scope
-            scope_mapping = SCOPE_GLOBAL
-
-        # If token is raw c type
-        if tokens[i].type == "RAW_C":
-            op_codes.append(OpCode("raw", tokens[i].val))
-            i += 1
-            continue
+        try:
 
-        # If token is of type print then generate print opcode
-        elif tokens[i].type == "print":
+            # If a function body has started
+            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                # If we encounter MAIN or a new function then the function body is empty
+                if (tokens[i].type == "MAIN") or (tokens[i].type == "fun"):
+                    error(
+                        "Function definition cannot be empty",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+            # Add end of scope
+            elif scope_mapping == SCOPE_SINGLE_FUNC_EN:
+                # If \n follows ) then skip all the \n characters
+                if tokens[i].type == "newline":
+                    i = skip_all_nextlines(tokens, i)
 
-            # Functions cannot be called inside struct scope
-            if scope_mapping == SCOPE_STRUCT:
-                error("Print cannot be called from struct scope", tokens[i].line_num)
+                op_codes.append(Marker("scope_over"))
 
-            print_opcode, i, func_ret_type = print_statement(
-                tokens, i + 1, table, func_ret_type, len(op_codes)
-            )
+                # The next line is the global scope
+                scope_mapping = SCOPE_GLOBAL
 
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+            # If token is raw c type
+            if tokens[i].type == "RAW_C":
+                op_codes.append(Verbatim("raw", tokens[i].val, None))
+                i += 1
+                continue
 
-            op_codes.append(print_opcode)
+            # If token is of type print then generate print opcode
+            elif tokens[i].type == "print":
 
-        # If token is of type import then generate import opcode
-        elif tokens[i].type == "import":
+                # Functions cannot be called inside struct scope
+                if scope_mapping == SCOPE_STRUCT:
+                    error(
+                        "Print cannot be called from struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # Import cannot be called inside struct scope
-            if scope_mapping == SCOPE_STRUCT:
-                error("Import cannot be called from struct scope", tokens[i].line_num)
+                print_opcode, i = print_statement(
+                    tokens, i + 1, table
+                )
 
-            # Skip import token, next token should be module name
-            i += 1
+                # End of one line function scope
+                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                    scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-            # Identifier (module name) should follow import
-            check_if(
-                got_type=tokens[i].type,
-                should_be_types="id",
-                error_msg="Expected module name after import",
-                line_num=tokens[i].line_num,
-            )
+                op_codes.append(print_opcode)
 
-            # Get the name of the module
-            value, _, _, _, _ = table.get_by_id(tokens[i].val)
+            # If token is of type import then generate import opcode
+            elif tokens[i].type == "import":
 
-            # Generate opcode for the module
-            op_codes.append(OpCode("import", value))
+                # Import cannot be called inside struct scope
+                if scope_mapping == SCOPE_STRUCT:
+                    error(
+                        "Import cannot be called from struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # Skip the module name to get to the next token
-            i += 1
+                # Skip import token, next token should be module name
+                i += 1
 
-        # If token is of type var then generate var opcode
-        elif tokens[i].type == "var":
+                # Identifier (module name) should follow import
+                check_if(
+                    got_type=tokens[i].type,
+                    should_be_types="id",
+                    error_msg="Expected module name after import",
+                    line_num=tokens[i].line_num,
+                    column=tokens[i].column,
+                )
 
-            # Store variable index
-            idx = i + 1
+                # Get the name of the module
+                value, _, _, _, _ = table.get_by_id(tokens[i].val)
 
-            var_opcode, i, func_ret_type = var_statement(
-                tokens, i + 1, table, func_ret_type
-            )
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+                # Generate opcode for the module
+                op_codes.append(Import(value))
 
-            op_codes.append(var_opcode)
+                # Skip the module name to get to the next token
+                i += 1
 
-            # Struct name is added to the insiders variables as  "<struct_name>---<variable_name>"
-            if scope_mapping == SCOPE_STRUCT:
-                table.symbol_table[table.get_by_symbol(struct_name)][3] += "-" + str(
-                    tokens[idx].val
-                )
+            # If token is of type var then generate var opcode
+            elif tokens[i].type == "var":
 
-        # If token is of type id
-        elif tokens[i].type == "id":
-            # If '(' follows id then it is function calling
-            if tokens[i + 1].type == "left_paren":
-                fun_opcode, i, func_ret_type = function_call_statement(
-                    tokens, i, table, func_ret_type
-                )
-                op_codes.append(fun_opcode)
+                # Store variable index
+                idx = i + 1
 
-            # This handles post-increment/decrement
-            elif tokens[i + 1].type in ["increment", "decrement"]:
-                unary_opcode, i, func_ret_type = unary_statement(
-                    tokens, i, table, func_ret_type
+                var_opcode, i = var_statement(
+                    tokens, i + 1, table
                 )
-                op_codes.append(unary_opcode)
+                # End of one line function scope
+                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                    scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-            # Handle variables inside for loop
-            elif tokens[i + 1].type in ["to", "by"] or tokens[i - 2].type == "by":
-                i += 1
+                op_codes.append(var_opcode)
 
-            # Handle local struct instantiation
-            elif tokens[i + 1].type == "id":
+                # Variable is added to the members of struct
+                if scope_mapping == SCOPE_STRUCT:
+                    table.symbol_table[table.get_by_symbol(struct_name)].members.append(
+                        tokens[idx].val
+                    )
 
-                # Struct cannot be called inside this scope
-                if scope_mapping is SCOPE_STRUCT:
-                    error(
-                        "Struct cannot be called inside a struct scope",
-                        tokens[i].line_num,
+            # If token is of type id
+            elif tokens[i].type == "id":
+                # If '(' follows id then it is function calling
+                if tokens[i + 1].type == "left_paren":
+                    fun_opcode, i = function_call_statement(
+                        tokens, i, table
                     )
+                    op_codes.append(fun_opcode)
+
+                # This handles post-increment/decrement
+                elif tokens[i + 1].type in ["increment", "decrement"]:
+                    unary_opcode, i = unary_statement(tokens, i, table)
+                    op_codes.append(unary_opcode)
+
+                # Handle variables inside for loop
+                elif tokens[i + 1].type in ["to", "by"] or tokens[i - 2].type == "by":
+                    i += 1
+
+                # Handle local struct instantiation
+                elif tokens[i + 1].type == "id":
+
+                    # Struct cannot be called inside this scope
+                    if scope_mapping is SCOPE_STRUCT:
+                        error(
+                            "Struct cannot be called inside a struct scope",
+                            tokens[i].line_num,
+                            tokens[i].column,
+                        )
 
-                # Get the details of id at index i - expected to be name of struct
-                struct_name, type_, _, list_var, _ = table.get_by_id(tokens[i].val)
+                    # Get the details of id at index i - expected to be name of struct
+                    struct_entry = table.get_by_id(tokens[i].val)
+                    struct_name, type_, _, _, _ = struct_entry
 
-                # Check if the structure is declared or not
-                if type_ != "struct_var":
-                    error(f"Structure {struct_name} not declared", tokens[i].line_num)
+                    # Check if the structure is declared or not
+                    if type_ != "struct_var":
+                        error(
+                            f"Structure {struct_name} not declared",
+                            tokens[i].line_num,
+                            tokens[i].column,
+                        )
+
+                    # If there is no error then get the name of the instance variable
+                    instance_var_name, _, _, _, _ = table.get_by_id(tokens[i + 1].val)
 
-                # If there is no error then get the name of the instance variable
-                instance_var_name, _, _, _, _ = table.get_by_id(tokens[i + 1].val)
+                    # Init instance vars
+                    initializate_struct(
+                        tokens, i, table, instance_var_name, struct_entry.members
+                    )
 
-                # Init instance vars
-                initializate_struct(tokens, i, table, instance_var_name, list_var)
+                    # OpCode value will be <struct-name>---<instance-variable-name>
+                    op_codes.append(StructInstantiate(struct_name, instance_var_name))
 
-                # OpCode value will be <struct-name>---<instance-variable-name>
-                op_codes.append(
-                    OpCode(
-                        "struct_instantiate", struct_name + "---" + instance_var_name
+                    i += 2
+                else:
+                    assign_opcode, i = assign_statement(
+                        tokens, i + 1, table
                     )
-                )
+                    op_codes.append(assign_opcode)
 
-                i += 2
-            else:
-                assign_opcode, i, func_ret_type = assign_statement(
-                    tokens, i + 1, table, func_ret_type
-                )
-                op_codes.append(assign_opcode)
+                    # End of one line function scope
+                    if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                        scope_mapping = SCOPE_SINGLE_FUNC_EN
 
                 # End of one line function scope
                 if scope_mapping == SCOPE_SINGLE_FUNC_ST:
                     scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+            # If token is of type fun then generate function opcode
+            elif tokens[i].type == "fun":
+                # Check if function is defined inside MAIN or any other function
+                if scope_mapping == SCOPE_STRUCT:
+                    error(
+                        "Function cannot be declared inside struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping in [SCOPE_FUNC, SCOPE_SINGLE_FUNC_ST, SCOPE_MAIN]:
+                    error(
+                        "Cannot define a function inside another function",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-        # If token is of type fun then generate function opcode
-        elif tokens[i].type == "fun":
-            # Check if function is defined inside MAIN or any other function
-            if scope_mapping == SCOPE_STRUCT:
-                error(
-                    "Function cannot be declared inside struct scope",
-                    tokens[i].line_num,
-                )
-            elif scope_mapping in [SCOPE_FUNC, SCOPE_SINGLE_FUNC_ST, SCOPE_MAIN]:
-                error(
-                    "Cannot define a function inside another function",
-                    tokens[i].line_num,
+                # Parse function defintion
+                fun_opcode, i, func_name = function_definition_statement(
+                    tokens, i + 1, table
                 )
 
-            # Parse function defintion
-            fun_opcode, i, func_name, func_ret_type = function_definition_statement(
-                tokens, i + 1, table, func_ret_type
-            )
+                # Fun opcode should consist of func_decl and scope_begin opcodes, otherwise the function has no body
+                if len(fun_opcode) == 2:
+                    scope_mapping = SCOPE_SINGLE_FUNC_ST
+                    brace_count += 1
+                else:
+                    scope_mapping = SCOPE_FUNC
+                op_codes.extend(fun_opcode)
 
-            # Fun opcode should consist of func_decl and scope_begin opcodes, otherwise the function has no body
-            if len(fun_opcode) == 2:
-                scope_mapping = SCOPE_SINGLE_FUNC_ST
-                brace_count += 1
-            else:
-                scope_mapping = SCOPE_FUNC
-            op_codes.extend(fun_opcode)
+            # If token is of type struct then generate structure opcode
+            elif tokens[i].type == "struct":
+                # Check if struct is defined inside MAIN or any other struct
+                if scope_mapping == SCOPE_STRUCT:
+                    error(
+                        "Struct cannot be declared inside struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping in [SCOPE_FUNC, SCOPE_SINGLE_FUNC_ST, SCOPE_MAIN]:
+                    error(
+                        "Struct cannot be defined inside a function scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-        # If token is of type struct then generate structure opcode
-        elif tokens[i].type == "struct":
-            # Check if struct is defined inside MAIN or any other struct
-            if scope_mapping == SCOPE_STRUCT:
-                error(
-                    "Struct cannot be declared inside struct scope", tokens[i].line_num
-                )
-            elif scope_mapping in [SCOPE_FUNC, SCOPE_SINGLE_FUNC_ST, SCOPE_MAIN]:
-                error(
-                    "Struct cannot be defined inside a function scope",
-                    tokens[i].line_num,
+                struct_opcode, i, struct_name = struct_declaration_statement(
+                    tokens, i + 1, table
                 )
 
-            struct_opcode, i, struct_name = struct_declaration_statement(
-                tokens, i + 1, table
-            )
-
-            op_codes.append(struct_opcode)
+                op_codes.append(struct_opcode)
 
-            scope_mapping = SCOPE_STRUCT
+                scope_mapping = SCOPE_STRUCT
 
-        # If token is of type left_brace then generate scope_begin opcode
-        elif tokens[i].type == "left_brace":
-            op_codes.append(OpCode("scope_begin", "", ""))
-            brace_count += 1
-            i += 1
-
-        # If token is of type right_brace then generate scope_over opcode,
-        # If a struct was declared right off end of scope, intantiate it and then generate struct_scope_over opcode
-        elif tokens[i].type == "right_brace":
-            brace_count -= 1
-
-            if scope_mapping == SCOPE_STRUCT:
-                # Instance_name stores the name of structure instance (seperated by commas if multiple instances), is defined
-                instance_names = ""
-
-                # loop through the subsequent tokens to find all instantiated objects (after structure body)
-                for next_id in range(i + 1, len(tokens)):
-                    if tokens[next_id].type == "id":
-                        instance_name = table.get_by_id(tokens[next_id].val)[0]
-                        instance_names += instance_name + ", "
+            # If token is of type left_brace then generate scope_begin opcode
+            elif tokens[i].type == "left_brace":
+                op_codes.append(Marker("scope_begin"))
+                brace_count += 1
+                i += 1
 
-                        # Get the details of id at index i - expected to be name of struct
-                        _, type_, _, var_list, _ = table.get_by_id(
-                            table.get_by_symbol(struct_name)
-                        )
+            # If token is of type right_brace then generate scope_over opcode,
+            # If a struct was declared right off end of scope, intantiate it and then generate struct_scope_over opcode
+            elif tokens[i].type == "right_brace":
+                brace_count -= 1
+
+                if scope_mapping == SCOPE_STRUCT:
+                    # Instance_names stores the names of structure instances, if defined
+                    instance_names = []
+
+                    # loop through the subsequent tokens to find all instantiated objects (after structure body)
+                    for next_id in range(i + 1, len(tokens)):
+                        if tokens[next_id].type == "id":
+                            instance_name = table.get_by_id(tokens[next_id].val)[0]
+                            instance_names.append(instance_name)
+
+                            # Get the details of id at index i - expected to be name of struct
+                            var_list = table.get_by_id(
+                                table.get_by_symbol(struct_name)
+                            ).members
+
+                            # Init instance vars
+                            initializate_struct(tokens, i, table, instance_name, var_list)
+
+                            # Skip over the id type token
+                            i += 1
+                        elif tokens[next_id].type == "comma":
+                            i += 1
+                            continue
+                        else:
+                            break
+
+                    op_codes.append(StructScopeOver(instance_names))
+                    scope_mapping = SCOPE_GLOBAL
+                elif scope_mapping == SCOPE_FUNC:
+                    scope_mapping = SCOPE_GLOBAL
+                    op_codes.append(Marker("scope_over"))
+                else:
+                    op_codes.append(Marker("scope_over"))
 
-                        # Init instance vars
-                        initializate_struct(tokens, i, table, instance_name, var_list)
+                if brace_count < 0:
+                    error(
+                        "Closing brace doesn't match any previous opening brace",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                i += 1
 
-                        # Skip over the id type token
-                        i += 1
-                    elif tokens[next_id].type == "comma":
-                        i += 1
-                        continue
-                    else:
-                        break
+                if brace_count == 0:
+                    # The scope is over
+                    func_name = ""
+                    struct_name = ""
 
-                op_codes.append(OpCode("struct_scope_over", instance_names[:-2], ""))
-                scope_mapping = SCOPE_GLOBAL
-            elif scope_mapping == SCOPE_FUNC:
-                scope_mapping = SCOPE_GLOBAL
-                op_codes.append(OpCode("scope_over", "", ""))
-            else:
-                op_codes.append(OpCode("scope_over", "", ""))
+            # If token is of type MAIN then generate MAIN opcode
+            elif tokens[i].type == "MAIN":
+                op_codes.append(Marker("MAIN"))
+                main_fn_count += 1
+                if main_fn_count > 1:
+                    error(
+                        "Cannot have more than one MAIN in a single file",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                i += 1
 
-            if brace_count < 0:
-                error(
-                    "Closing brace doesn't match any previous opening brace",
-                    tokens[i].line_num,
-                )
-            i += 1
+                scope_mapping = SCOPE_MAIN
 
-            if brace_count == 0:
-                # The scope is over
-                func_name = ""
-                struct_name = ""
+            # If token is of type END_MAIN then generate MAIN opcode
+            elif tokens[i].type == "END_MAIN":
+                op_codes.append(Marker("END_MAIN"))
+                main_fn_count -= 1
+                if scope_mapping == SCOPE_MAIN:
+                    scope_mapping = SCOPE_GLOBAL
+                else:
+                    error("No matching MAIN for END_MAIN", tokens[i - 1].line_num + 1)
+                i += 1
 
-        # If token is of type MAIN then generate MAIN opcode
-        elif tokens[i].type == "MAIN":
-            op_codes.append(OpCode("MAIN", "", ""))
-            main_fn_count += 1
-            if main_fn_count > 1:
-                error(
-                    "Cannot have more than one MAIN in a single file",
-                    tokens[i].line_num,
+            # If token is of type for then generate for code
+            elif tokens[i].type == "for":
+                for_opcode, i = for_statement(
+                    tokens, i + 1, table
                 )
-            i += 1
-
-            scope_mapping = SCOPE_MAIN
-
-        # If token is of type END_MAIN then generate MAIN opcode
-        elif tokens[i].type == "END_MAIN":
-            op_codes.append(OpCode("END_MAIN", "", ""))
-            main_fn_count -= 1
-            if scope_mapping == SCOPE_MAIN:
-                scope_mapping = SCOPE_GLOBAL
-            else:
-                error("No matching MAIN for END_MAIN", tokens[i - 1].line_num + 1)
-            i += 1
+                op_codes.append(for_opcode)
 
-        # If token is of type for then generate for code
-        elif tokens[i].type == "for":
-            for_opcode, i, func_ret_type = for_statement(
-                tokens, i + 1, table, func_ret_type
-            )
-            op_codes.append(for_opcode)
+            # If token is of type do then generate do_while code
+            elif tokens[i].type == "do":
 
-        # If token is of type do then generate do_while code
-        elif tokens[i].type == "do":
+                # Do cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "Do cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "Do cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # Do cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error("Do cannot be called inside a struct scope", tokens[i].line_num)
-            elif scope_mapping is SCOPE_GLOBAL:
-                error("Do cannot be called inside the global scope", tokens[i].line_num)
+                # If \n follows ) then skip all the \n characters
+                if tokens[i + 1].type == "newline":
+                    i = skip_all_nextlines(tokens, i)
+                    i -= 1
 
-            # If \n follows ) then skip all the \n characters
-            if tokens[i + 1].type == "newline":
-                i = skip_all_nextlines(tokens, i)
-                i -= 1
+                in_do = True
 
-            in_do = True
+                op_codes.append(Marker("do"))
 
-            op_codes.append(OpCode("do", "", ""))
+                if tokens[i + 1].type != "left_brace":
+                    op_codes.append(Marker("scope_begin"))
+                    brace_count += 1
 
-            if tokens[i + 1].type != "left_brace":
-                op_codes.append(OpCode("scope_begin", "", ""))
-                brace_count += 1
+                i += 1
 
-            i += 1
+            # If token is of type while then generate while opcode
+            elif tokens[i].type == "while":
 
-        # If token is of type while then generate while opcode
-        elif tokens[i].type == "while":
+                # While cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "While cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "While cannot be called inside the global scope ",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # While cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error(
-                    "While cannot be called inside a struct scope", tokens[i].line_num
-                )
-            elif scope_mapping is SCOPE_GLOBAL:
-                error(
-                    "While cannot be called inside the global scope ",
-                    tokens[i].line_num,
+                # Parse while statement
+                while_opcode, i = while_statement(
+                    tokens, i + 1, table, in_do
                 )
 
-            # Parse while statement
-            while_opcode, i, func_ret_type = while_statement(
-                tokens, i + 1, table, in_do, func_ret_type
-            )
+                # If the while is part of do-while
+                if in_do:
+                    if brace_count > 0:
+                        op_codes.append(Marker("scope_over"))
+                        brace_count -= 1
 
-            # If the while is part of do-while
-            if in_do:
-                if brace_count > 0:
-                    op_codes.append(OpCode("scope_over", "", ""))
-                    brace_count -= 1
+                    # End of one line function scope
+                    if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                        scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-                # End of one line function scope
-                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                    scope_mapping = SCOPE_SINGLE_FUNC_EN
+                    in_do = False
+                op_codes.append(while_opcode)
 
-                in_do = False
-            op_codes.append(while_opcode)
+            # If token is of type if then generate if opcode
+            elif tokens[i].type == "if":
 
-        # If token is of type if then generate if opcode
-        elif tokens[i].type == "if":
+                # If cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "If cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "If cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # If cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error("If cannot be called inside a struct scope", tokens[i].line_num)
-            elif scope_mapping is SCOPE_GLOBAL:
-                error("If cannot be called inside the global scope", tokens[i].line_num)
+                if_opcode, i = if_statement(
+                    tokens, i + 1, table
+                )
 
-            if_opcode, i, func_ret_type = if_statement(
-                tokens, i + 1, table, func_ret_type
-            )
+                op_codes.append(if_opcode)
 
-            op_codes.append(if_opcode)
+                # Increment if count on encountering if
+                if_count += 1
 
-            # Increment if count on encountering if
-            if_count += 1
+            # If token is of type exit then generate exit opcode
+            elif tokens[i].type == "exit":
 
-        # If token is of type exit then generate exit opcode
-        elif tokens[i].type == "exit":
+                # Exit cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "Exit cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "Exit cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # Exit cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error("Exit cannot be called inside a struct scope", tokens[i].line_num)
-            elif scope_mapping is SCOPE_GLOBAL:
-                error(
-                    "Exit cannot be called inside the global scope", tokens[i].line_num
+                exit_opcode, i = exit_statement(
+                    tokens, i + 1, table
                 )
 
-            exit_opcode, i, func_ret_type = exit_statement(
-                tokens, i + 1, table, func_ret_type
-            )
+                # End of one line function scope
+                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                    scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+                op_codes.append(exit_opcode)
 
-            op_codes.append(exit_opcode)
+            # If token is of type else then check whether it is else if or else
+            elif tokens[i].type == "else":
 
-        # If token is of type else then check whether it is else if or else
-        elif tokens[i].type == "else":
+                # Else cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "Else cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "Else cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # Else cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error("Else cannot be called inside a struct scope", tokens[i].line_num)
-            elif scope_mapping is SCOPE_GLOBAL:
-                error(
-                    "Else cannot be called inside the global scope", tokens[i].line_num
-                )
+                # If \n follows else then skip all the \n characters
+                if tokens[i + 1].type == "newline":
+                    i = skip_all_nextlines(tokens, i + 1)
+                    i -= 1
 
-            # If \n follows else then skip all the \n characters
-            if tokens[i + 1].type == "newline":
-                i = skip_all_nextlines(tokens, i + 1)
-                i -= 1
+                # If the next token is if, then it is else if
+                if tokens[i + 1].type == "if":
+                    if_opcode, i = if_statement(
+                        tokens, i + 2, table
+                    )
 
-            # If the next token is if, then it is else if
-            if tokens[i + 1].type == "if":
-                if_opcode, i, func_ret_type = if_statement(
-                    tokens, i + 2, table, func_ret_type
-                )
+                    if_opcode.type = "else_if"
+                    op_codes.append(if_opcode)
 
-                if_opcode.type = "else_if"
-                op_codes.append(if_opcode)
+                # Otherwise it is else
+                else:
+                    op_codes.append(Marker("else"))
 
-            # Otherwise it is else
-            else:
-                op_codes.append(OpCode("else", "", ""))
+                    # Decrement if count on encountering if, to make sure there aren't extra else conditions
+                    if_count -= 1
 
-                # Decrement if count on encountering if, to make sure there aren't extra else conditions
-                if_count -= 1
+                    # If if_count is negative then the current else is extra
+                    if if_count < 0:
+                        error(
+                            "Else does not match any if!",
+                            tokens[i].line_num,
+                            tokens[i].column,
+                        )
 
-                # If if_count is negative then the current else is extra
-                if if_count < 0:
-                    error("Else does not match any if!", tokens[i].line_num)
+                    i += 1
 
-                i += 1
+            # If token is of type return then generate return opcode
+            elif tokens[i].type == "return":
 
-        # If token is of type return then generate return opcode
-        elif tokens[i].type == "return":
+                # Return cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "Return cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "Return cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # Return cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error(
-                    "Return cannot be called inside a struct scope", tokens[i].line_num
-                )
-            elif scope_mapping is SCOPE_GLOBAL:
-                error(
-                    "Return cannot be called inside the global scope",
-                    tokens[i].line_num,
-                )
+                # Steps of return expression, used to infer return type after parsing
+                term = []
 
-            # Starting token index for return expression
-            beg_idx = i + 1
+                if tokens[i + 1].type not in ["id", "number", "string", "left_paren"]:
+                    op_value = Group()
+                    op_type = 6
+                    i += 1
+                else:
+                    op_value, op_type, i = expression(
+                        tokens,
+                        i + 1,
+                        table,
+                        "Expected expression after return",
+                        accept_unknown=True,
+                        accept_empty_expression=True,
+                        expect_paren=False,
+                        term=term,
+                    )
 
-            if tokens[i + 1].type not in ["id", "number", "string", "left_paren"]:
-                op_value = ""
-                op_type = 6
-                i += 1
-            else:
-                op_value, op_type, i, func_ret_type = expression(
-                    tokens,
-                    i + 1,
-                    table,
-                    "Expected expression after return",
-                    accept_unknown=True,
-                    accept_empty_expression=True,
-                    expect_paren=False,
-                    func_ret_type=func_ret_type,
-                )
+                if func_name == "" and main_fn_count == 0:
+                    error(
+                        "Return statement outside any function",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                else:
+                    # If we are in main function,
+                    # the default return is going to be generated anyways, so skip this
+                    if main_fn_count == 0:
+                        func_entry = table.symbol_table[table.get_by_symbol(func_name)]
+
+                        # Change return type of function
+                        # If type is known
+                        if op_type != -1:
+                            func_entry.type = PREC_TO_RETURN_TYPE[op_type]
+                        # Otherwise the return type is inferred from the return expression after parsing
+                        elif func_entry.type in UNKNOWN_TYPES:
+                            func_entry.type = "not_known"
+                            table.type_graph.add_return(table.get_by_symbol(func_name), term)
 
-            if func_name == "" and main_fn_count == 0:
-                error("Return statement outside any function", tokens[i].line_num)
-            else:
-                #  Map datatype to appropriate datatype in C
-                prec_to_type = {
-                    -1: "not_known",
-                    0: "char*",
-                    1: "char*",
-                    2: "char",
-                    3: "int",
-                    4: "float",
-                    5: "double",
-                    6: "bool",
-                    7: "void",
-                }
-
-                # If we are in main function,
-                # the default return is going to be generated anyways, so skip this
-                if main_fn_count == 0:
-                    # We are not in main function, if type is not known then add this function to func_ret_type dict
-                    # This is used when return type cannot be inferred right now
-                    if op_type == -1:
-                        func_ret_type[func_name] = beg_idx
-
-                    # Change return type of function
-                    # If type is known
-                    if op_type != -1:
-                        table.symbol_table[table.get_by_symbol(func_name)][
-                            1
-                        ] = prec_to_type[op_type]
-                    # Otherwise update type of func to ["not_known", <idx-of-return-expr>, <all-tokens>]
-                    # This is used for import statements
-                    else:
-                        table.symbol_table[table.get_by_symbol(func_name)][1] = [
-                            "not_known",
-                            beg_idx,
-                            tokens,
-                        ]
-
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+                # End of one line function scope
+                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                    scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-            op_codes.append(OpCode("return", op_value, ""))
+                op_codes.append(Keyword("return", op_value, ""))
 
-        # If token is of type break then generate break opcode
-        elif tokens[i].type == "break":
+            # If token is of type break then generate break opcode
+            elif tokens[i].type == "break":
 
-            # Break cannot be called inside this scope
-            if scope_mapping == SCOPE_STRUCT:
-                error("Break cannot be called inside struct scope", tokens[i].line_num)
-            elif scope_mapping == SCOPE_GLOBAL:
-                error("Break cannot be called inside global scope", tokens[i].line_num)
+                # Break cannot be called inside this scope
+                if scope_mapping == SCOPE_STRUCT:
+                    error(
+                        "Break cannot be called inside struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping == SCOPE_GLOBAL:
+                    error(
+                        "Break cannot be called inside global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            op_codes.append(OpCode("break", "", ""))
+                op_codes.append(Marker("break"))
 
-            i += 1
+                i += 1
 
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+                # End of one line function scope
+                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                    scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-        # If token is of type continue then generate continue opcode
-        elif tokens[i].type == "continue":
+            # If token is of type continue then generate continue opcode
+            elif tokens[i].type == "continue":
 
-            # Continue cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error(
-                    "Continue cannot be called inside a struct scope",
-                    tokens[i].line_num,
-                )
-            elif scope_mapping is SCOPE_GLOBAL:
-                error(
-                    "Continue cannot be called inside the global scope",
-                    tokens[i].line_num,
-                )
+                # Continue cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "Continue cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "Continue cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            op_codes.append(OpCode("continue", "", ""))
+                op_codes.append(Marker("continue"))
 
-            i += 1
+                i += 1
 
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+                # End of one line function scope
+                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                    scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-        # If token is of type single_line_statement then generate single_line_comment opcode
-        elif tokens[i].type == "single_line_comment":
-            op_codes.append(OpCode("single_line_comment", tokens[i].val, ""))
+            # If token is of type single_line_statement then generate single_line_comment opcode
+            elif tokens[i].type == "single_line_comment":
+                op_codes.append(Verbatim("single_line_comment", tokens[i].val))
 
-            i += 1
+                i += 1
 
-        # If token is of type multi_line_statement then generate multi_line_comment opcode
-        elif tokens[i].type == "multi_line_comment":
-            op_codes.append(OpCode("multi_line_comment", tokens[i].val, ""))
+            # If token is of type multi_line_statement then generate multi_line_comment opcode
+            elif tokens[i].type == "multi_line_comment":
+                op_codes.append(Verbatim("multi_line_comment", tokens[i].val))
 
-            i += 1
+                i += 1
 
-        # If token is of type switch then generate switch opcode
-        elif tokens[i].type == "switch":
+            # If token is of type switch then generate switch opcode
+            elif tokens[i].type == "switch":
 
-            # Switch cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error(
-                    "Switch cannot be called inside a local scope", tokens[i].line_num
-                )
-            elif scope_mapping is SCOPE_GLOBAL:
-                error(
-                    "Switch cannot be called inside the global scope",
-                    tokens[i].line_num,
+                # Switch cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "Switch cannot be called inside a local scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "Switch cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+
+                switch_opcode, i = switch_statement(
+                    tokens, i + 1, table
                 )
 
-            switch_opcode, i, func_ret_type = switch_statement(
-                tokens, i + 1, table, func_ret_type
-            )
+                op_codes.append(switch_opcode)
 
-            op_codes.append(switch_opcode)
+            # If token is of type case then generate case opcode
+            elif tokens[i].type == "case":
+                case_opcode, i = case_statement(
+                    tokens, i + 1, table
+                )
 
-        # If token is of type case then generate case opcode
-        elif tokens[i].type == "case":
-            case_opcode, i, func_ret_type = case_statement(
-                tokens, i + 1, table, func_ret_type
-            )
+                op_codes.append(case_opcode)
 
-            op_codes.append(case_opcode)
+            # If token is of type default then generate default opcode (this is used in switch cases)
+            elif tokens[i].type == "default":
 
-        # If token is of type default then generate default opcode (this is used in switch cases)
-        elif tokens[i].type == "default":
+                # Default cannot be called inside this scope
+                if scope_mapping is SCOPE_STRUCT:
+                    error(
+                        "Default cannot be called inside a struct scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
+                elif scope_mapping is SCOPE_GLOBAL:
+                    error(
+                        "Default cannot be called inside the global scope",
+                        tokens[i].line_num,
+                        tokens[i].column,
+                    )
 
-            # Default cannot be called inside this scope
-            if scope_mapping is SCOPE_STRUCT:
-                error(
-                    "Default cannot be called inside a struct scope", tokens[i].line_num
-                )
-            elif scope_mapping is SCOPE_GLOBAL:
-                error(
-                    "Default cannot be called inside the global scope",
-                    tokens[i].line_num,
+                # Check if : (colon) is present after default keyword
+                check_if(
+                    got_type=tokens[i + 1].type,
+                    should_be_types="colon",
+                    error_msg="Expected : after default statement in switch",
+                    line_num=tokens[i + 1].line_num,
+                    column=tokens[i + 1].column,
                 )
 
-            # Check if : (colon) is present after default keyword
-            check_if(
-                got_type=tokens[i + 1].type,
-                should_be_types="colon",
-                error_msg="Expected : after default statement in switch",
-                line_num=tokens[i + 1].line_num,
-            )
+                op_codes.append(Marker("default"))
 
-            op_codes.append(OpCode("default", "", ""))
+                i += 2
 
-            i += 2
+            # If token is the type increment or decrement then generate unary_opcode
+            # This handles pre-increment/decrement
+            elif tokens[i].type in ["increment", "decrement"]:
+                unary_opcode, i = unary_statement(tokens, i, table)
 
-        # If token is the type increment or decrement then generate unary_opcode
-        # This handles pre-increment/decrement
-        elif tokens[i].type in ["increment", "decrement"]:
-            unary_opcode, i, func_ret_type = unary_statement(
-                tokens, i, table, func_ret_type
-            )
+                # End of one line function scope
+                if scope_mapping == SCOPE_SINGLE_FUNC_ST:
+                    scope_mapping = SCOPE_SINGLE_FUNC_EN
 
-            # End of one line function scope
-            if scope_mapping == SCOPE_SINGLE_FUNC_ST:
-                scope_mapping = SCOPE_SINGLE_FUNC_EN
+                op_codes.append(unary_opcode)
 
-            op_codes.append(unary_opcode)
+            # Otherwise increment the index
+            else:
+                i += 1
+        except CompileError as compile_error:
+            # Record the error and continue parsing from the next statement so that many errors are reported
+            collector.add(compile_error.diagnostics)
+            i = recover(tokens, i)
+        except Exception:
+            # Once an error has been recorded, the state of parser may be inconsistent, so report what was found
+            collector.raise_if_errors(start=num_diagnostics)
+            raise
+
+        # Newlines, braces and the rest of tokens skipped by the loop are not statements
+        if tracer is not None and statement_token.type in STATEMENT_TOKENS:
+            tracer.complete(
+                statement_token.type,
+                "parse",
+                statement_start,
+                line=statement_token.line_num,
+            )
 
-        # Otherwise increment the index
-        else:
-            i += 1
+    # Types of unparsed statements can't be resolved reliably if there were errors
+    collector.raise_if_errors(start=num_diagnostics)
 
     # Errors that may occur after parsing loop
     if main_fn_count == 1:
         error("No matching END_MAIN for MAIN", tokens[i - 1].line_num + 1)
 
-    # Parse all prints which could not be parsed due to unknown types
-    for name, print_info in func_ret_type.items():
-        if "print" in name:
-            print_opcode, i, func_ret_type = print_statement(
-                tokens, print_info[1], table, func_ret_type, -1
-            )
-            op_codes[print_info[0]] = print_opcode
+    # Infer types which could not be known while parsing and complete prints which depend on them
+    infer_types(table)
 
     # Return opcodes
     return op_codes
@@ -1,6 +1,6 @@
 from ..global_helpers import error, check_if
 
-from ..op_code import OpCode
+from ..syntax_tree import StructDecl
 
 
 def initializate_struct(tokens, i, table, instance_var_name, var_list):
@@ -12,16 +12,13 @@ def initializate_struct(tokens, i, table, instance_var_name, var_list):
     i           (int)  = Current index in token
     table               (SymbolTable) = Symbol Table constructed holding information about identifiers and constans
     instance_var_name   (String)      = Name of the instance of the struct
-    var_list            (String)      = List of if variable declared inside struct
+    var_list            (list)        = Ids of variables declared inside struct
     """
-    # Initializate the child variable of struct
-    var_ids = var_list.split("-")[1:]
-
     # Load var and copy to struct initilization
-    for var_id in var_ids:
+    for var_id in var_list:
 
         # Find the child variable of struct
-        var_name, type_, metatype_, _, _ = table.get_by_id(int(var_id))
+        var_name, type_, metatype_, _, _ = table.get_by_id(var_id)
         new_var_name = instance_var_name + "." + var_name
 
         # Check if variable already exist
@@ -31,8 +28,8 @@ def initializate_struct(tokens, i, table, instance_var_name, var_list):
             table.entry(instance_var_name + "." + var_name, type_, metatype_, "")
         # Otherwise, Modify datatype of the identifier
         else:
-            table.symbol_table[new_var_id][1] = type_
-            table.symbol_table[new_var_id][3] += "-" + var_id
+            table.symbol_table[new_var_id].type = type_
+            table.symbol_table[new_var_id].dependencies.append(var_id)
 
 
 def struct_declaration_statement(tokens, i, table):
@@ -45,8 +42,8 @@ def struct_declaration_statement(tokens, i, table):
     table       (SymbolTable) = Symbol table constructed holding information about identifiers and constants
     Returns
     =======
-    OpCode, int, string: The opcode for the assign code, the index, and the name of the function after
-                         parsing function calling statement
+    StructDecl, int, string: The statement for the struct code, the index, and the name of the struct after
+                             parsing struct declaration statement
     """
 
     from .simc_parser import skip_all_nextlines
@@ -57,6 +54,7 @@ def struct_declaration_statement(tokens, i, table):
         should_be_types="id",
         error_msg="Expected structure name",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Store the id of strcuture name in symbol table
@@ -79,6 +77,7 @@ def struct_declaration_statement(tokens, i, table):
         should_be_types="left_brace",
         error_msg="Expected { after structure name body",
         line_num=tokens[i + 1].line_num,
+        column=tokens[i + 1].column,
     )
 
     # Loop until } is reached
@@ -94,6 +93,6 @@ def struct_declaration_statement(tokens, i, table):
 
     # If right brace is not found then produce error
     if not found_right_brace:
-        error("Expected } after structure body", tokens[i].line_num)
+        error("Expected } after structure body", tokens[i].line_num, tokens[i].column)
 
-    return (OpCode("struct_decl", struct_name, ""), ret_idx - 1, struct_name)
+    return (StructDecl(struct_name), ret_idx - 1, struct_name)
@@ -1,6 +1,16 @@
 from ..global_helpers import error, check_if
 
-from ..op_code import OpCode
+from ..syntax_tree import (
+    VarAssign,
+    PtrAssign,
+    VarNoAssign,
+    ArrayNoAssign,
+    ArrayAssign,
+    ArrayOnlyAssign,
+    Assign,
+)
+
+from ..type_inference import propagate_types
 
 
 def check_ptr(tokens, i):
@@ -26,7 +36,7 @@ def check_ptr(tokens, i):
         return False, 0, i
 
 
-def var_statement(tokens, i, table, func_ret_type):
+def var_statement(tokens, i, table):
     """
     Parse variable and array declaration [/initialization] statement
     Params
@@ -34,10 +44,9 @@ def var_statement(tokens, i, table, func_ret_type):
     tokens      (list) = List of tokens
     i           (int)  = Current index in token
     table       (SymbolTable) = Symbol table constructed holding information about identifiers and constants
-    func_ret_type (string) = Function return type
     Returns
     =======
-    OpCode, int: The opcode for the var_assign/var_no_assign code and the index after parsing var statement
+    Statement, int: The statement for the var_assign/var_no_assign code and the index after parsing var statement
     Grammar
     =======
     var_statement   -> var id [= expr]?
@@ -60,6 +69,7 @@ def var_statement(tokens, i, table, func_ret_type):
         should_be_types="id",
         error_msg="Expected id after var keyword",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Tokens that are not accepted after declaration of a variable
@@ -121,6 +131,7 @@ def var_statement(tokens, i, table, func_ret_type):
                 error(
                     f"Expected integer size of array but got {type_}",
                     tokens[i + 2].line_num,
+                    tokens[i + 2].column,
                 )
 
             # Check if array statement has closing ] (right_bracket)
@@ -129,6 +140,7 @@ def var_statement(tokens, i, table, func_ret_type):
                 should_be_types="right_bracket",
                 error_msg="Expected ] after expression in array statement",
                 line_num=tokens[i + 3].line_num,
+                column=tokens[i + 3].column,
             )
 
             # Move token index to end of array declaration (right bracket)
@@ -149,7 +161,6 @@ def var_statement(tokens, i, table, func_ret_type):
                 table,
                 size_of_array,
                 "Required expression after assignment operator",
-                func_ret_type=func_ret_type,
             )
             i += 1
 
@@ -163,20 +174,18 @@ def var_statement(tokens, i, table, func_ret_type):
 
             # Return the opcode and i (the token after var statement)
             return (
-                OpCode(
-                    "array_assign",
-                    table.symbol_table[tokens[id_idx].val][0]
-                    + "---"
-                    + str(size_of_array)
-                    + "---"
-                    + op_value,
+                ArrayAssign(
+                    table.symbol_table[tokens[id_idx].val][0],
+                    str(size_of_array),
+                    op_value,
                     prec_to_type[op_type],
                 ),
                 i,
-                func_ret_type,
             )
         elif i + 1 < len(tokens) and tokens[i + 1].type in invalid_tokens:
-            error("Invalid Syntax for declaration", tokens[i].line_num)
+            error(
+                "Invalid Syntax for declaration", tokens[i].line_num, tokens[i].column
+            )
         else:
             # Get the value from symbol table by id
             value, type_, _, _, _ = table.get_by_id(tokens[id_idx].val)
@@ -192,7 +201,11 @@ def var_statement(tokens, i, table, func_ret_type):
                 "char *",
                 "char*",
             ]:
-                error("Variable %s already declared" % value, tokens[i].line_num)
+                error(
+                    "Variable %s already declared" % value,
+                    tokens[i].line_num,
+                    tokens[i].column,
+                )
 
             # Set type to declared
             table.symbol_table[tokens[id_idx].val][1] = "arr_declared"
@@ -204,13 +217,13 @@ def var_statement(tokens, i, table, func_ret_type):
                     "Size of array needs to be known if assignment is not done while"
                     " declaration",
                     tokens[i].line_num,
+                    tokens[i].column,
                 )
             else:
                 table.symbol_table[tokens[id_idx].val][2] = size_of_array
             return (
-                OpCode("array_no_assign", value + "---" + str(size_of_array)),
+                ArrayNoAssign(value, str(size_of_array)),
                 i,
-                func_ret_type,
             )
 
     # Check if variable is assigned with declaration
@@ -219,13 +232,14 @@ def var_statement(tokens, i, table, func_ret_type):
         id_idx = i
 
         # Check if expression follows = in var statement
-        op_value, op_type, i, func_ret_type = expression(
+        term = []
+        op_value, op_type, i = expression(
             tokens,
             i + 2,
             table,
             "Required expression after assignment operator",
             expect_paren=False,
-            func_ret_type=func_ret_type,
+            term=term,
         )
 
         # Modify datatype of the identifier
@@ -233,31 +247,28 @@ def var_statement(tokens, i, table, func_ret_type):
 
         if is_ptr:
             return (
-                OpCode(
-                    "ptr_assign",
-                    table.symbol_table[tokens[id_idx].val][0]
-                    + "---"
-                    + op_value
-                    + "---"
-                    + str(asterisk_count),
+                PtrAssign(
+                    table.symbol_table[tokens[id_idx].val][0],
+                    op_value,
+                    asterisk_count,
                     prec_to_type[op_type],
                 ),
                 i,
-                func_ret_type,
             )
         else:
-            # Return the opcode and i (the token after var statement)
-            return (
-                OpCode(
-                    "var_assign",
-                    table.symbol_table[tokens[id_idx].val][0] + "---" + op_value,
-                    prec_to_type[op_type],
-                ),
-                i,
-                func_ret_type,
+            var_opcode = VarAssign(
+                table.symbol_table[tokens[id_idx].val][0],
+                op_value,
+                prec_to_type[op_type],
             )
+
+            # f-strings with variables whose types are not known yet are converted after parsing
+            table.type_graph.defer(var_opcode, term)
+
+            # Return the opcode and i (the token after var statement)
+            return var_opcode, i
     elif i + 1 < len(tokens) and tokens[i + 1].type in invalid_tokens:
-        error("Invalid Syntax for declaration", tokens[i].line_num)
+        error("Invalid Syntax for declaration", tokens[i].line_num, tokens[i].column)
 
     # If it is of pointer or variable type but has no value yet
     else:
@@ -276,19 +287,23 @@ def var_statement(tokens, i, table, func_ret_type):
             "char*",
             "bool",
         ]:
-            error("Variable %s already declared" % value, tokens[i].line_num)
+            error(
+                "Variable %s already declared" % value,
+                tokens[i].line_num,
+                tokens[i].column,
+            )
 
         # Set declared
         table.symbol_table[tokens[i].val][1] = "declared"
 
         # Return the opcode and i+1 (the token after var statement)
         if is_ptr:
-            return OpCode("ptr_no_assign", value), i + 1, func_ret_type
+            return VarNoAssign(value, is_ptr=True), i + 1
 
-        return OpCode("var_no_assign", value), i + 1, func_ret_type
+        return VarNoAssign(value), i + 1
 
 
-def assign_statement(tokens, i, table, func_ret_type):
+def assign_statement(tokens, i, table):
     """
     Parse assignment statement
     Params
@@ -298,7 +313,7 @@ def assign_statement(tokens, i, table, func_ret_type):
     table       (SymbolTable) = Symbol table constructed holding information about identifiers and constants
     Returns
     =======
-    OpCode, int: The opcode for the assign code and the index after parsing assign statement
+    Statement, int: The statement for the assign code and the index after parsing assign statement
     Grammar
     =======
     var_statement   -> var id [= expr]?
@@ -339,13 +354,16 @@ def assign_statement(tokens, i, table, func_ret_type):
     # Check if variable is declared or not
     var_name, type_, _, _, scope = table.get_by_id(tokens[i - 1].val)
 
-    # If - is not in scope then it wasn't declared, otherwise its scope would have been resolved by now
-    # and it would have the form <start-line>-<end-line>-<module> as the scope
-    if type_ == "var" and "-" not in scope:
-        error("Variable %s used before declaration" % var_name, tokens[i - 1].line_num)
+    # Declared identifiers are part of a scope by now, so an identifier without scope wasn't declared
+    if type_ == "var" and not scope:
+        error(
+            "Variable %s used before declaration" % var_name,
+            tokens[i - 1].line_num,
+            tokens[i - 1].column,
+        )
 
     # Index of assignment in array
-    op_value_idx = ""
+    op_value_idx = None
 
     # Store the index of identifier
     id_idx = i - 1
@@ -364,21 +382,22 @@ def assign_statement(tokens, i, table, func_ret_type):
                     error(
                         f"Index {value} out of bounds for array {var_name}",
                         tokens[i].line_num,
+                        tokens[i].column,
                     )
             else:
                 error(
                     "Expected integer value or expression in array idexing",
                     tokens[i].line_num,
+                    tokens[i].column,
                 )
 
-        op_value_idx, op_type_idx, i, func_ret_type = expression(
+        op_value_idx, op_type_idx, i = expression(
             tokens,
             i,
             table,
             "Expected integer an index for array",
             block_type_promotion=True,
             expect_paren=False,
-            func_ret_type=func_ret_type,
         )
 
         # Type 3 is for integer expressions
@@ -386,6 +405,7 @@ def assign_statement(tokens, i, table, func_ret_type):
             error(
                 "Expected integer value or expression in array idexing",
                 tokens[i].line_num,
+                tokens[i].column,
             )
 
     # Dictionary to convert tokens to their corresponding assignment types
@@ -416,6 +436,7 @@ def assign_statement(tokens, i, table, func_ret_type):
         ],
         error_msg="Expected assignment operator after identifier",
         line_num=tokens[i].line_num,
+        column=tokens[i].column,
     )
 
     # Convert the token to respective symbol
@@ -428,11 +449,18 @@ def assign_statement(tokens, i, table, func_ret_type):
     # Flag to check array assignment
     is_arr = False
 
+    # Steps of expression, f-strings whose variables have unknown types are converted after parsing
+    term = []
+
     # Check if assignment is an array initializer or a simple expression type
     if tokens[i + 1].type == "left_brace":
         is_arr = True
         if type_ != "arr_declared":
-            error("Cannot assign an initializer list to a variable", tokens[i].line_num)
+            error(
+                "Cannot assign an initializer list to a variable",
+                tokens[i].line_num,
+                tokens[i].column,
+            )
 
         size_of_array = id_table_entry[2]
 
@@ -442,7 +470,6 @@ def assign_statement(tokens, i, table, func_ret_type):
             table,
             size_of_array,
             "Required expression after assignment operator",
-            func_ret_type=func_ret_type,
         )
 
         # Modify datatype of the identifier
@@ -453,20 +480,19 @@ def assign_statement(tokens, i, table, func_ret_type):
             error(
                 "Array assignment requires initializer list, cannot assign expression",
                 tokens[i].line_num,
+                tokens[i].column,
             )
 
         # Check if expression follows = in assign statement
-        op_value, op_type, i, func_ret_type = expression(
+        op_value, op_type, i = expression(
             tokens,
             i + 1,
             table,
             "Required expression after assignment operator",
             expect_paren=False,
-            func_ret_type=func_ret_type,
+            term=term,
         )
 
-    op_value = converted_type + "---" + op_value
-
     if table.symbol_table[var_id][1] in ["var", "declared"]:
         # Modify datatype of the identifier
         table.symbol_table[var_id][1] = prec_to_type[op_type]
@@ -474,49 +500,35 @@ def assign_statement(tokens, i, table, func_ret_type):
     # Check if a pointer is being assigned
     if is_ptr:
         return (
-            OpCode(
-                "ptr_only_assign",
-                table.symbol_table[var_id][0]
-                + op_value_idx
-                + "---"
-                + op_value
-                + "---"
-                + str(count_ast),
-                "",
+            Assign(
+                table.symbol_table[var_id][0],
+                op_value_idx,
+                converted_type,
+                op_value,
+                count_ast,
             ),
             i,
-            func_ret_type,
         )
 
-    # Resolve pendenting infer types
-    table.resolve_dependency(tokens, i, var_id)
+    # Pass the type of identifier on to the identifiers which depend on it
+    propagate_types(table, [var_id])
 
     # If it is an array then generate array_only_assign
     if is_arr:
-        # Add (<type> [<size>]) to op_value
-        op_value = (
-            " "
-            + op_value.split("---")[0]
-            + " ("
-            + prec_to_type[op_type]
-            + " ["
-            + size_of_array
-            + "])"
-            + op_value.split("---")[1]
-        )
+        # The initializer list is assigned as (<type> [<size>])<initializer-list>
         return (
-            OpCode(
-                "array_only_assign",
-                table.symbol_table[var_id][0] + "---" + op_value,
-                "",
+            ArrayOnlyAssign(
+                table.symbol_table[var_id][0],
+                converted_type,
+                prec_to_type[op_type],
+                size_of_array,
+                op_value,
             ),
             i,
-            func_ret_type,
         )
 
+    assign_opcode = Assign(var_name, op_value_idx, converted_type, op_value)
+    table.type_graph.defer(assign_opcode, term)
+
     # Return the opcode and i (the token after assign statement)
-    return (
-        OpCode("assign", var_name + op_value_idx + "---" + op_value, ""),
-        i,
-        func_ret_type,
-    )
+    return assign_opcode, i
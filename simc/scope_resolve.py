@@ -1,76 +1,212 @@
-from .token_class import Token
+class Scope:
+    """
+    Scope class is a node of the scope tree, it maps names declared in the scope to their ids in symbol table
+    """
+
+    __slots__ = ("parent", "names", "module_name", "start_line", "end_line")
+
+    def __init__(self, parent, module_name, start_line):
+        """
+        Class initializer
+
+        Params
+        ======
+        parent      (Scope)  = Enclosing scope, None for the global scope of a module
+        module_name (string) = Name of module in which scope is
+        start_line  (int)    = Line number at which scope begins
+        """
+
+        self.parent = parent
+        self.names = {}
+        self.module_name = module_name
+        self.start_line = start_line
+        self.end_line = None
+
+    def declare(self, name, id):
+        """
+        Declare a name in this scope, a later declaration of the same name shadows the earlier one
+
+        Params
+        ======
+        name (string) = Name of identifier
+        id   (int)    = Id of identifier in symbol table
+        """
+
+        self.names[name] = id
+
+    def lookup(self, name):
+        """
+        Returns id of the declaration of a name visible from this scope
+
+        Params
+        ======
+        name (string) = Name of identifier
+
+        Returns
+        =======
+        int: The id of declaration in symbol table, None if no declaration is visible
+        """
+
+        scope = self
+        while scope is not None:
+            id_ = scope.names.get(name)
+            if id_ is not None:
+                return id_
+            scope = scope.parent
+
+        return None
+
+    def __repr__(self):
+        """
+        String representation of a Scope
+
+        Returns
+        =======
+        string: <start-line>-<end-line>-<module> of the scope
+        """
+
+        return "%s-%s-%s" % (self.start_line, self.end_line, self.module_name)
+
+
+# States of a function definition while its tokens are being resolved
+FUNCTION_PARAMS = 1
+FUNCTION_BODY_PENDING = 2
+FUNCTION_SINGLE_STATEMENT = 3
 
 
 class ScopeResolver:
-    def __init__(self, tokens_list, symbol_table):
-        self.__tokens_list = tokens_list
-        self.__symbol_table = symbol_table
-        self.__scope_stack = []
-
-    def __push_to_scope_stack(self, val):
-        self.__scope_stack.append(val)
-
-    def __pop_from_scope_stack(self):
-        return self.__scope_stack.pop()
-
-    def resolve_scope(self, module_name):
-        final_line = 0
-        id_usage_to_resolve = []
-        function_started = False
-
-        for i, token in enumerate(self.__tokens_list):
-            if i > 0 and self.__tokens_list[i - 1].type == "fun" and token.type == "id":
-                self.__push_to_scope_stack(Token("left_brace", "", token.line_num))
-                function_started = True
-            elif (
-                i > 0 and self.__tokens_list[i - 1].type == "var" and token.type == "id"
-            ):
-                self.__push_to_scope_stack(token)
-            elif token.type == "id" and function_started:
-                self.__push_to_scope_stack(token)
-            elif token.type == "call_end" and function_started:
-                function_started = False
-            elif token.type == "id":
-                id_usage_to_resolve.append(i)
+    """
+    ScopeResolver class builds the scope tree of a module while tokens are being generated and resolves every
+    identifier usage to the declaration visible from its scope
+    """
+
+    def __init__(self, symbol_table, module_name="main"):
+        """
+        Class initializer
+
+        Params
+        ======
+        symbol_table (SymbolTable) = Shared symbol table
+        module_name  (string)      = Name of module whose tokens are resolved
+        """
+
+        self.symbol_table = symbol_table
+        self.module_name = module_name
+
+        self.root = Scope(None, module_name, 1)
+        self.current = self.root
+
+        # Type of previous token and the line number of last token
+        self.previous_type = None
+        self.line_num = 1
+
+        # State of function definition being resolved, and nesting of parentheses in its parameter list
+        self.function_state = None
+        self.paren_depth = 0
+
+        # Id of name of the function whose parameters are being resolved
+        self.function_id = None
+
+    def __open_scope(self, line_num):
+        self.current = Scope(self.current, self.module_name, line_num)
+
+    def __close_scope(self, line_num):
+        # Unbalanced braces are reported by the lexical analyzer, the global scope is never closed here
+        if self.current is not self.root:
+            self.current.end_line = line_num
+            self.current = self.current.parent
+
+    def __declare(self, token):
+        entry = self.symbol_table.symbol_table[token.val]
+        entry.scope = self.current
+        self.current.declare(entry.value, token.val)
+
+    def __declare_param(self, token):
+        # The lexical analyzer gives a parameter the id of an earlier identifier with the same name, the
+        # parameter gets its own entry (like variables declared with var) unless the entry was made for it
+        entry = self.symbol_table.symbol_table[token.val]
+        if entry.scope or token.val < self.function_id:
+            token.val = self.symbol_table.entry(entry.value, "var", "variable")
+
+        self.__declare(token)
+
+    def __resolve_usage(self, token):
+        name = self.symbol_table.symbol_table[token.val].value
+        id_ = self.current.lookup(name)
+
+        # Identifiers which are not declared keep the id given by the lexical analyzer
+        if id_ is not None:
+            token.val = id_
+
+    def resolve(self, token):
+        """
+        Update scope tree with the next token, identifier usages are resolved in place
+
+        Params
+        ======
+        token (Token) = Next token of module
+        """
+
+        type_ = token.type
+        previous_type = self.previous_type
+
+        # A function without braces has a single statement as its body
+        if self.function_state == FUNCTION_BODY_PENDING and type_ not in [
+            "newline",
+            "call_end",
+            "left_brace",
+        ]:
+            self.function_state = FUNCTION_SINGLE_STATEMENT
+
+        if type_ == "id":
+            # Name of function, the function scope holds its parameters and body
+            if previous_type == "fun":
+                self.__open_scope(token.line_num)
+                self.function_state = FUNCTION_PARAMS
+                self.function_id = token.val
+                self.paren_depth = 0
+            # Declaration of a variable
+            elif previous_type == "var":
+                self.__declare(token)
+            # Declaration of a parameter
             elif (
-                i > 0
-                and token.type == "left_brace"
-                and self.__tokens_list[i - 1].type != "call_end"
+                self.function_state == FUNCTION_PARAMS
+                and self.paren_depth == 1
+                and previous_type in ["left_paren", "comma"]
             ):
-                self.__push_to_scope_stack(token)
-            elif token.type == "right_brace":
-                while len(self.__scope_stack) != 0:
-                    top_token = self.__pop_from_scope_stack()
-
-                    if top_token.type == "id":
-                        top_token_id = top_token.val
-                        self.__symbol_table.symbol_table[top_token_id][-1] += (
-                            "-" + str(token.line_num) + "-" + module_name
-                        )
-                    elif top_token.type == "left_brace":
-                        break
-
-            final_line = token.line_num
-
-        while len(self.__scope_stack) != 0:
-            top_token = self.__pop_from_scope_stack()
-
-            if top_token.type == "id":
-                top_token_id = top_token.val
-                self.__symbol_table.symbol_table[top_token_id][-1] += (
-                    "-" + str(final_line) + "-" + module_name
-                )
-
-        for id_ in id_usage_to_resolve:
-            resolved_id = self.__symbol_table.resolve_scope_for_id(
-                token=self.__tokens_list[id_], module_name=module_name
-            )
-            self.__tokens_list[id_].val = (
-                resolved_id if resolved_id != None else self.__tokens_list[id_].val
-            )
-
-        return self.__tokens_list, self.__symbol_table
-
-    def swap_tokens_and_table(self, tokens_list, table):
-        self.__tokens_list = tokens_list
-        self.__symbol_table = table
+                self.__declare_param(token)
+            else:
+                self.__resolve_usage(token)
+        elif type_ == "left_paren":
+            if self.function_state == FUNCTION_PARAMS:
+                self.paren_depth += 1
+        elif type_ == "right_paren":
+            if self.function_state == FUNCTION_PARAMS:
+                self.paren_depth -= 1
+                if self.paren_depth == 0:
+                    self.function_state = FUNCTION_BODY_PENDING
+        elif type_ == "left_brace":
+            # Braces of function body don't open another scope
+            if self.function_state == FUNCTION_BODY_PENDING:
+                self.function_state = None
+            else:
+                self.__open_scope(token.line_num)
+        elif type_ == "right_brace":
+            self.__close_scope(token.line_num)
+        elif type_ == "newline":
+            if self.function_state == FUNCTION_SINGLE_STATEMENT:
+                self.function_state = None
+                self.__close_scope(token.line_num)
+
+        self.previous_type = type_
+        self.line_num = token.line_num
+
+    def finish(self):
+        """
+        Close the scopes which are still open at the end of module
+        """
+
+        while self.current is not self.root:
+            self.__close_scope(self.line_num)
+
+        self.root.end_line = self.line_num
@@ -0,0 +1,551 @@
+# Modules for the compile server and its client
+import os
+import sys
+import json
+import pickle
+import signal
+import socket
+import hashlib
+import argparse
+import tempfile
+import threading
+import traceback
+import socketserver
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Module for compiling source code in memory
+from .simc import compile_string
+
+# Module for reporting errors
+from .diagnostics import CompileError, Diagnostic
+
+# Directory where installed modules can be found
+from .lexical_analyzer import MODULE_DIR
+
+# Number of compile results kept by each worker process
+RESULT_CACHE_SIZE = 256
+
+# Number of results of front end of modules kept by each worker process
+MODULE_CACHE_SIZE = 256
+
+# Installed module name -> (modification time, source code), kept by each worker process
+_installed_modules = {}
+
+# Key of request -> response, kept by each worker process
+_results = OrderedDict()
+
+
+class MemoryCache:
+    """
+    MemoryCache class keeps results of compiler stages in memory with the interface of BuildCache, values are
+    stored pickled so that every load returns a new copy (linking renumbers the ModuleUnit of a module in place)
+    """
+
+    def __init__(self, size):
+        """
+        Class initializer
+
+        Params
+        ======
+        size (int) = Number of entries kept, the least recently used are removed first
+        """
+
+        self.size = size
+        self.entries = OrderedDict()
+
+    def load(self, stage, key):
+        value = self.entries.get((stage, key))
+        if value is None:
+            return None
+
+        self.entries.move_to_end((stage, key))
+
+        return pickle.loads(value)
+
+    def store(self, stage, key, value):
+        self.entries[(stage, key)] = pickle.dumps(
+            value, protocol=pickle.HIGHEST_PROTOCOL
+        )
+        self.entries.move_to_end((stage, key))
+
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+# Results of front end of modules, kept by each worker process
+_module_units = MemoryCache(MODULE_CACHE_SIZE)
+
+
+def default_socket_path():
+    """
+    Returns the default path of Unix socket on which the server listens, it can be set with SIMC_SOCKET
+
+    The socket is in the runtime directory of user ($XDG_RUNTIME_DIR), or else in a directory of user inside the
+    temporary directory which only the user can access, as anyone could create a socket with a predictable name
+    directly in the temporary directory and receive the source code sent by clients
+
+    Returns
+    =======
+    string: Path of Unix socket
+    """
+
+    if os.environ.get("SIMC_SOCKET"):
+        return os.environ["SIMC_SOCKET"]
+
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "simc.sock")
+
+    user_id = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), "simc-%d" % user_id, "simc.sock")
+
+
+def is_trusted_socket(socket_path):
+    """
+    Checks whether a socket was created by the current user in a directory which other users can't replace it in,
+    the directory must belong to the user (or to root, like the sticky temporary directory)
+
+    Params
+    ======
+    socket_path (string) = Path of Unix socket
+
+    Returns
+    =======
+    bool: Whether the socket can be trusted with source code
+    """
+
+    if not hasattr(os, "getuid"):
+        return True
+
+    user_id = os.getuid()
+    try:
+        socket_status = os.stat(socket_path)
+        dir_status = os.stat(os.path.dirname(os.path.abspath(socket_path)))
+    except OSError:
+        return False
+
+    return socket_status.st_uid == user_id and dir_status.st_uid in [user_id, 0]
+
+
+def make_socket_dir(socket_path):
+    """
+    Create the directory of socket (only the user can access it) if it doesn't exist, and check that it belongs
+    to the user
+    """
+
+    socket_dir = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+
+    if hasattr(os, "getuid") and os.stat(socket_dir).st_uid not in [os.getuid(), 0]:
+        print("Directory %s of socket belongs to another user" % socket_dir)
+        sys.exit(1)
+
+
+def installed_module_sources():
+    """
+    Returns source code of installed modules, files are only read again when they are modified
+
+    Returns
+    =======
+    dict: Module name -> sim-C source code
+    """
+
+    if not os.path.isdir(MODULE_DIR):
+        _installed_modules.clear()
+        return {}
+
+    names = set()
+    for filename in os.listdir(MODULE_DIR):
+        if not filename.endswith(".simc"):
+            continue
+
+        name = filename[: -len(".simc")]
+        path = os.path.join(MODULE_DIR, filename)
+        names.add(name)
+
+        mtime = os.stat(path).st_mtime_ns
+        if name not in _installed_modules or _installed_modules[name][0] != mtime:
+            with open(path, "r") as file:
+                _installed_modules[name] = (mtime, file.read())
+
+    # Forget modules which were uninstalled
+    for name in set(_installed_modules) - names:
+        del _installed_modules[name]
+
+    return {name: source for name, (_, source) in _installed_modules.items()}
+
+
+def compile_request(request):
+    """
+    Compile a single request, this runs in a worker process
+
+    Params
+    ======
+    request (dict) = Request with source, and optionally filename, modules and id
+
+    Returns
+    =======
+    dict: Response with id, ok, c_code, headers and diagnostics
+    """
+
+    response = {"id": request.get("id"), "ok": False, "c_code": None, "headers": {}}
+
+    try:
+        source = request["source"]
+        filename = request.get("filename", "main.simc")
+
+        # Modules given in request take precedence over installed modules
+        modules = installed_module_sources()
+        modules.update(request.get("modules") or {})
+
+        # Whole responses are reused for requests which are sent again, other requests reuse the front end of
+        # modules which didn't change
+        key = hashlib.sha256(
+            json.dumps([filename, source, sorted(modules.items())]).encode()
+        ).hexdigest()
+
+        if key in _results:
+            _results.move_to_end(key)
+            cached = _results[key]
+        else:
+            try:
+                result = compile_string(
+                    source,
+                    modules=modules,
+                    filename=filename,
+                    module_cache=_module_units,
+                )
+                cached = {
+                    "ok": True,
+                    "c_code": result.c_code,
+                    "headers": result.headers,
+                    "diagnostics": [],
+                }
+            except CompileError as compile_error:
+                cached = {
+                    "ok": False,
+                    "c_code": None,
+                    "headers": {},
+                    "diagnostics": [d.to_dict() for d in compile_error.diagnostics],
+                }
+
+            _results[key] = cached
+            if len(_results) > RESULT_CACHE_SIZE:
+                _results.popitem(last=False)
+
+        response.update(cached)
+    except Exception:
+        # Report internal errors to the client instead of killing the worker
+        diagnostic = Diagnostic(
+            "Internal compiler error\n" + traceback.format_exc(),
+            request.get("filename") if isinstance(request, dict) else None,
+        )
+        response["diagnostics"] = [diagnostic.to_dict()]
+
+    return response
+
+
+def check_request(request):
+    """
+    Check that a request has the fields needed to compile it, ValueError is raised otherwise
+
+    Params
+    ======
+    request (object) = Request decoded from JSON
+    """
+
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+
+    if not isinstance(request.get("source"), str):
+        raise ValueError("request must have the source code as a string in source")
+
+    if not isinstance(request.get("filename", ""), str):
+        raise ValueError("filename must be a string")
+
+    modules = request.get("modules") or {}
+    if not isinstance(modules, dict) or not all(
+        isinstance(source, str) for source in modules.values()
+    ):
+        raise ValueError("modules must map names of modules to their source code")
+
+
+def error_response(request_id, msg):
+    """
+    Returns the response to a request which could not be compiled because of an error outside of its source code
+
+    Params
+    ======
+    request_id (object) = Id of request, None if it isn't known
+    msg        (string) = Error message
+
+    Returns
+    =======
+    dict: Response with id, ok, c_code, headers and diagnostics
+    """
+
+    return {
+        "id": request_id,
+        "ok": False,
+        "c_code": None,
+        "headers": {},
+        "diagnostics": [Diagnostic(msg).to_dict()],
+    }
+
+
+class RequestDispatcher:
+    """
+    RequestDispatcher class hands requests to the worker pool and writes responses as soon as they are ready
+    """
+
+    def __init__(self, executor, write_line):
+        """
+        Class initializer
+
+        Params
+        ======
+        executor   (Executor) = Pool of workers
+        write_line (function) = Writes one line of response
+        """
+
+        self.executor = executor
+        self.write_line = write_line
+        self.lock = threading.Lock()
+
+        # Futures of requests which are not answered yet, answered ones are forgotten as they hold the C code
+        self.pending = set()
+
+    def dispatch(self, line):
+        """
+        Submit a request line to the worker pool, invalid requests are answered immediately
+
+        Params
+        ======
+        line (bytes/string) = A JSON encoded request
+        """
+
+        if not line.strip():
+            return
+
+        request = None
+        try:
+            request = json.loads(line)
+            check_request(request)
+        except ValueError as exception:
+            request_id = request.get("id") if isinstance(request, dict) else None
+            self.respond(
+                error_response(request_id, "Invalid request: %s" % exception)
+            )
+            return
+
+        future = self.executor.submit(compile_request, request)
+        with self.lock:
+            self.pending.add(future)
+        future.add_done_callback(
+            lambda future: self.__on_done(future, request.get("id"))
+        )
+
+    def __on_done(self, future, request_id):
+        try:
+            response = future.result()
+        except Exception as exception:
+            # The worker process died, for example when it ran out of memory
+            response = error_response(
+                request_id, "Internal compiler error: %r" % exception
+            )
+
+        self.respond(response)
+
+        with self.lock:
+            self.pending.discard(future)
+
+    def respond(self, response):
+        """
+        Write a response, responses of concurrent requests never interleave
+
+        Params
+        ======
+        response (dict) = Response to be written
+        """
+
+        with self.lock:
+            self.write_line(json.dumps(response) + "\n")
+
+    def wait(self):
+        """
+        Wait until every submitted request is answered
+        """
+
+        with self.lock:
+            pending = list(self.pending)
+
+        for future in pending:
+            future.exception()
+
+
+def serve_stdio(executor):
+    """
+    Serve JSON-lines requests from stdin, responses are written to stdout
+
+    Params
+    ======
+    executor (Executor) = Pool of workers
+    """
+
+    def write_line(line):
+        sys.stdout.write(line)
+        sys.stdout.flush()
+
+    dispatcher = RequestDispatcher(executor, write_line)
+    for line in sys.stdin:
+        dispatcher.dispatch(line)
+
+    dispatcher.wait()
+
+
+def serve_socket(executor, socket_path):
+    """
+    Serve JSON-lines requests on a Unix socket, every connection can send many requests
+
+    Params
+    ======
+    executor    (Executor) = Pool of workers
+    socket_path (string)   = Path of Unix socket
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def write_line(line):
+                self.wfile.write(line.encode())
+                self.wfile.flush()
+
+            dispatcher = RequestDispatcher(executor, write_line)
+            for line in self.rfile:
+                dispatcher.dispatch(line)
+
+            dispatcher.wait()
+
+    make_socket_dir(socket_path)
+
+    if os.path.exists(socket_path):
+        if is_server_running(socket_path):
+            print("simc server is already running at %s" % socket_path)
+            sys.exit(1)
+
+        # Remove socket left behind by a server which did not shut down cleanly
+        os.remove(socket_path)
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    server.daemon_threads = True
+
+    # Remove the socket when the server is stopped with SIGTERM as well
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    print("simc server listening at %s" % socket_path)
+    sys.stdout.flush()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+
+
+def serve(args):
+    """
+    Run the compile server, usage: simc serve [--stdio] [--socket PATH] [-j N]
+
+    Params
+    ======
+    args (list) = Command line arguments after serve
+    """
+
+    arg_parser = argparse.ArgumentParser(
+        prog="simc serve", description="Keep the compiler running to answer compile requests"
+    )
+    arg_parser.add_argument(
+        "--stdio", action="store_true", help="Read requests from stdin instead of a socket"
+    )
+    arg_parser.add_argument(
+        "--socket", default=default_socket_path(), help="Path of Unix socket"
+    )
+    arg_parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Number of processes"
+    )
+    options = arg_parser.parse_args(args)
+
+    with ProcessPoolExecutor(max_workers=max(1, options.jobs)) as executor:
+        if options.stdio or not hasattr(socket, "AF_UNIX"):
+            serve_stdio(executor)
+        else:
+            serve_socket(executor, options.socket)
+
+
+def is_server_running(socket_path):
+    """
+    Checks whether a server is listening on a Unix socket
+
+    Params
+    ======
+    socket_path (string) = Path of Unix socket
+
+    Returns
+    =======
+    bool: Whether the server is running or not
+    """
+
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return False
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+
+def request_compile(request, socket_path=None):
+    """
+    Send a compile request to the running server
+
+    Params
+    ======
+    request     (dict)   = Request with source, and optionally filename, modules and id
+    socket_path (string) = Path of Unix socket, the default path is used if not given
+
+    Returns
+    =======
+    dict: Response of server, None if the server is not running
+    """
+
+    socket_path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+
+    # Source code is only sent to a server of the same user
+    if not is_trusted_socket(socket_path):
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+
+    with client:
+        client.sendall((json.dumps(request) + "\n").encode())
+        client.shutdown(socket.SHUT_WR)
+
+        with client.makefile("rb") as file:
+            line = file.readline()
+
+    if not line:
+        return None
+
+    return json.loads(line)
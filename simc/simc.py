@@ -1,147 +1,1038 @@
-# Import sys, os and pprint module
+# Import sys and os module
 import sys
 import os
-import pprint
+
+# Modules for batch builds, modules which are slow to import (like pprint, argparse and the pool of processes)
+# are imported where they are needed so that every compilation doesn't wait for them
+import io
+import time
+from contextlib import redirect_stdout
 
 # Module to import global helpers
 from .global_helpers import error
 
+# Module for reporting errors
+from .diagnostics import (
+    CompileError,
+    Diagnostic,
+    collecting,
+    exit_with_diagnostics,
+    print_diagnostics,
+)
+
 # Module to import Symbol Table class
 from .symbol_table import SymbolTable
 
 # Module for using lexical analyzer
-from .lexical_analyzer import LexicalAnalyzer
+from .lexical_analyzer import LexicalAnalyzer, MODULE_DIR
 
 # Module for using parser
 from .parser.simc_parser import parse
 
 # Module for using compiler
-from .compiler import compile
+from .compiler import (
+    compile,
+    generate_code,
+    write_code,
+    HeaderBackend,
+    ModuleSourceBackend,
+)
 
-from .scope_resolve import ScopeResolver
+# Module for removing unreachable code of modules
+from .call_graph import prune_unreachable
 
+# Module for running the front end of modules and linking their symbol tables
+from .linker import module_front_ends, ModuleLinker
 
-def run():
-    filename = ""
+# Module for measuring time and memory taken by stages of compiler
+from .compile_stats import CompileStats
+
+# Module for tracing and profiling compilation
+from .tracing import profiled
+
+# Module for caching results of compiler stages on disk
+from .build_cache import BuildCache, hash_file
+
+
+def lex_source(filename, table, source_code=None, module_sources=None):
+    """
+    Generate tokens of source code, identifiers are resolved to their declarations during lexical analysis
+
+    Params
+    ======
+    filename       (string)      = Path of sim-C source file
+    table          (SymbolTable) = Symbol table to be filled
+    source_code    (string)      = sim-C source code, if given the file is not read
+    module_sources (dict)        = Module name -> sim-C source code of modules which are not installed
+
+    Returns
+    =======
+    list:        Tokens of source code
+    SymbolTable: The symbol table
+    list:        Source paths of imported modules
+    """
+
+    lexical_analyzer = LexicalAnalyzer(
+        filename, table, source_code=source_code, module_sources=module_sources
+    )
+    tokens, module_source_paths = lexical_analyzer.lexical_analyze(module_name="main")
+
+    return tokens, table, module_source_paths
+
+
+def front_end_modules(
+    module_source_paths,
+    table,
+    collector,
+    module_sources=None,
+    jobs=1,
+    stats=None,
+    cache=None,
+):
+    """
+    Lex and parse imported modules, each with a symbol table of its own (in parallel if jobs is more than one),
+    and link their symbol tables into the symbol table of source code in order of imports
+
+    Params
+    ======
+    module_source_paths (list)                = Source paths of imported modules
+    table               (SymbolTable)         = Symbol table of source code after lexical analysis
+    collector           (DiagnosticCollector) = Collector of current compilation
+    module_sources      (dict)                = Module name -> sim-C source code of modules which are not installed
+    jobs                (int)                 = Number of processes running the front end of modules
+    stats               (CompileStats)        = Stats to which stages of every module are added
+    cache               (object)              = Cache of results of front end of modules (see module_front_ends),
+                                                None to always run the front end
+
+    Returns
+    =======
+    dict: Module name -> tokens of module
+    dict: Module name -> opcodes of module
+    """
+
+    all_module_tokens = {}
+    all_module_opcodes = {}
+    filename = collector.filename
+
+    if stats is None:
+        stats = CompileStats()
+
+    linker = ModuleLinker(table)
+    for unit in module_front_ends(
+        module_source_paths, module_sources, jobs, stats.trace_memory, cache
+    ):
+        stats.extend(unit.stages)
+
+        with stats.stage("link", unit.name) as stage:
+            linker.link(unit)
+            module_tokens = unit.stream.to_tokens()
+            stage.symbols = len(table.symbol_table)
+
+        # Modules calling functions of other modules are parsed with the symbol table of source code
+        module_opcodes = unit.opcodes
+        if module_opcodes is None:
+            collector.filename = unit.filename
+            with stats.stage("parse", unit.name) as stage:
+                module_opcodes = parse(module_tokens, table)
+                stage.opcodes = len(module_opcodes)
+                stage.symbols = len(table.symbol_table)
+
+        all_module_tokens[unit.name] = module_tokens
+        all_module_opcodes[unit.name] = module_opcodes
+
+    collector.filename = filename
 
-    pretty_printer = pprint.PrettyPrinter(indent=4)
+    return all_module_tokens, all_module_opcodes
 
-    # Check if filepath is provided or not
-    if len(sys.argv) >= 2:
-        filename = sys.argv[1]
+
+def module_files(module_name, module_opcodes, table, separate=False):
+    """
+    Returns the files generated for a module with the backend generating each of them
+
+    Params
+    ======
+    module_name    (string)      = Name of module
+    module_opcodes (list)        = Opcodes of module
+    table          (SymbolTable) = Symbol table after parsing
+    separate       (bool)        = Whether the module is compiled separately, to a C file with definitions and a
+                                   header with declarations, instead of a header with definitions
+
+    Returns
+    =======
+    list: (filename, backend) of each file, backend is None for the C backend
+    """
+
+    if not separate:
+        return [(module_name + ".h", None)]
+
+    return [
+        (module_name + ".h", HeaderBackend(module_name)),
+        (module_name + ".c", ModuleSourceBackend(module_name)),
+    ]
+
+
+def link_modules(c_filename, module_names, cache=None, cflags=None, graph_path=None):
+    """
+    Compile the C files of modules compiled separately to object files and link them with the C file of program,
+    object files and the executable are copied from the build cache when the generated code didn't change
+
+    Params
+    ======
+    c_filename   (string)     = Path of generated C file of program
+    module_names (list)       = Names of modules whose C files were generated in the current working directory
+    cache        (BuildCache) = Cache of object files and executables, None to always run the C compiler
+    cflags       (list)       = Flags of C compiler, like optimization flags, DEFAULT_CFLAGS if not given
+    graph_path   (string)     = Path of dependency graph (ninja file or Makefile) to be generated, None to not
+                                generate it
+
+    Returns
+    =======
+    string: Path of executable
+    """
+
+    # Module for compiling generated C code to object files and executables
+    from .toolchain import (
+        DEFAULT_CFLAGS,
+        find_c_compiler,
+        c_compiler_version,
+        executable_rules,
+        run_rules,
+        write_graph,
+    )
+
+    cc = find_c_compiler()
+    exe_filename = os.path.splitext(c_filename)[0]
+
+    rules = executable_rules(
+        cc,
+        DEFAULT_CFLAGS if cflags is None else cflags,
+        c_filename,
+        module_names,
+        exe_filename,
+    )
+
+    if graph_path is not None:
+        write_graph(rules, graph_path)
+
+    run_rules(rules, cache, c_compiler_version(cc, cache))
+
+    return exe_filename
+
+
+def compile_file(
+    filename,
+    debug_option=None,
+    use_cache=True,
+    separate=False,
+    link=False,
+    jobs=1,
+    stats=None,
+    cflags=None,
+    graph_path=None,
+):
+    """
+    Compile a sim-C source file to C, module headers are generated in the current working directory
+
+    Params
+    ======
+    filename     (string)       = Path of sim-C source file
+    debug_option (string)       = One of token, table_after_lexing, opcode or table_after_parsing to print
+                                  compiler state
+    use_cache    (bool)         = Whether results of compiler stages should be reused from/stored in the build
+                                  cache
+    separate     (bool)         = Whether modules are compiled separately to C files and headers with declarations
+    link         (bool)         = Whether the program is compiled and linked to an executable (next to the C
+                                  file), modules are compiled separately to object files for this
+    jobs         (int)          = Number of processes running the front end of imported modules
+    stats        (CompileStats) = Stats to which time, sizes and memory of every stage are added
+    cflags       (list)         = Flags of C compiler used when linking, like optimization flags
+    graph_path   (string)       = Path of dependency graph (ninja file or Makefile) of executable generated when
+                                  linking, None to not generate it
+
+    Returns
+    =======
+    string: Path of generated C file
+    """
+
+    if stats is None:
+        stats = CompileStats()
+
+    # Errors are reported with the path of file in which they occur
+    with collecting(filename) as collector, stats:
+        # Only debug options print compiler state
+        if debug_option is not None:
+            import pprint
+
+            pretty_printer = pprint.PrettyPrinter(indent=4)
 
         # Check if extension of file is correct or not
-        if "." not in filename or filename.split(".")[-1] != "simc":
+        if os.path.splitext(filename)[1] != ".simc":
             error("Incorrect file extension", -1)
-    else:
-        error("Please provide simc file path", -1)
 
-    # Get the filename of c file to be generated
-    c_filename = "".join(filename.split(".")[:-1]) + ".c"
+        if not os.path.isfile(filename):
+            error("File %s not found" % filename, -1)
 
-    # Create symbol table
-    table = SymbolTable()
+        # Get the filename of c file to be generated
+        c_filename = os.path.splitext(filename)[0] + ".c"
 
-    # Get tokens and list of modules from source code
-    lexical_analyzer = LexicalAnalyzer(filename, table)
-    tokens, module_source_paths = lexical_analyzer.lexical_analyze()
+        # Debug options need every stage to run so the cache is only used for plain builds
+        cache = BuildCache() if use_cache and debug_option is None else None
 
-    scope_resolver = ScopeResolver(tokens_list=tokens, symbol_table=table)
-    tokens, table = scope_resolver.resolve_scope(module_name="main")
+        # Lexing and scope resolution of source only depend on source code (and the directory of installed
+        # modules, the paths of imported modules are cached with the tokens)
+        lex_key = None
+        cached = None
+        if cache is not None:
+            with stats.stage("load_lex"):
+                lex_key = cache.key("lex", hash_file(filename), MODULE_DIR)
+                cached = cache.load("lex", lex_key)
 
-    # Get tokens for modules
-    all_module_tokens = {}
-    if len(module_source_paths) > 0:
-        for module_source_path in module_source_paths:
-            module_name = os.path.basename(module_source_path).split(".")[0]
+        # Hashes of imported modules are part of the key of later stages, a module removed since the tokens were
+        # cached is reported by lexing the source again
+        module_hashes = None
+        if cached is not None:
+            tokens, table, module_source_paths = cached
+            try:
+                module_hashes = [hash_file(path) for path in module_source_paths]
+            except OSError:
+                cached = None
 
-            lexical_analyzer.update_filename(module_source_path)
-            all_module_tokens[module_name], _ = lexical_analyzer.lexical_analyze()
+        if cached is None:
+            with stats.stage("lex") as stage:
+                tokens, table, module_source_paths = lex_source(
+                    filename, SymbolTable()
+                )
+                stage.tokens = len(tokens)
+                stage.symbols = len(table.symbol_table)
 
-            scope_resolver.swap_tokens_and_table(
-                tokens_list=all_module_tokens[module_name], table=table
-            )
-            all_module_tokens[module_name], table = scope_resolver.resolve_scope(
-                module_name=module_name
+            if cache is not None:
+                with stats.stage("store_lex"):
+                    cache.store("lex", lex_key, (tokens, table, module_source_paths))
+
+        # Modules and parsing additionally depend on the set of imported modules and their source code
+        front_end_key = None
+        cached = None
+        if cache is not None:
+            if module_hashes is None:
+                try:
+                    module_hashes = [hash_file(path) for path in module_source_paths]
+                except OSError as exception:
+                    error("Module %s could not be read" % exception.filename, -1)
+
+            with stats.stage("load_front_end"):
+                front_end_key = cache.key(
+                    "front_end", lex_key, *(module_source_paths + module_hashes)
+                )
+                cached = cache.load("front_end", front_end_key)
+
+        if cached is not None:
+            tokens, all_module_tokens, table, op_codes, all_module_opcodes = cached
+        else:
+            # Get tokens and opcodes for modules, symbol tables of modules are linked into the one of source code
+            all_module_tokens, all_module_opcodes = front_end_modules(
+                module_source_paths, table, collector, jobs=jobs, stats=stats
             )
 
-    # Option to check out tokens
-    if len(sys.argv) > 2 and sys.argv[2] == "token":
-        # Print source code tokens
-        for token in tokens:
-            print(token)
+            # Option to check out tokens
+            if debug_option == "token":
+                # Print source code tokens
+                for token in tokens:
+                    print(token)
 
-        # Print module tokens
-        for module_name, module_tokens in all_module_tokens.items():
-            print("\n---Tokens for module " + module_name + "---")
-            for token in module_tokens:
-                print(token)
+                # Print module tokens
+                for module_name, module_tokens in all_module_tokens.items():
+                    print("\n---Tokens for module " + module_name + "---")
+                    for token in module_tokens:
+                        print(token)
 
-    # Option to check symbol table after lexical analysis
-    if len(sys.argv) > 2 and sys.argv[2] == "table_after_lexing":
-        # print(table)
-        pretty_printer.pprint(table.symbol_table)
+            # Option to check symbol table after lexical analysis
+            if debug_option == "table_after_lexing":
+                # print(table)
+                pretty_printer.pprint(table.symbol_table)
 
-    # Parse the modules first as these function definitions will be important during source parsing
-    all_module_opcodes = {}
+            # Get opcodes for source code from parser
+            with stats.stage("parse") as stage:
+                op_codes = parse(tokens, table)
+                stage.opcodes = len(op_codes)
+                stage.symbols = len(table.symbol_table)
+
+            if front_end_key is not None:
+                with stats.stage("store_front_end"):
+                    cache.store(
+                        "front_end",
+                        front_end_key,
+                        (
+                            tokens,
+                            all_module_tokens,
+                            table,
+                            op_codes,
+                            all_module_opcodes,
+                        ),
+                    )
+
+        # Remove opcodes of unused functions, structures and globals from modules
+        with stats.stage("prune", "all") as stage:
+            all_module_opcodes_pruned = prune_unreachable(op_codes, all_module_opcodes)
+            stage.opcodes = sum(map(len, all_module_opcodes_pruned.values()))
+
+        # Option to check out opcodes
+        if debug_option == "opcode":
+            # Print source code opcodes
+            for op_code in op_codes:
+                print(op_code)
 
-    for module_name, module_tokens in all_module_tokens.items():
-        all_module_opcodes[module_name] = parse(module_tokens, table)
+            # Print module opcodes
+            for module_name, module_opcodes in all_module_opcodes_pruned.items():
+                print("\n---OpCodes for module " + module_name + "---")
+                for op_code in module_opcodes:
+                    print(op_code)
 
-    # Get opcodes for source code from parser
-    op_codes = parse(tokens, table)
+        # Option to check symbol table after parsing
+        if debug_option == "table_after_parsing":
+            # print(table)
+            pretty_printer.pprint(table.symbol_table)
 
-    # Remove opcodes of unused functions from modules
-    all_module_opcodes_pruned = {}
-    for module_name, module_opcodes in all_module_opcodes.items():
-        all_module_opcodes_pruned[module_name] = []
-        i = 0
+        # Compile to C code
+        with stats.stage("compile") as stage:
+            compile(op_codes, c_filename, table)
+            stage.opcodes = len(op_codes)
 
-        # Loops through all the opcodes of specific module and checks for functions which weren't called from source code
-        while i < len(module_opcodes):
-            if module_opcodes[i].type == "func_decl":
-                func_name = module_opcodes[i].val.split("---")[0].strip()
-                func_symbol_table_val = table.symbol_table.get(
-                    table.get_by_symbol(func_name)
+        # Compile the module functions, this can be done in any order
+        for module_name, module_opcodes in all_module_opcodes_pruned.items():
+            with stats.stage("compile", module_name) as stage:
+                for module_c_filename, backend in module_files(
+                    module_name, module_opcodes, table, separate or link
+                ):
+                    compile(module_opcodes, module_c_filename, table, backend)
+                stage.opcodes = len(module_opcodes)
+
+        if link:
+            with stats.stage("cc", "all"):
+                link_modules(
+                    c_filename,
+                    list(all_module_opcodes_pruned),
+                    cache if cache is not None or not use_cache else BuildCache(),
+                    cflags,
+                    graph_path,
                 )
-                func_ret_type = func_symbol_table_val[1]
-
-                # Skip all functions whose return type is not_known meaning they weren't called
-                if func_ret_type == "not_known" or type(func_ret_type) == list:
-                    beg_idx = i
-                    while module_opcodes[i].type != "scope_over":
-                        i += 1
-                else:
-                    all_module_opcodes_pruned[module_name].append(module_opcodes[i])
-            else:
-                all_module_opcodes_pruned[module_name].append(module_opcodes[i])
-            i += 1
-
-    # Option to check out opcodes
-    if len(sys.argv) > 2 and sys.argv[2] == "opcode":
-        # Print source code opcodes
-        for op_code in op_codes:
-            print(op_code)
-
-        # Print module opcodes
+
+        return c_filename
+
+
+class CompileResult:
+    """
+    CompileResult class stores the C code generated by compile_string
+    """
+
+    __slots__ = (
+        "c_code",
+        "headers",
+        "tokens",
+        "module_tokens",
+        "op_codes",
+        "module_opcodes",
+        "table",
+    )
+
+    def __init__(
+        self,
+        c_code,
+        headers,
+        tokens=None,
+        module_tokens=None,
+        op_codes=None,
+        module_opcodes=None,
+        table=None,
+    ):
+        """
+        Class initializer
+
+        Params
+        ======
+        c_code         (string)      = Generated C code of source
+        headers        (dict)        = Header filename (<module name>.h) -> generated C code of module, C files of
+                                       modules (<module name>.c) are part of it if they are compiled separately
+        tokens         (list)        = Tokens of source code
+        module_tokens  (dict)        = Module name -> tokens of module
+        op_codes       (list)        = Opcodes of source code
+        module_opcodes (dict)        = Module name -> opcodes of module (without unused functions)
+        table          (SymbolTable) = Symbol table after compilation
+        """
+
+        self.c_code = c_code
+        self.headers = headers
+        self.tokens = tokens
+        self.module_tokens = module_tokens
+        self.op_codes = op_codes
+        self.module_opcodes = module_opcodes
+        self.table = table
+
+
+def compile_string(
+    source,
+    modules=None,
+    filename="main.simc",
+    keep_state=False,
+    separate=False,
+    stats=None,
+    module_cache=None,
+):
+    """
+    Compile sim-C source code to C in memory, nothing is read from or written to disk except installed modules
+
+    Params
+    ======
+    source       (string)       = sim-C source code
+    modules      (dict)         = Module name -> sim-C source code, these are used for imports before installed
+                                  modules
+    filename     (string)       = Name of source file used in diagnostics
+    keep_state   (bool)         = Whether tokens, opcodes and the symbol table should be part of result
+    separate     (bool)         = Whether modules are compiled separately, to a C file and a header with
+                                  declarations
+    stats        (CompileStats) = Stats to which time, sizes and memory of every stage are added
+    module_cache (object)       = Cache of results of front end of modules (see module_front_ends), None to
+                                  always run the front end
+
+    Returns
+    =======
+    CompileResult: The generated C code (and compiler state if asked for)
+    """
+
+    if stats is None:
+        stats = CompileStats()
+
+    with collecting(filename) as collector, stats:
+        with stats.stage("lex") as stage:
+            tokens, table, module_source_paths = lex_source(
+                filename, SymbolTable(), source_code=source, module_sources=modules
+            )
+            stage.tokens = len(tokens)
+            stage.symbols = len(table.symbol_table)
+
+        all_module_tokens, all_module_opcodes = front_end_modules(
+            module_source_paths,
+            table,
+            collector,
+            module_sources=modules,
+            stats=stats,
+            cache=module_cache,
+        )
+
+        with stats.stage("parse") as stage:
+            op_codes = parse(tokens, table)
+            stage.opcodes = len(op_codes)
+            stage.symbols = len(table.symbol_table)
+
+        with stats.stage("prune", "all") as stage:
+            all_module_opcodes_pruned = prune_unreachable(op_codes, all_module_opcodes)
+            stage.opcodes = sum(map(len, all_module_opcodes_pruned.values()))
+
+        with stats.stage("compile") as stage:
+            c_code = generate_code(op_codes, table)
+            stage.opcodes = len(op_codes)
+
+        headers = {}
         for module_name, module_opcodes in all_module_opcodes_pruned.items():
-            print("\n---OpCodes for module " + module_name + "---")
-            for op_code in module_opcodes:
-                print(op_code)
+            with stats.stage("compile", module_name) as stage:
+                for module_c_filename, backend in module_files(
+                    module_name, module_opcodes, table, separate
+                ):
+                    headers[module_c_filename] = generate_code(
+                        module_opcodes, table, backend
+                    )
+                stage.opcodes = len(module_opcodes)
+
+    if not keep_state:
+        return CompileResult(c_code, headers)
+
+    return CompileResult(
+        c_code,
+        headers,
+        tokens,
+        all_module_tokens,
+        op_codes,
+        all_module_opcodes_pruned,
+        table,
+    )
+
+
+def collect_source_files(paths):
+    """
+    Returns sim-C source files given a list of files and directories, directories are searched recursively
+
+    Params
+    ======
+    paths (list) = Paths of files and directories
+
+    Returns
+    =======
+    list: Paths of sim-C source files
+    """
+
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(".simc"):
+                        filenames.append(os.path.join(root, name))
+        else:
+            filenames.append(path)
+
+    return filenames
+
+
+def build_file(filename, use_cache=True, link=False, cflags=None):
+    """
+    Compile a single file of a batch build, errors are returned instead of exiting so one file can't stop the batch
+
+    Params
+    ======
+    filename  (string) = Path of sim-C source file
+    use_cache (bool)   = Whether the build cache should be used
+    link      (bool)   = Whether the program is compiled and linked to an executable
+    cflags    (list)   = Flags of C compiler used when linking
+
+    Returns
+    =======
+    tuple: Path of source file, whether compilation succeeded and the output (error message) of compiler
+    """
 
-    # Option to check symbol table after parsing
-    if len(sys.argv) > 2 and sys.argv[2] == "table_after_parsing":
-        # print(table)
-        pretty_printer.pprint(table.symbol_table)
+    output = io.StringIO()
+    succeeded = False
 
-    # Compile to C code
-    compile(op_codes, c_filename, table)
+    with redirect_stdout(output):
+        try:
+            compile_file(filename, use_cache=use_cache, link=link, cflags=cflags)
+            succeeded = True
+        except CompileError as compile_error:
+            print_diagnostics(compile_error.diagnostics)
+        except Exception:
+            import traceback
 
-    # Compile the module functions, this can be done in any order
-    for module_name, module_opcodes in all_module_opcodes_pruned.items():
-        module_c_filename = module_name + ".h"
+            traceback.print_exc(file=output)
 
-        compile(module_opcodes, module_c_filename, table)
+    return filename, succeeded, output.getvalue().strip()
 
-    print("\033[92mC code generated at %s!" % c_filename, end="")
+
+def build(args):
+    """
+    Compile many files in one process (or a pool of processes), usage:
+    simc build <files|dirs...> [-j N] [--no-cache] [--exe [-O LEVEL] [--cflags FLAGS]]
+
+    Params
+    ======
+    args (list) = Command line arguments after build
+    """
+
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+
+    arg_parser = argparse.ArgumentParser(
+        prog="simc build", description="Compile many sim-C files at once"
+    )
+    arg_parser.add_argument("paths", nargs="+", help="sim-C files or directories")
+    arg_parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Number of processes"
+    )
+    arg_parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use the build cache"
+    )
+    arg_parser.add_argument(
+        "--exe",
+        action="store_true",
+        help="Compile and link an executable next to every C file",
+    )
+    add_cflags_arguments(arg_parser)
+    options = arg_parser.parse_args(args)
+
+    filenames = collect_source_files(options.paths)
+    use_cache = not options.no_cache
+    cflags = cflags_of(options) if options.exe else None
+    jobs = max(1, min(options.jobs, len(filenames)))
+
+    start_time = time.perf_counter()
+
+    # Results are reported in the order of files, whichever process compiled them
+    if jobs == 1:
+        results = (
+            build_file(filename, use_cache, options.exe, cflags)
+            for filename in filenames
+        )
+        failed = report_build_results(results)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(
+                build_file,
+                filenames,
+                [use_cache] * len(filenames),
+                [options.exe] * len(filenames),
+                [cflags] * len(filenames),
+                chunksize=4,
+            )
+            failed = report_build_results(results)
+
+    elapsed = time.perf_counter() - start_time
+    files_per_sec = len(filenames) / elapsed if elapsed > 0 else 0.0
+
+    color = "\033[91m" if failed > 0 else "\033[92m"
+    print(
+        "%sCompiled %d of %d files in %.2fs (%.1f files/sec)"
+        % (color, len(filenames) - failed, len(filenames), elapsed, files_per_sec),
+        end="",
+    )
     print(" \033[m")
+
+    if failed > 0:
+        sys.exit(1)
+
+
+def add_cflags_arguments(arg_parser):
+    """
+    Add the options choosing flags of C compiler to a parser of command line arguments
+
+    Params
+    ======
+    arg_parser (argparse.ArgumentParser) = Parser of command line arguments
+    """
+
+    arg_parser.add_argument(
+        "-O",
+        dest="optimization",
+        default="2",
+        choices=["0", "1", "2", "3", "s", "g", "fast"],
+        help="Optimization level of C compiler (default: 2)",
+    )
+    arg_parser.add_argument(
+        "--cflags",
+        default="",
+        help="Additional flags of C compiler, like --cflags='-march=native -g'",
+    )
+
+
+def cflags_of(options):
+    """
+    Returns flags of C compiler chosen by the options added by add_cflags_arguments
+
+    Params
+    ======
+    options (argparse.Namespace) = Parsed command line arguments
+
+    Returns
+    =======
+    list: Flags of C compiler
+    """
+
+    import shlex
+
+    return ["-O" + options.optimization] + shlex.split(options.cflags)
+
+
+def run_program(args):
+    """
+    Compile a program to an executable and run it, usage:
+    simc run <file> [-O LEVEL] [--cflags FLAGS] [--graph PATH] [--no-cache] [-- program arguments...]
+
+    The program exits with the exit status of executable, which is reused from the build cache when the generated
+    code, headers, flags and C compiler didn't change
+
+    Params
+    ======
+    args (list) = Command line arguments after run
+    """
+
+    import argparse
+
+    # Arguments after -- are passed to the program
+    program_args = []
+    if "--" in args:
+        index = args.index("--")
+        args, program_args = args[:index], args[index + 1 :]
+
+    arg_parser = argparse.ArgumentParser(
+        prog="simc run", description="Compile and run a sim-C program"
+    )
+    arg_parser.add_argument("filename", help="sim-C file")
+    add_cflags_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--graph",
+        help="Write the dependency graph of executable as a ninja file (.ninja) "
+        "or a Makefile",
+    )
+    arg_parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use the build cache"
+    )
+    options = arg_parser.parse_args(args)
+
+    try:
+        c_filename = compile_file(
+            options.filename,
+            use_cache=not options.no_cache,
+            link=True,
+            jobs=os.cpu_count() or 1,
+            cflags=cflags_of(options),
+            graph_path=options.graph,
+        )
+    except CompileError as compile_error:
+        exit_with_diagnostics(compile_error)
+
+    import subprocess
+
+    exe_filename = os.path.abspath(os.path.splitext(c_filename)[0])
+    sys.exit(subprocess.call([exe_filename] + program_args))
+
+
+def report_build_results(results):
+    """
+    Print errors of files which could not be compiled
+
+    Params
+    ======
+    results (iterable) = Results returned by build_file
+
+    Returns
+    =======
+    int: Number of files which could not be compiled
+    """
+
+    failed = 0
+    for filename, succeeded, output in results:
+        if not succeeded:
+            failed += 1
+            print("%s:" % filename)
+            print(output)
+
+    return failed
+
+
+def cache_command(args):
+    """
+    Show or clear the build cache, usage: simc cache [info|clear]
+
+    The cache is kept under its size limit (see build_cache.CACHE_SIZE_LIMIT) by removing the entries used least
+    recently, clearing it removes every entry
+
+    Params
+    ======
+    args (list) = Command line arguments after cache
+    """
+
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog="simc cache", description="Show or clear the build cache"
+    )
+    arg_parser.add_argument(
+        "action", nargs="?", default="info", choices=["info", "clear"]
+    )
+    options = arg_parser.parse_args(args)
+
+    cache = BuildCache()
+    if options.action == "clear":
+        removed = cache.clear()
+        print(
+            "\033[92mRemoved %d entries from %s" % (removed, cache.cache_dir), end=""
+        )
+        print(" \033[m")
+    else:
+        entries = cache.entries()
+        size_mib = sum(entry_size for _, entry_size, _ in entries) / 2 ** 20
+        limit_mib = cache.size_limit / 2 ** 20
+        print(
+            "%s: %d entries, %.1f MiB of %.1f MiB"
+            % (cache.cache_dir, len(entries), size_mib, limit_mib)
+        )
+
+
+def compile_with_server(filename):
+    """
+    Compile a sim-C source file using the running compile server (simc serve), generated files are written
+    the same way as compile_file
+
+    Params
+    ======
+    filename (string) = Path of sim-C source file
+
+    Returns
+    =======
+    string: Path of generated C file, None if the server is not running
+    """
+
+    # Imported here as the server module depends on this module
+    from .server import request_compile
+
+    # Check if extension of file is correct or not
+    if os.path.splitext(filename)[1] != ".simc":
+        error("Incorrect file extension", -1)
+
+    if not os.path.isfile(filename):
+        error("File %s not found" % filename, -1)
+
+    with open(filename, "r") as file:
+        source = file.read()
+
+    response = request_compile({"source": source, "filename": filename})
+    if response is None:
+        return None
+
+    if not response["ok"]:
+        raise CompileError(
+            [Diagnostic(**diagnostic) for diagnostic in response["diagnostics"]]
+        )
+
+    c_filename = os.path.splitext(filename)[0] + ".c"
+    write_code(response["c_code"], c_filename)
+
+    # Module headers are generated in the current working directory
+    for header_filename, header_code in response["headers"].items():
+        write_code(header_code, header_filename)
+
+    return c_filename
+
+
+def option_value(args, name):
+    """
+    Remove an option taking a value (like --trace out.json) from command line arguments
+
+    Params
+    ======
+    args (list)   = Command line arguments, the option and its value are removed from it
+    name (string) = Name of option
+
+    Returns
+    =======
+    string: Value of option, None if the option is not given
+    """
+
+    if name not in args:
+        return None
+
+    index = args.index(name)
+    if index + 1 >= len(args):
+        error("Option %s needs a file path" % name, -1)
+
+    value = args[index + 1]
+    del args[index : index + 2]
+
+    return value
+
+
+def run():
+    # Batch mode compiling many files at once
+    if len(sys.argv) >= 2 and sys.argv[1] == "build":
+        build(sys.argv[2:])
+        return
+
+    # Compile a program to an executable and run it
+    if len(sys.argv) >= 2 and sys.argv[1] == "run":
+        run_program(sys.argv[2:])
+        return
+
+    # Show or clear the build cache
+    if len(sys.argv) >= 2 and sys.argv[1] == "cache":
+        cache_command(sys.argv[2:])
+        return
+
+    # Compile server answering requests from editors or simc --client
+    if len(sys.argv) >= 2 and sys.argv[1] == "serve":
+        from .server import serve
+
+        serve(sys.argv[2:])
+        return
+
+    # Option to forward compilation to the compile server if it is running
+    use_server = "--client" in sys.argv
+    if use_server:
+        sys.argv.remove("--client")
+
+    # Option to disable the build cache
+    use_cache = "--no-cache" not in sys.argv
+    if not use_cache:
+        sys.argv.remove("--no-cache")
+
+    # Option to compile modules separately to C files and headers with declarations only
+    separate = "--separate" in sys.argv
+    if separate:
+        sys.argv.remove("--separate")
+
+    # Option to compile modules to (cached) object files and link an executable
+    link = "--link" in sys.argv
+    if link:
+        sys.argv.remove("--link")
+
+    # Option to print time, sizes and peak memory of every stage as a table (or JSON with --timings=json),
+    # memory is only traced with --memory as it slows down compilation
+    timings = None
+    for arg in sys.argv[1:]:
+        if arg in ["--timings", "--timings=table", "--timings=json"]:
+            timings = arg.partition("=")[2] or "table"
+            sys.argv.remove(arg)
+            break
+
+    trace_memory = "--memory" in sys.argv
+    if trace_memory:
+        sys.argv.remove("--memory")
+        timings = timings or "table"
+
+    stats = CompileStats(trace_memory)
+
+    try:
+        # Options to write a Chrome trace of stages, statements and functions, cProfile stats and collapsed
+        # stacks for flamegraph tools
+        trace_path = option_value(sys.argv, "--trace")
+        cprofile_path = option_value(sys.argv, "--cprofile")
+        collapsed_path = option_value(sys.argv, "--collapsed")
+        profiling = trace_path or cprofile_path or collapsed_path
+
+        # Every stage runs while profiling, stages loaded from the build cache would leave lexing and parsing
+        # out of the profile (like for debug options)
+        if profiling:
+            use_cache = False
+
+        # Check if filepath is provided or not
+        if len(sys.argv) < 2:
+            error("Please provide simc file path", -1)
+
+        debug_option = sys.argv[2] if len(sys.argv) > 2 else None
+
+        c_filename = None
+        if use_server and debug_option is None and not (
+            separate or link or timings or profiling
+        ):
+            c_filename = compile_with_server(sys.argv[1])
+
+        # Compile in this process if the server is not running
+        # Modules are compiled in this process while profiling so that all of the work is profiled
+        if c_filename is None:
+            with profiled(trace_path, cprofile_path, collapsed_path):
+                c_filename = compile_file(
+                    sys.argv[1],
+                    debug_option,
+                    use_cache,
+                    separate,
+                    link,
+                    jobs=1 if profiling else os.cpu_count() or 1,
+                    stats=stats,
+                )
+    except CompileError as compile_error:
+        exit_with_diagnostics(compile_error)
+
+    # Stats in JSON are the only output on stdout so that they can be parsed
+    banner_file = sys.stderr if timings == "json" else sys.stdout
+
+    print("\033[92mC code generated at %s!" % c_filename, end="", file=banner_file)
+    print(" \033[m", file=banner_file)
+
+    if link:
+        print(
+            "\033[92mExecutable generated at %s!" % os.path.splitext(c_filename)[0],
+            end="",
+            file=banner_file,
+        )
+        print(" \033[m", file=banner_file)
+
+    if timings == "json":
+        print(stats.to_json())
+    elif timings == "table":
+        print(stats.format_table())
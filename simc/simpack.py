@@ -1,12 +1,11 @@
 # simpack (short for simC Packages) is the official package manager for simC
 
-# Import libraries
-import requests
+# Import libraries, requests is imported when a package is fetched as it is slow to import
 import argparse
 import os
 
-# Import error from global helpers
-from .global_helpers import error
+# Module for reporting errors
+from .diagnostics import CompileError, Diagnostic, exit_with_diagnostics
 
 
 def get_package():
@@ -36,7 +35,11 @@ def get_package():
 
     # If the package is not listed in package-index then throw an error
     if requested_link == "Unknown":
-        error("Unable to find package with name " + requested_name, -1)
+        exit_with_diagnostics(
+            CompileError(
+                Diagnostic("Unable to find package with name " + str(requested_name))
+            )
+        )
 
     # All modules go inside modules directory in local simc installation
     module_dir = os.path.join(simc_path, "modules")
@@ -53,6 +56,9 @@ def get_package():
     # Otherwise fetch the simc module from the corresponding link
     else:
         print("Fetching package " + requested_name + " from " + requested_link)
+
+        import requests
+
         r = requests.get(requested_link)
 
         # Dump module code into modules/<module-name>.simc
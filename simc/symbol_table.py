@@ -1,16 +1,174 @@
+# Module for binary search over sorted symbol ids
+from bisect import bisect_left
+
+# Module for constraints between types which are inferred after parsing
+from .type_inference import TypeGraph
+
+
+# Positions of the columns of a symbol table row
+VALUE, TYPE, TYPEDATA, DEPENDENCY, SCOPE = range(5)
+
+
+class SymbolEntry:
+    """
+    SymbolEntry class is a row of symbol table, dependencies, function parameters and struct members are kept in
+    lists instead of strings
+
+    For existing callers an entry still behaves like the row [value, type, typedata, dependency, scope], the
+    typedata of a function is rendered as "function---param1---param2&&&default_id" and dependencies (followed
+    by struct members) as "-id-id"
+    """
+
+    __slots__ = (
+        "value",
+        "type",
+        "typedata",
+        "dependencies",
+        "params",
+        "param_ids",
+        "members",
+        "scope",
+    )
+
+    def __init__(self, value, type, typedata, dependencies=None, scope=""):
+        """
+        Class initializer
+
+        Params
+        ======
+        value        (string) = Value of symbol (identifier/constant)
+        type         (string) = Datatype of symbol
+        typedata     (string) = Type of data (constant/variable/function)
+        dependencies (list)   = Ids of dependent variables
+        scope        (Scope)  = Scope in which identifier is declared, empty if it is not declared
+        """
+
+        self.value = value
+        self.type = type
+        self.typedata = typedata
+        self.dependencies = dependencies if dependencies is not None else []
+
+        # (name, default value id or None) of each parameter of a function, and the id of each parameter
+        self.params = []
+        self.param_ids = []
+
+        # Ids of variables declared inside a struct
+        self.members = []
+
+        self.scope = scope
+
+    def set_function(self, params, param_ids=()):
+        """
+        Mark the entry as a function definition
+
+        Params
+        ======
+        params    (list) = (name, default value id or None) of each parameter
+        param_ids (list) = Id of each parameter, parameters of functions may have the same names
+        """
+
+        self.typedata = "function"
+        self.params = list(params)
+        self.param_ids = list(param_ids)
+
+    def __render_typedata(self):
+        if self.typedata != "function":
+            return self.typedata
+
+        typedata = "function"
+        if self.params:
+            typedata += "---" + "---".join(name for name, _ in self.params)
+
+        default_ids = [str(default) for _, default in self.params if default is not None]
+        if default_ids:
+            typedata += "&&&" + "&&&".join(default_ids)
+
+        return typedata
+
+    def __render_dependency(self):
+        return "".join("-" + str(id) for id in self.dependencies + self.members)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += 5
+
+        if index == VALUE:
+            return self.value
+        elif index == TYPE:
+            return self.type
+        elif index == TYPEDATA:
+            return self.__render_typedata()
+        elif index == DEPENDENCY:
+            return self.__render_dependency()
+        elif index == SCOPE:
+            return self.scope
+
+        raise IndexError("symbol table entry index out of range")
+
+    def __setitem__(self, index, item):
+        if index < 0:
+            index += 5
+
+        if index == VALUE:
+            self.value = item
+        elif index == TYPE:
+            self.type = item
+        elif index == TYPEDATA:
+            self.typedata = item
+        elif index == DEPENDENCY:
+            # A dependency string replaces the dependencies, and struct members which are rendered with them
+            self.dependencies = [int(id) for id in item.split("-") if id != ""]
+            self.members = []
+        elif index == SCOPE:
+            self.scope = item
+        else:
+            raise IndexError("symbol table entry index out of range")
+
+    def __len__(self):
+        return 5
+
+    def __iter__(self):
+        return iter([self[index] for index in range(5)])
+
+    def __repr__(self):
+        """
+        String representation of SymbolEntry
+
+        Returns
+        =======
+        string: The representation of the row [value, type, typedata, dependency, scope]
+        """
+
+        return repr(list(self))
+
+
 class SymbolTable:
     """
     SymbolTable class is responsible for storing information about identifiers and constants
     """
 
-    def __init__(self):
+    def __init__(self, intern_constants=True):
         """
         Initializer of SymbolTable class
+
+        Params
+        ======
+        intern_constants (bool) = Whether repeated constants should share one entry or not
         """
 
         self.id = 1
         self.symbol_table = {}
 
+        # Secondary index, symbol value -> ids in increasing order
+        self.symbol_ids = {}
+
+        # Interned constants, (value, type, "constant") -> id
+        self.intern_constants = intern_constants
+        self.constants = {}
+
+        # Constraints between types which could not be inferred while parsing
+        self.type_graph = TypeGraph()
+
     def __str__(self):
         """
         String representation of SymbolTable
@@ -24,7 +182,7 @@ class SymbolTable:
 
         # Maximum length when all strings in the lists are compared
         max_length = max(
-            [len(i) for dict_list in table_dict.values() for i in dict_list]
+            [len(str(i)) for dict_list in table_dict.values() for i in dict_list]
         )
 
         table_string = ""
@@ -47,9 +205,9 @@ class SymbolTable:
 
             for j in range(len(dict_list)):
 
-                line += dict_list[j]
+                line += str(dict_list[j])
                 if j < len(dict_list) - 2:  # To add space between columns
-                    line += " " * (max_length - len(dict_list[j]) + 2)
+                    line += " " * (max_length - len(str(dict_list[j])) + 2)
 
             line_lengths.append(len(line))
             table_string += line + "\n"
@@ -76,20 +234,38 @@ class SymbolTable:
         """
         Returns id in symbol table after making an entry
 
+        If constant interning is switched on then a constant which is already present in the table
+        is not entered again, the id of the existing entry is returned instead
+
         Params
         ======
         value      (string) = Value to be stored in symbol table (identifier/constant)
         type       (string) = Datatype of symbol
         typedata   (string) = Type of data (constant/variable)
-        dependency (string) = List of token ids of dependent variables
-        scope      (string) = Scope of entry
+        dependency (string) = Token ids of dependent variables, in format "-id-id"
+        scope      (Scope)  = Scope in which identifier is declared, empty if it is not declared
 
         Returns
         =======
         int: The id of the current entry in symbol table
         """
 
-        self.symbol_table[self.id] = [value, type, typedata, dependency, scope]
+        # Return the existing entry for a repeated constant
+        if self.intern_constants and typedata == "constant":
+            key = (value, type, typedata)
+            if key in self.constants:
+                return self.constants[key]
+
+            self.constants[key] = self.id
+
+        dependencies = [int(id) for id in dependency.split("-") if id != ""]
+        self.symbol_table[self.id] = SymbolEntry(
+            value, type, typedata, dependencies, scope
+        )
+
+        # Ids are handed out in increasing order, so appending keeps the list sorted
+        self.symbol_ids.setdefault(value, []).append(self.id)
+
         self.id += 1
         return self.id - 1
 
@@ -103,7 +279,7 @@ class SymbolTable:
 
         Returns
         =======
-        list: Table entry
+        SymbolEntry: Table entry, a list of None if there is no entry with the id
         """
 
         return self.symbol_table.get(id, [None, None, None, None, None])
@@ -114,65 +290,32 @@ class SymbolTable:
 
         Params
         ======
-        value          (string) = Value to be searched in the symbol table
-        consider_scope (bool)   = Should consider scope or not while getting by symbol
-        current_scope  (string) = If scope is to be considered then which scope is to be searched for
+        value           (string) = Value to be searched in the symbol table
+        id_greater_than (int)    = If given then only ids greater than or equal to this are searched
 
         Returns
         =======
         int: The unique id of the entry in symbol table
         """
 
-        id = -1
-        for ids, value_list in self.symbol_table.items():
-            if value_list[0] == value:
-                if id_greater_than == None:
-                    return ids
-                else:
-                    if ids < id_greater_than:
-                        continue
-                    else:
-                        return ids
+        ids = self.symbol_ids.get(value)
+        if not ids:
+            return -1
 
-        return id
+        if id_greater_than == None:
+            return ids[0]
 
-    def resolve_scope_for_id(self, token, module_name):
-        min_distance = None
-        min_id = None
+        # Find the first id which is not less than id_greater_than
+        idx = bisect_left(ids, id_greater_than)
 
-        token_line_num = token.line_num
-        token_symbol = self.get_by_id(token.val)[0]
-
-        for id_, value_list in self.symbol_table.items():
-            if value_list[0] == token_symbol and "-" in value_list[-1]:
-                (
-                    scope_start_line_num,
-                    scope_end_line_num,
-                    scope_module_name,
-                ) = value_list[-1].split("-")
-
-                if scope_module_name != module_name:
-                    continue
-
-                distance_line_num = token_line_num - int(scope_start_line_num)
-                if distance_line_num < 0:
-                    continue
-
-                if min_distance == None or (
-                    distance_line_num < min_distance
-                    and token_line_num < int(scope_end_line_num)
-                ):
-                    min_distance = distance_line_num
-                    min_id = id_
-
-        return min_id
+        return ids[idx] if idx < len(ids) else -1
 
     def add_dependency(self, var_father_id, var_child_id):
         """
         Adds a relation of dependecy beetween two variables
 
         It is used when the variable is assigned to other varible before it is type had been defined
-        When the type of the varible is discovered, use the function resolve_dependency to update the child variables
+        When types are inferred after parsing, the type of parent variable is given to the child variables
 
         Params
         ======
@@ -180,67 +323,4 @@ class SymbolTable:
         var_child_id  (int) = ID of child identifier in SymbolTable
         """
 
-        # Add the variable to list in the expression:: "<-ID>"
-        self.symbol_table[var_father_id][3] += "-" + str(var_child_id)
-
-    def resolve_dependency(self, tokens, i, var_id):
-        """
-        Resolves the dependency relation between variables
-
-        This is a recursive function, it is used when the parser discovers the type of a varible which has been
-        assign to another one, then the type of the assigned one dependes on this
-
-        Params
-        ======
-        tokens (list) = List of tokens
-        i      (int)  = Current index in token
-        var_id (int)  = ID in Symbol table where the function will look at for child dependencies
-
-        Returns
-        =======
-        bool: Whether it is possible to resolve the dependency or not
-        """
-        # Extract the type of variable and the list of variable which dependies on it
-        _, type_, _, list_dependency, _ = self.symbol_table[var_id]
-
-        # Nothing to do
-        if type_ == "var":
-            return
-
-        # Clear the dependencies
-        self.symbol_table[var_id][3] = ""
-
-        # Split the list "ID-ID-...-ID" => ['ID', 'ID', ..., 'ID']
-        list_dependency = [
-            int(child_var_id)
-            for child_var_id in list_dependency.split("-")
-            if child_var_id != ""
-        ]
-
-        is_allowed = True
-
-        # For each child variable assign the new type and check up for its dependencies.
-        for var_child_id in list_dependency:
-
-            if is_allowed is False:
-                break
-
-            # Extract the current type of child variable
-            child_type = self.symbol_table[var_child_id][1]
-
-            # If the type is not defined
-            if child_type == "declared":
-                if type_ == "string":
-                    type_ = "char*"
-                self.symbol_table[var_child_id][1] = type_
-                is_allowed = self.resolve_dependency(tokens, i, var_child_id)
-
-            # If the type is defined, it cannot downgrade
-            elif child_type > type_:
-                self.symbol_table[var_child_id][1] = type_
-
-            # If the type is defined and the type of child is greater or equal than the father
-            elif child_type < type_:
-                is_allowed = False
-
-        return is_allowed
+        self.symbol_table[var_father_id].dependencies.append(var_child_id)
@@ -0,0 +1,1077 @@
+# Module to import OpCode class and kinds of opcodes
+from .op_code import OpCode, OPCODE_KINDS
+
+# Names of C math constants and functions which require math.h
+MATH_NAMES = ["M_PI", "M_E", "INFINITY", "NAN"]
+
+
+class Expr:
+    """
+    Expr class is the base class of nodes of expressions, every node renders itself to C code
+
+    Leaf nodes override render(), nodes containing other nodes return their C code as a list of strings and
+    child nodes from pieces(), which is rendered with a stack so that deeply nested expressions don't hit the
+    recursion limit
+    """
+
+    __slots__ = ()
+
+    def pieces(self):
+        """
+        Returns the C code of node as strings and child nodes in order, None for leaf nodes
+
+        Returns
+        =======
+        list: Strings and child nodes of expression
+        """
+
+        return None
+
+    def render(self):
+        """
+        Returns C code of expression
+
+        Returns
+        =======
+        string: The C code of expression
+        """
+
+        code = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                code.append(node)
+                continue
+
+            pieces = node.pieces()
+            if pieces is None:
+                code.append(node.render())
+            else:
+                stack.extend(reversed(pieces))
+
+        return "".join(code)
+
+    def children(self):
+        """
+        Returns the nodes directly contained in this node
+
+        Returns
+        =======
+        list: Child nodes of expression
+        """
+
+        pieces = self.pieces()
+        if pieces is None:
+            return []
+
+        return [piece for piece in pieces if not isinstance(piece, str)]
+
+    def walk(self):
+        """
+        Yields this node and all the nodes contained in it, nested expressions don't use recursion
+
+        Returns
+        =======
+        generator: Nodes of expression
+        """
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+
+            pieces = node.pieces()
+            if pieces:
+                stack.extend(
+                    piece for piece in reversed(pieces) if not isinstance(piece, str)
+                )
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.render())
+
+
+class Name(Expr):
+    """
+    Name class is an identifier used in an expression
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def render(self):
+        return self.name
+
+
+class Constant(Expr):
+    """
+    Constant class is a number, character, boolean or string constant in C
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def render(self):
+        return self.text
+
+
+class FormatString(Expr):
+    """
+    FormatString class is a string with variables in braces, it is converted to a format string followed by
+    the variables once the types of variables are known
+    """
+
+    __slots__ = ("text", "names", "converted")
+
+    def __init__(self, text, names, converted=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        text      (string) = String constant with variables in braces
+        names     (list)   = Names of variables in the string
+        converted (string) = Format string followed by the variables, None if types are not known yet
+        """
+
+        self.text = text
+        self.names = names
+        self.converted = converted
+
+    def render(self):
+        return self.converted if self.converted is not None else self.text
+
+
+class Operator(Expr):
+    """
+    Operator class is an operator or punctuation between the operands of an expression
+    """
+
+    __slots__ = ("symbol",)
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def render(self):
+        return self.symbol
+
+
+class Group(Expr):
+    """
+    Group class is a sequence of nodes, optionally enclosed in parentheses
+    """
+
+    __slots__ = ("parts", "paren")
+
+    def __init__(self, parts=None, paren=False):
+        """
+        Class initializer
+
+        Params
+        ======
+        parts (list) = Nodes of the sequence
+        paren (bool) = Whether the sequence is enclosed in parentheses
+        """
+
+        self.parts = parts if parts is not None else []
+        self.paren = paren
+
+    def pieces(self):
+        if self.paren:
+            return ["("] + self.parts + [")"]
+
+        return self.parts
+
+    def split(self, symbol):
+        """
+        Split the parts of sequence at an operator, like arguments at commas
+
+        Params
+        ======
+        symbol (string) = Operator to split at
+
+        Returns
+        =======
+        list: Groups between the operators
+        """
+
+        groups = [Group()]
+        for part in self.parts:
+            if isinstance(part, Operator) and part.symbol == symbol:
+                groups.append(Group())
+            else:
+                groups[-1].parts.append(part)
+
+        return groups
+
+
+class BinaryOp(Expr):
+    """
+    BinaryOp class is an operator applied to the expressions on its left and right
+    """
+
+    __slots__ = ("left", "operator", "right")
+
+    def __init__(self, left, operator, right):
+        """
+        Class initializer
+
+        Params
+        ======
+        left     (Expr)     = Left operand
+        operator (Operator) = Operator
+        right    (Expr)     = Right operand
+        """
+
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def pieces(self):
+        return [self.left, self.operator, self.right]
+
+
+class UnaryOp(Expr):
+    """
+    UnaryOp class is a prefix operator (like - or &) or a postfix operator (like ++) applied to an expression
+    """
+
+    __slots__ = ("operator", "operand", "postfix")
+
+    def __init__(self, operator, operand, postfix=False):
+        """
+        Class initializer
+
+        Params
+        ======
+        operator (Operator) = Operator
+        operand  (Expr)     = Operand
+        postfix  (bool)     = Whether the operator comes after the operand
+        """
+
+        self.operator = operator
+        self.operand = operand
+        self.postfix = postfix
+
+    def pieces(self):
+        if self.postfix:
+            return [self.operand, self.operator]
+
+        return [self.operator, self.operand]
+
+
+class Text(Expr):
+    """
+    Text class is C code which has no structure in the syntax tree
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def render(self):
+        return self.text
+
+
+class Call(Expr):
+    """
+    Call class is a function call
+    """
+
+    __slots__ = ("name", "args")
+
+    def __init__(self, name, args):
+        """
+        Class initializer
+
+        Params
+        ======
+        name (string) = Name of function
+        args (list)   = Expressions of arguments
+        """
+
+        self.name = name
+        self.args = args
+
+    def pieces(self):
+        pieces = [self.name + "("]
+        for arg in self.args:
+            pieces.extend([arg, ", "])
+        if self.args:
+            pieces.pop()
+        pieces.append(")")
+
+        return pieces
+
+
+class Index(Expr):
+    """
+    Index class is indexing of an array with a constant
+    """
+
+    __slots__ = ("name", "index")
+
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+    def render(self):
+        return self.name + "[" + self.index + "]"
+
+
+class Cast(Expr):
+    """
+    Cast class is an explicit type cast
+    """
+
+    __slots__ = ("ctype", "operand")
+
+    def __init__(self, ctype, operand):
+        self.ctype = ctype
+        self.operand = operand
+
+    def pieces(self):
+        return ["(" + self.ctype + ")", self.operand]
+
+
+class SizeOf(Expr):
+    """
+    SizeOf class is the sizeof operator
+    """
+
+    __slots__ = ("operand",)
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def pieces(self):
+        return ["sizeof", self.operand]
+
+
+class Power(Expr):
+    """
+    Power class is exponentiation, which is a call to pow in C
+    """
+
+    __slots__ = ("base", "exponent")
+
+    def __init__(self, base, exponent):
+        self.base = base
+        self.exponent = exponent
+
+    def pieces(self):
+        return ["pow(", self.base, ", ", self.exponent, ")"]
+
+
+class Input(Expr):
+    """
+    Input class is reading of a value from standard input with an optional prompt
+    """
+
+    __slots__ = ("prompt", "format")
+
+    def __init__(self, prompt, format):
+        """
+        Class initializer
+
+        Params
+        ======
+        prompt (string) = Message printed before reading the value
+        format (string) = Datatype of value (i, f, d, s or c)
+        """
+
+        self.prompt = prompt
+        self.format = format
+
+    def render(self):
+        return self.prompt + "---" + self.format
+
+
+def unwrap(expr):
+    """
+    Returns the expression inside the parentheses around an expression
+
+    Params
+    ======
+    expr (Expr) = Expression enclosed in parentheses
+
+    Returns
+    =======
+    Expr: The expression without the outermost parentheses
+    """
+
+    if isinstance(expr, Group) and len(expr.parts) == 1:
+        inner = expr.parts[0]
+        if isinstance(inner, Group) and inner.paren:
+            return Group(inner.parts)
+
+    # Expressions like (a) && (b) are only enclosed in parentheses as C code
+    return Text(expr.render()[1:-1])
+
+
+def uses_math(expr):
+    """
+    Check if an expression requires math.h to be included
+
+    Params
+    ======
+    expr (Expr) = Expression
+
+    Returns
+    =======
+    bool: Whether math.h is required or not
+    """
+
+    # Same as walk(), but strings of code are skipped without a generator, this runs for every expression
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            continue
+        if isinstance(node, Power):
+            return True
+        if isinstance(node, (Constant, Text)):
+            if node.text in MATH_NAMES:
+                return True
+            continue
+
+        pieces = node.pieces()
+        if pieces:
+            stack.extend(pieces)
+
+    return False
+
+
+class Statement:
+    """
+    Statement class is the base class of statements of syntax tree
+
+    The opcodes generated by parser are statements, the type, val and dtype of a statement are the same as the
+    string based opcodes of earlier versions so that they can still be printed and inspected
+    """
+
+    __slots__ = ("dtype",)
+
+    # Type of opcode of statement
+    opcode_type = None
+
+    @property
+    def kind(self):
+        """
+        Kind of opcode (OpCodeKind) of statement
+        """
+
+        return OPCODE_KINDS[self.type]
+
+    @property
+    def type(self):
+        """
+        Type of opcode of statement as string
+        """
+
+        return self.opcode_type
+
+    @property
+    def val(self):
+        """
+        Value of opcode of statement, the fields of statement joined with --- and &&&
+        """
+
+        return ""
+
+    def expressions(self):
+        """
+        Returns expressions contained in statement
+
+        Returns
+        =======
+        list: Expressions of statement
+        """
+
+        return []
+
+    def to_opcode(self):
+        """
+        Returns the string based opcode of statement
+
+        Returns
+        =======
+        OpCode: The opcode of statement
+        """
+
+        return OpCode(self.type, self.val, self.dtype)
+
+    def __str__(self):
+        return str(self.to_opcode())
+
+    def __eq__(self, other):
+        return (
+            self.type == other.type
+            and self.val == other.val
+            and self.dtype == other.dtype
+        )
+
+
+class Marker(Statement):
+    """
+    Marker class is a statement without any value like MAIN, scope_begin or break
+    """
+
+    __slots__ = ("marker",)
+
+    def __init__(self, marker, dtype=""):
+        """
+        Class initializer
+
+        Params
+        ======
+        marker (string) = Type of opcode of statement
+        dtype  (string) = Datatype of opcode
+        """
+
+        self.marker = marker
+        self.dtype = dtype
+
+    @property
+    def type(self):
+        return self.marker
+
+
+class Print(Statement):
+    """
+    Print class is a print statement
+    """
+
+    __slots__ = ("format", "value")
+    opcode_type = "print"
+
+    def __init__(self, format, value):
+        """
+        Class initializer
+
+        Params
+        ======
+        format (string) = Format string argument of printf, None if type of value is not known yet
+        value  (Expr)   = Expression to be printed
+        """
+
+        self.format = format
+        self.value = value
+        self.dtype = None
+
+    @property
+    def val(self):
+        if self.format is None:
+            return None
+
+        return self.format + self.value.render()
+
+    def expressions(self):
+        return [self.value]
+
+
+class Import(Statement):
+    """
+    Import class is an import statement
+    """
+
+    __slots__ = ("module",)
+    opcode_type = "import"
+
+    def __init__(self, module):
+        self.module = module
+        self.dtype = None
+
+    @property
+    def val(self):
+        return self.module
+
+
+class VarAssign(Statement):
+    """
+    VarAssign class is declaration of a variable with an initial value
+    """
+
+    __slots__ = ("name", "value")
+    opcode_type = "var_assign"
+
+    def __init__(self, name, value, dtype):
+        """
+        Class initializer
+
+        Params
+        ======
+        name  (string) = Name of variable
+        value (Expr)   = Initial value
+        dtype (string) = Datatype of variable
+        """
+
+        self.name = name
+        self.value = value
+        self.dtype = dtype
+
+    @property
+    def val(self):
+        return self.name + "---" + self.value.render()
+
+    def expressions(self):
+        return [self.value]
+
+
+class PtrAssign(Statement):
+    """
+    PtrAssign class is declaration of a pointer with an initial value
+    """
+
+    __slots__ = ("name", "value", "depth")
+    opcode_type = "ptr_assign"
+
+    def __init__(self, name, value, depth, dtype):
+        """
+        Class initializer
+
+        Params
+        ======
+        name  (string) = Name of pointer
+        value (Expr)   = Initial value
+        depth (int)    = Number of * in declaration
+        dtype (string) = Datatype of value
+        """
+
+        self.name = name
+        self.value = value
+        self.depth = depth
+        self.dtype = dtype
+
+    @property
+    def val(self):
+        return self.name + "---" + self.value.render() + "---" + str(self.depth)
+
+    def expressions(self):
+        return [self.value]
+
+
+class VarNoAssign(Statement):
+    """
+    VarNoAssign class is declaration of a variable (or pointer) without a value
+    """
+
+    __slots__ = ("name", "is_ptr")
+
+    def __init__(self, name, is_ptr=False):
+        self.name = name
+        self.is_ptr = is_ptr
+        self.dtype = None
+
+    @property
+    def type(self):
+        return "ptr_no_assign" if self.is_ptr else "var_no_assign"
+
+    @property
+    def val(self):
+        return self.name
+
+
+class ArrayNoAssign(Statement):
+    """
+    ArrayNoAssign class is declaration of an array without values
+    """
+
+    __slots__ = ("name", "size")
+    opcode_type = "array_no_assign"
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.dtype = None
+
+    @property
+    def val(self):
+        return self.name + "---" + str(self.size)
+
+
+class ArrayAssign(Statement):
+    """
+    ArrayAssign class is declaration of an array with an initializer list
+    """
+
+    __slots__ = ("name", "size", "initializer")
+    opcode_type = "array_assign"
+
+    def __init__(self, name, size, initializer, dtype):
+        """
+        Class initializer
+
+        Params
+        ======
+        name        (string) = Name of array
+        size        (string) = Size of array, empty if it is given by initializer list
+        initializer (Expr)   = Initializer list
+        dtype       (string) = Datatype of elements
+        """
+
+        self.name = name
+        self.size = size
+        self.initializer = initializer
+        self.dtype = dtype
+
+    @property
+    def val(self):
+        return self.name + "---" + str(self.size) + "---" + self.initializer.render()
+
+    def expressions(self):
+        return [self.initializer]
+
+
+class ArrayOnlyAssign(Statement):
+    """
+    ArrayOnlyAssign class is assignment of an initializer list to a declared array
+    """
+
+    __slots__ = ("name", "operator", "ctype", "size", "initializer")
+    opcode_type = "array_only_assign"
+
+    def __init__(self, name, operator, ctype, size, initializer):
+        """
+        Class initializer
+
+        Params
+        ======
+        name        (string) = Name of array
+        operator    (string) = Assignment operator
+        ctype       (string) = Datatype of elements
+        size        (string) = Size of array
+        initializer (Expr)   = Initializer list
+        """
+
+        self.name = name
+        self.operator = operator
+        self.ctype = ctype
+        self.size = size
+        self.initializer = initializer
+        self.dtype = ""
+
+    @property
+    def code(self):
+        """
+        Assignment of compound literal in C, the part after name of array
+        """
+
+        return (
+            " "
+            + self.operator
+            + " ("
+            + self.ctype
+            + " ["
+            + self.size
+            + "])"
+            + self.initializer.render()
+        )
+
+    @property
+    def val(self):
+        return self.name + "---" + self.code
+
+    def expressions(self):
+        return [self.initializer]
+
+
+class Assign(Statement):
+    """
+    Assign class is assignment to a variable (or pointer) which is already declared
+    """
+
+    __slots__ = ("name", "index", "operator", "value", "depth")
+
+    def __init__(self, name, index, operator, value, depth=0):
+        """
+        Class initializer
+
+        Params
+        ======
+        name     (string) = Name of variable
+        index    (Expr)   = Index of array element assigned to, None otherwise
+        operator (string) = Assignment operator
+        value    (Expr)   = Value assigned
+        depth    (int)    = Number of * before the name, 0 if it isn't a pointer assignment
+        """
+
+        self.name = name
+        self.index = index
+        self.operator = operator
+        self.value = value
+        self.depth = depth
+        self.dtype = ""
+
+    @property
+    def type(self):
+        return "ptr_only_assign" if self.depth > 0 else "assign"
+
+    @property
+    def target(self):
+        """
+        C code of the variable assigned to
+        """
+
+        return self.name + (self.index.render() if self.index is not None else "")
+
+    @property
+    def val(self):
+        val = self.target + "---" + self.operator + "---" + self.value.render()
+        if self.depth > 0:
+            val += "---" + str(self.depth)
+
+        return val
+
+    def expressions(self):
+        return [self.value] if self.index is None else [self.index, self.value]
+
+
+class Unary(Statement):
+    """
+    Unary class is an increment or decrement statement
+    """
+
+    __slots__ = ("value",)
+    opcode_type = "unary"
+
+    def __init__(self, value):
+        self.value = value
+        self.dtype = None
+
+    @property
+    def val(self):
+        return self.value.render()
+
+    def expressions(self):
+        return [self.value]
+
+
+class FuncDecl(Statement):
+    """
+    FuncDecl class is the declaration of a function, the body follows as statements
+    """
+
+    __slots__ = ("name", "params")
+    opcode_type = "func_decl"
+
+    def __init__(self, name, params):
+        """
+        Class initializer
+
+        Params
+        ======
+        name   (string) = Name of function
+        params (list)   = Names of parameters
+        """
+
+        self.name = name
+        self.params = params
+        self.dtype = ""
+
+    @property
+    def val(self):
+        return self.name + "---" + "&&&".join(self.params)
+
+
+class FuncCall(Statement):
+    """
+    FuncCall class is a function call statement
+    """
+
+    __slots__ = ("call",)
+    opcode_type = "func_call"
+
+    def __init__(self, call):
+        self.call = call
+        self.dtype = ""
+
+    @property
+    def val(self):
+        return (
+            self.call.name
+            + "---"
+            + "&&&".join(arg.render().replace(" ", "") for arg in self.call.args)
+        )
+
+    def expressions(self):
+        return [self.call]
+
+
+class StructDecl(Statement):
+    """
+    StructDecl class is the declaration of a structure, the members follow as statements
+    """
+
+    __slots__ = ("name",)
+    opcode_type = "struct_decl"
+
+    def __init__(self, name):
+        self.name = name
+        self.dtype = ""
+
+    @property
+    def val(self):
+        return self.name
+
+
+class StructInstantiate(Statement):
+    """
+    StructInstantiate class is the declaration of a variable of structure type
+    """
+
+    __slots__ = ("struct_name", "instance_name")
+    opcode_type = "struct_instantiate"
+
+    def __init__(self, struct_name, instance_name):
+        self.struct_name = struct_name
+        self.instance_name = instance_name
+        self.dtype = None
+
+    @property
+    def val(self):
+        return self.struct_name + "---" + self.instance_name
+
+
+class StructScopeOver(Statement):
+    """
+    StructScopeOver class is the end of declaration of a structure with the instances declared after it
+    """
+
+    __slots__ = ("instance_names",)
+    opcode_type = "struct_scope_over"
+
+    def __init__(self, instance_names):
+        self.instance_names = instance_names
+        self.dtype = ""
+
+    @property
+    def val(self):
+        return ", ".join(self.instance_names)
+
+
+class For(Statement):
+    """
+    For class is a for loop over a range of integers
+    """
+
+    __slots__ = ("var", "start", "end", "operator", "sign", "change")
+    opcode_type = "for"
+
+    def __init__(self, var, start, end, operator, sign, change):
+        """
+        Class initializer
+
+        Params
+        ======
+        var      (string) = Name of loop variable
+        start    (string) = Starting value
+        end      (string) = Ending value
+        operator (string) = Operator used to change the loop variable
+        sign     (string) = Comparison of loop variable with ending value
+        change   (string) = Value by which loop variable is changed
+        """
+
+        self.var = var
+        self.start = start
+        self.end = end
+        self.operator = operator
+        self.sign = sign
+        self.change = change
+        self.dtype = None
+
+    @property
+    def val(self):
+        return "&&&".join(
+            [self.var, self.start, self.end, self.operator, self.sign, self.change]
+        )
+
+
+class Keyword(Statement):
+    """
+    Keyword class is a statement made of a keyword and an expression like if, while, switch or return
+    """
+
+    __slots__ = ("keyword", "value")
+
+    def __init__(self, keyword, value, dtype=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        keyword (string) = Type of opcode of statement
+        value   (Expr)   = Expression of statement
+        dtype   (string) = Datatype of opcode
+        """
+
+        self.keyword = keyword
+        self.value = value
+        self.dtype = dtype
+
+    @property
+    def type(self):
+        return self.keyword
+
+    @type.setter
+    def type(self, keyword):
+        self.keyword = keyword
+
+    @property
+    def val(self):
+        return self.value.render()
+
+    def expressions(self):
+        return [self.value]
+
+
+class Verbatim(Statement):
+    """
+    Verbatim class is a statement whose text is copied to C code, like comments and raw C code
+    """
+
+    __slots__ = ("verbatim", "text")
+
+    def __init__(self, verbatim, text, dtype=""):
+        """
+        Class initializer
+
+        Params
+        ======
+        verbatim (string) = Type of opcode of statement
+        text     (string) = Text of statement
+        dtype    (string) = Datatype of opcode
+        """
+
+        self.verbatim = verbatim
+        self.text = text
+        self.dtype = dtype
+
+    @property
+    def type(self):
+        return self.verbatim
+
+    @property
+    def val(self):
+        return self.text
+
+
+def opcodes_of(statements):
+    """
+    Returns the string based opcodes of statements, used to print opcodes
+
+    Params
+    ======
+    statements (list) = Statements of syntax tree
+
+    Returns
+    =======
+    list: Opcodes of statements
+    """
+
+    return [statement.to_opcode() for statement in statements]
@@ -1,9 +1,115 @@
+# Modules for small int token kinds and compact columnar storage
+from array import array
+from enum import IntEnum
+
+# Every type of token that can be generated by the lexical analyzer (or scope resolver)
+TOKEN_TYPES = [
+    # Constants and identifiers
+    "number",
+    "string",
+    "bool",
+    "id",
+    "type_cast",
+    # Brackets and punctuation
+    "left_paren",
+    "right_paren",
+    "left_brace",
+    "right_brace",
+    "left_bracket",
+    "right_bracket",
+    "comma",
+    "colon",
+    "newline",
+    "call_end",
+    # Operators
+    "assignment",
+    "equal",
+    "not_equal",
+    "plus",
+    "plus_equal",
+    "increment",
+    "minus",
+    "minus_equal",
+    "decrement",
+    "multiply",
+    "multiply_equal",
+    "power",
+    "power_equal",
+    "divide",
+    "divide_equal",
+    "modulus",
+    "modulus_equal",
+    "and",
+    "or",
+    "address_of",
+    "bitwise_and",
+    "bitwise_and_equal",
+    "bitwise_or",
+    "bitwise_or_equal",
+    "bitwise_xor",
+    "bitwise_xor_equal",
+    "greater_than",
+    "greater_than_equal",
+    "right_shift",
+    "less_than",
+    "less_than_equal",
+    "left_shift",
+    # Comments and raw C code
+    "single_line_comment",
+    "multi_line_comment",
+    "RAW_C",
+    # Keywords common to sim-C and C
+    "break",
+    "case",
+    "continue",
+    "default",
+    "do",
+    "else",
+    "for",
+    "if",
+    "return",
+    "struct",
+    "switch",
+    "while",
+    # Keywords unique to sim-C
+    "BEGIN_C",
+    "END_C",
+    "END_MAIN",
+    "MAIN",
+    "by",
+    "exit",
+    "false",
+    "fun",
+    "import",
+    "in",
+    "input",
+    "print",
+    "to",
+    "true",
+    "var",
+    "size",
+    "type",
+]
+
+# Token kinds are small ints, the member name is the string type of token (keywords like if are not valid
+# python identifiers so members are accessed as TokenKind["if"])
+TokenKind = IntEnum("TokenKind", TOKEN_TYPES)
+
+# Kind -> string type of token, indexed directly with the kind
+TOKEN_KIND_NAMES = tuple([""] + TOKEN_TYPES)
+
+# String type of token -> kind, plain dict lookup is faster than TokenKind[type]
+TOKEN_KINDS = dict(TokenKind.__members__)
+
+
 class Token:
     """
     Token class is responsible for creating tokens
     """
 
-    def __init__(self, type, val, line_num, scope=None):
+    __slots__ = ("type", "val", "line_num", "column")
+
+    def __init__(self, type, val, line_num, column=None):
         """
         Class initializer
 
@@ -12,12 +118,21 @@ class Token:
         type     (string) = Type of token as string
         val      (string) = Value stored at token
         line_num (int)    = Line number
-        scope    (string) = Scope of token
+        column   (int)    = Column number starting at 1 where token begins, None if it is not known
         """
 
         self.type = type
         self.val = val
         self.line_num = line_num
+        self.column = column
+
+    @property
+    def kind(self):
+        """
+        Kind of token (TokenKind), tokens keep their type as a string since the parser compares it all the time
+        """
+
+        return TOKEN_KINDS[self.type]
 
     def __str__(self):
         """
@@ -47,3 +162,118 @@ class Token:
             return True
 
         return False
+
+
+class TokenStream:
+    """
+    TokenStream class stores tokens column wise in compact arrays instead of one object per token
+
+    Values are encoded in a single int array, 0 is an empty value, positive values are symbol table ids
+    and negative values index (as -index - 1) into a list of string values (raw C code, comments, type casts),
+    columns which are not known are stored as 0
+    """
+
+    def __init__(self, tokens=None):
+        """
+        Class initializer
+
+        Params
+        ======
+        tokens (list) = Tokens to be stored in the stream
+        """
+
+        self.kinds = array("H")
+        self.vals = array("i")
+        self.line_nums = array("i")
+        self.columns = array("i")
+        self.texts = []
+
+        for token in tokens or []:
+            self.append(token)
+
+    def append(self, token):
+        """
+        Append a token to the end of the stream
+
+        Params
+        ======
+        token (Token) = Token to be appended
+        """
+
+        val = token.val
+        if val == "":
+            val = 0
+        elif not isinstance(val, int):
+            self.texts.append(val)
+            val = -len(self.texts)
+
+        self.kinds.append(TOKEN_KINDS[token.type])
+        self.vals.append(val)
+        self.line_nums.append(token.line_num)
+        self.columns.append(token.column or 0)
+
+    def val_at(self, i):
+        """
+        Returns value of token at index i without creating a Token
+
+        Params
+        ======
+        i (int) = Index of token in stream
+
+        Returns
+        =======
+        int/string: The value stored at token
+        """
+
+        val = self.vals[i]
+        if val == 0:
+            return ""
+        elif val < 0:
+            return self.texts[-val - 1]
+
+        return val
+
+    def type_at(self, i):
+        """
+        Returns type of token at index i as string without creating a Token
+
+        Params
+        ======
+        i (int) = Index of token in stream
+
+        Returns
+        =======
+        string: Type of token
+        """
+
+        return TOKEN_KIND_NAMES[self.kinds[i]]
+
+    def to_tokens(self):
+        """
+        Returns list of Token objects stored in the stream
+
+        Returns
+        =======
+        list: List of tokens
+        """
+
+        return [self[i] for i in range(len(self.kinds))]
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, i):
+        """
+        Creates the Token at index i, changes made to it are not reflected back into the stream
+        """
+
+        return Token(
+            TOKEN_KIND_NAMES[self.kinds[i]],
+            self.val_at(i),
+            self.line_nums[i],
+            column=self.columns[i] or None,
+        )
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self[i]
@@ -0,0 +1,328 @@
+# Modules for finding and running the C compiler
+import os
+import re
+import shlex
+import shutil
+import subprocess
+
+# Module for reporting errors
+from .global_helpers import error
+
+# Module for hashing inputs of cached object files and executables
+from .build_cache import hash_file
+
+# Flags of C compiler used when none are chosen
+DEFAULT_CFLAGS = ["-O2"]
+
+# Include of a local header, like #include "geometry.h"
+LOCAL_INCLUDE = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+
+def find_c_compiler():
+    """
+    Returns the C compiler used to compile generated code, it can be set with the CC environment variable
+
+    Returns
+    =======
+    string: Command of C compiler
+    """
+
+    cc = os.environ.get("CC") or shutil.which("cc") or shutil.which("gcc")
+    if cc is None:
+        error("C compiler not found, set the CC environment variable", -1)
+
+    return cc
+
+
+def c_compiler_version(cc, cache=None):
+    """
+    Returns the version of C compiler (the output of cc --version together with its path), it is part of the keys
+    of cached object files and executables
+
+    The version is cached by the size and modification time of the compiler so cc --version isn't run by
+    every build
+
+    Params
+    ======
+    cc    (string)     = Command of C compiler
+    cache (BuildCache) = Cache in which the version is stored, None to always run cc --version
+
+    Returns
+    =======
+    string: Version of C compiler
+    """
+
+    path = os.path.realpath(shutil.which(cc) or cc)
+
+    key = None
+    if cache is not None:
+        try:
+            status = os.stat(path)
+            key = cache.key("cc_version", path, status.st_size, status.st_mtime_ns)
+        except OSError:
+            # Running the compiler reports that it can't be found
+            key = None
+
+    if key is not None:
+        version = cache.load("cc_version", key)
+        if version is not None:
+            return version
+
+    try:
+        result = subprocess.run(
+            [cc, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        version = path + "\n" + result.stdout
+    except OSError:
+        error("C compiler %s could not be run" % cc, -1)
+
+    if key is not None:
+        cache.store("cc_version", key, version)
+
+    return version
+
+
+def run_c_compiler(command):
+    """
+    Run the C compiler, its error messages are reported if it fails
+
+    Params
+    ======
+    command (list) = Command line of C compiler
+    """
+
+    result = subprocess.run(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if result.returncode != 0:
+        error(
+            "C compiler failed: %s\n%s" % (" ".join(command), result.stderr.strip()),
+            -1,
+        )
+
+
+def local_headers(c_filename, include_dirs=(".",)):
+    """
+    Returns the local headers (headers of modules) a C file includes, directly or through other headers
+
+    Headers are searched like the C compiler searches #include "...", in the directory of the file including
+    them and then in the include directories, headers which are not found are left to the C compiler to report
+
+    Params
+    ======
+    c_filename   (string) = Path of C file
+    include_dirs (tuple)  = Directories given to the C compiler with -I
+
+    Returns
+    =======
+    list: Paths of headers, sorted
+    """
+
+    headers = set()
+    pending = [c_filename]
+    while pending:
+        filename = pending.pop()
+        try:
+            with open(filename, "r") as file:
+                names = LOCAL_INCLUDE.findall(file.read())
+        except OSError:
+            continue
+
+        for name in names:
+            search_dirs = (os.path.dirname(filename),) + tuple(include_dirs)
+            for search_dir in search_dirs:
+                path = os.path.normpath(os.path.join(search_dir, name))
+                if os.path.isfile(path):
+                    if path not in headers:
+                        headers.add(path)
+                        pending.append(path)
+                    break
+
+    return sorted(headers)
+
+
+class BuildRule:
+    """
+    BuildRule class is a node of the dependency graph of an executable, a target built by a command from its inputs
+    """
+
+    __slots__ = ("target", "inputs", "command")
+
+    def __init__(self, target, inputs, command):
+        """
+        Class initializer
+
+        Params
+        ======
+        target  (string) = Path of file built
+        inputs  (list)   = Paths of files the target is built from, including the headers they include
+        command (list)   = Command line building the target
+        """
+
+        self.target = target
+        self.inputs = inputs
+        self.command = command
+
+
+def executable_rules(cc, cflags, c_filename, module_names, exe_filename):
+    """
+    Returns the dependency graph of an executable, the C file of every module compiled separately is compiled to an
+    object file and linked with the C file of program
+
+    Params
+    ======
+    cc           (string) = Command of C compiler
+    cflags       (list)   = Flags of C compiler, like optimization flags
+    c_filename   (string) = Path of C file of program
+    module_names (list)   = Names of modules whose C files and headers were generated in the current working
+                            directory
+    exe_filename (string) = Path of executable to be generated
+
+    Returns
+    =======
+    list: BuildRule of every target, targets come after the targets they depend on
+    """
+
+    rules = []
+
+    for module_name in module_names:
+        module_c_filename = module_name + ".c"
+        object_filename = module_name + ".o"
+        rules.append(
+            BuildRule(
+                object_filename,
+                [module_c_filename] + local_headers(module_c_filename),
+                [cc]
+                + cflags
+                + ["-I", ".", "-c", module_c_filename, "-o", object_filename],
+            )
+        )
+
+    # Headers of modules are generated in the current working directory
+    object_filenames = [rule.target for rule in rules]
+    rules.append(
+        BuildRule(
+            exe_filename,
+            [c_filename] + local_headers(c_filename) + object_filenames,
+            [cc]
+            + cflags
+            + ["-I", ".", c_filename]
+            + object_filenames
+            + ["-o", exe_filename, "-lm"],
+        )
+    )
+
+    return rules
+
+
+def run_rules(rules, cache=None, cc_version=""):
+    """
+    Build the targets of a dependency graph in order, a target is copied from the cache if it was built before from
+    inputs with the same contents by the same command and version of C compiler
+
+    Params
+    ======
+    rules      (list)       = BuildRule of every target, targets come after the targets they depend on
+    cache      (BuildCache) = Cache of object files and executables, None to always build
+    cc_version (string)     = Version of C compiler returned by c_compiler_version
+
+    Returns
+    =======
+    int: Number of targets which were built by the C compiler
+    """
+
+    built = 0
+    for rule in rules:
+        key = None
+        if cache is not None:
+            parts = [cc_version] + rule.command
+            for path in rule.inputs:
+                parts += [path, hash_file(path)]
+
+            key = cache.key("binary", *parts)
+            if cache.restore_file("binary", key, "", rule.target):
+                continue
+
+        run_c_compiler(rule.command)
+        built += 1
+
+        if cache is not None:
+            cache.store_file("binary", key, "", rule.target)
+
+    return built
+
+
+def quote_command(command):
+    """
+    Returns a command line quoted for a shell (like shlex.join, which is new in Python 3.8)
+    """
+
+    return " ".join(map(shlex.quote, command))
+
+
+def escape_make_path(path):
+    """
+    Returns a path escaped for a Makefile
+    """
+
+    return path.replace("$", "$$").replace(" ", "\\ ")
+
+
+def escape_ninja_path(path):
+    """
+    Returns a path escaped for a ninja file
+    """
+
+    return path.replace("$", "$$").replace(" ", "$ ").replace(":", "$:")
+
+
+def write_graph(rules, path):
+    """
+    Write a dependency graph as a ninja file (if path ends with .ninja) or a Makefile, so the generated code can be
+    rebuilt by ninja or make from the directory in which simc was run
+
+    Params
+    ======
+    rules (list)   = BuildRule of every target, targets come after the targets they depend on
+    path  (string) = Path of file to be generated
+    """
+
+    lines = [
+        "# Dependency graph generated by simc, paths are relative to where it was run"
+    ]
+
+    if path.endswith(".ninja"):
+        lines += ["", "rule cc", "  command = $command", "  description = CC $out"]
+        for rule in rules:
+            lines += [
+                "",
+                "build %s: cc %s"
+                % (
+                    escape_ninja_path(rule.target),
+                    " ".join(map(escape_ninja_path, rule.inputs)),
+                ),
+                "  command = %s" % quote_command(rule.command).replace("$", "$$"),
+            ]
+        lines += ["", "default %s" % escape_ninja_path(rules[-1].target)]
+    else:
+        # The first rule is the default goal of make
+        lines += ["", ".PHONY: all", "all: %s" % escape_make_path(rules[-1].target)]
+        for rule in rules:
+            lines += [
+                "",
+                "%s: %s"
+                % (
+                    escape_make_path(rule.target),
+                    " ".join(map(escape_make_path, rule.inputs)),
+                ),
+                "\t%s" % quote_command(rule.command).replace("$", "$$"),
+            ]
+
+    with open(path, "w") as file:
+        file.write("\n".join(lines) + "\n")
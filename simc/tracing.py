@@ -0,0 +1,302 @@
+# Modules for timestamps, process ids and the per thread tracer
+import os
+import sys
+import time
+import threading
+
+# Modules for writing outputs when profiling is over
+from contextlib import contextmanager, ExitStack
+
+# Module for reporting errors
+from .global_helpers import error
+
+# Tracer of the compilation running in current thread
+_state = threading.local()
+
+
+def current_tracer():
+    """
+    Returns the tracer of the compilation running in the current thread
+
+    Returns
+    =======
+    Tracer: Active tracer, None if compilation is not being traced
+    """
+
+    return getattr(_state, "tracer", None)
+
+
+class _Span:
+    """
+    Context manager which adds a span to the tracer when it is over
+    """
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.complete(self.name, self.category, self.start, **self.args)
+
+        return False
+
+
+class Tracer:
+    """
+    Tracer class records spans of compiler execution as Chrome trace events, which can be opened with
+    chrome://tracing, Perfetto or speedscope
+    """
+
+    def __init__(self):
+        """
+        Class initializer
+        """
+
+        self.events = []
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+        # Timestamps of events are microseconds since the tracer was made
+        self.origin = time.perf_counter()
+
+    def complete(self, name, category, start, end=None, **args):
+        """
+        Add a span which is over
+
+        Params
+        ======
+        name     (string) = Name of span
+        category (string) = Category of span, like stage, parse or compile
+        start    (float)  = time.perf_counter() when span started
+        end      (float)  = time.perf_counter() when span ended, now if not given
+        args     (dict)   = Details of span shown with it
+        """
+
+        if end is None:
+            end = time.perf_counter()
+
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self.pid,
+                "tid": self.tid,
+                "args": args,
+            }
+        )
+
+    def span(self, name, category, **args):
+        """
+        Returns a context manager recording a span from when it is entered to when it is exited
+
+        Params
+        ======
+        name     (string) = Name of span
+        category (string) = Category of span
+        args     (dict)   = Details of span shown with it
+
+        Returns
+        =======
+        context manager: The span
+        """
+
+        return _Span(self, name, category, args)
+
+    def to_dict(self):
+        """
+        Returns the trace in Chrome trace event format
+
+        Returns
+        =======
+        dict: Trace events
+        """
+
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """
+        Write the trace as JSON
+
+        Params
+        ======
+        path (string) = Path of trace file
+        """
+
+        import json
+
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file)
+
+
+class tracing:
+    """
+    Context manager which makes a tracer active in the current thread
+
+    Usage
+    =====
+    with tracing() as tracer:
+        ...
+    tracer.write("out.json")
+    """
+
+    def __init__(self, tracer=None):
+        self.tracer = tracer or Tracer()
+
+    def __enter__(self):
+        self.previous = getattr(_state, "tracer", None)
+        _state.tracer = self.tracer
+
+        return self.tracer
+
+    def __exit__(self, *exc_info):
+        _state.tracer = self.previous
+
+        return False
+
+
+def frame_name(frame):
+    """
+    Returns the name of a Python function in collapsed stacks, like parse (simc_parser.py:630)
+
+    Params
+    ======
+    frame (frame) = Frame of function
+
+    Returns
+    =======
+    string: Name of function
+    """
+
+    code = frame.f_code
+
+    return "%s (%s:%d)" % (
+        code.co_name,
+        os.path.basename(code.co_filename),
+        code.co_firstlineno,
+    )
+
+
+class StackProfiler:
+    """
+    StackProfiler class measures the time spent in every call stack, it is written as collapsed stacks (one
+    stack with its time in microseconds per line) which flamegraph.pl, speedscope and inferno read
+
+    cProfile only keeps callers and callees of each function, so full stacks are recorded separately with a
+    profile function, which is slow but exact
+    """
+
+    def __init__(self):
+        """
+        Class initializer
+        """
+
+        # Collapsed stack -> seconds spent in its last function (excluding its callees)
+        self.stacks = {}
+
+        # [collapsed stack, start time, seconds spent in callees] of every function being run
+        self.running = []
+
+    def __profile(self, frame, event, arg):
+        now = time.perf_counter()
+
+        if event == "call" or event == "c_call":
+            if event == "call":
+                name = frame_name(frame)
+            else:
+                name = getattr(arg, "__qualname__", "<built-in>")
+            parent = self.running[-1][0] + ";" if self.running else ""
+            self.running.append([parent + name, now, 0.0])
+        elif self.running:
+            # Functions which were running when the profiler started have no entry
+            stack, start, callees = self.running.pop()
+            elapsed = now - start
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + elapsed - callees
+            if self.running:
+                self.running[-1][2] += elapsed
+
+    def start(self):
+        """
+        Start profiling the current thread
+        """
+
+        sys.setprofile(self.__profile)
+
+    def stop(self):
+        """
+        Stop profiling the current thread
+        """
+
+        sys.setprofile(None)
+        self.running = []
+
+    def write(self, path):
+        """
+        Write the collapsed stacks
+
+        Params
+        ======
+        path (string) = Path of collapsed stacks file
+        """
+
+        with open(path, "w") as file:
+            for stack, seconds in sorted(self.stacks.items()):
+                micros = int(seconds * 1e6)
+                if micros > 0:
+                    file.write("%s %d\n" % (stack, micros))
+
+
+@contextmanager
+def profiled(trace_path=None, cprofile_path=None, collapsed_path=None):
+    """
+    Trace and profile the code run inside, outputs are written when it is over (even if compilation failed)
+
+    cProfile and collapsed stacks both need the profile function of interpreter, so only one of them can be used
+
+    Params
+    ======
+    trace_path     (string) = Path of Chrome trace of stages, statements and functions, None to not trace
+    cprofile_path  (string) = Path of cProfile stats (readable with pstats or snakeviz), None to not profile
+    collapsed_path (string) = Path of collapsed stacks for flamegraph tools, None to not record stacks
+    """
+
+    if cprofile_path is not None and collapsed_path is not None:
+        error("cProfile and collapsed stacks can't be recorded at the same time", -1)
+
+    # Only compilations written to a Chrome trace are traced (contextlib.nullcontext is new in Python 3.7)
+    with ExitStack() as stack:
+        tracer = stack.enter_context(tracing()) if trace_path is not None else None
+
+        profile = None
+        if cprofile_path is not None:
+            import cProfile
+
+            profile = cProfile.Profile()
+
+        stack_profiler = StackProfiler() if collapsed_path is not None else None
+
+        if profile is not None:
+            profile.enable()
+        if stack_profiler is not None:
+            stack_profiler.start()
+
+        try:
+            yield
+        finally:
+            if stack_profiler is not None:
+                stack_profiler.stop()
+                stack_profiler.write(collapsed_path)
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(cprofile_path)
+            if trace_path is not None:
+                tracer.write(trace_path)
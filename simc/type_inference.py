@@ -0,0 +1,360 @@
+# Module for the worklist of type variables
+from collections import deque
+
+# Types of symbols whose datatype is not known yet
+UNKNOWN_TYPES = ["var", "declared", "not_known"]
+
+# Mapping for precedence checking of numeric types (double > float > int)
+TYPE_TO_PREC = {"int": 3, "float": 4, "double": 5}
+
+# Mapping of return type of a function to precedence of function call
+CALL_TYPE_TO_PREC = {"char*": 1, "char": 2, "int": 3, "float": 4, "double": 5}
+
+# Map precedence of return expression to return type of function
+PREC_TO_RETURN_TYPE = {
+    -1: "not_known",
+    0: "char*",
+    1: "char*",
+    2: "char",
+    3: "int",
+    4: "float",
+    5: "double",
+    6: "bool",
+    7: "void",
+}
+
+# Map precedence of expression to the name of its type given by type statement
+PREC_TO_TYPE_NAME = {3: "int", 4: "float", 5: "double"}
+
+# Map precedence of expression to format specifiers of print
+PREC_TO_PRINT_FORMAT = {
+    0: "",
+    1: '"%s", ',
+    2: '"%c", ',
+    3: '"%d", ',
+    4: '"%f", ',
+    5: '"%lf", ',
+    6: '"%d", ',
+}
+
+# Map type of variable to its format specifier in f-strings
+TYPE_TO_FORMAT_SPECIFIER = {
+    "char": "%c",
+    "char*": "%s",
+    "string": "%s",
+    "int": "%d",
+    "float": "%f",
+    "double": "%lf",
+    "bool": "%d",
+}
+
+
+def operand_prec(op_type, type_, typedata):
+    """
+    Returns precedence of an expression after an operand is added to it
+
+    Params
+    ======
+    op_type  (int)    = Precedence of expression before the operand
+    type_    (string) = Datatype of operand
+    typedata (string) = Type of data of operand (constant/variable)
+
+    Returns
+    =======
+    int: The precedence of expression, unknown operands leave it unchanged
+    """
+
+    if type_ == "string" or type_ == "char*":
+        return 0 if typedata == "constant" else 1
+    elif type_ == "char":
+        return 2
+    elif type_ == "bool":
+        return 6
+    elif type_ in TYPE_TO_PREC:
+        return max(TYPE_TO_PREC[type_], op_type)
+
+    return op_type
+
+
+def convert_fstring(value, names, table):
+    """
+    Replace variables of an f-string with format specifiers, the variables are appended as arguments
+
+    Params
+    ======
+    value (string)      = String constant with variables in braces
+    names (list)        = Names of variables in the string
+    table (SymbolTable) = Symbol table
+
+    Returns
+    =======
+    string: The converted string, None if type of a variable is not known yet
+    """
+
+    for name in names:
+        _, type_, _, _, _ = table.get_by_id(table.get_by_symbol(name))
+        if type_ not in TYPE_TO_FORMAT_SPECIFIER:
+            return None
+
+        value = value.replace("{" + name + "}", TYPE_TO_FORMAT_SPECIFIER[type_])
+        value += ", " + name
+
+    # Replace all {} in string
+    return value.replace("{", "").replace("}", "")
+
+
+def term_prec(term, table):
+    """
+    Returns precedence of an expression from the steps recorded while it was parsed
+
+    A term is a list of steps, ("operand", id) adds an identifier or constant, ("call", id) the return value of
+    a function, ("set", prec) any other part of expression whose type was known while parsing and
+    ("fstring", node) an f-string whose variables had unknown types
+
+    Params
+    ======
+    term  (list)        = Steps of expression
+    table (SymbolTable) = Symbol table
+
+    Returns
+    =======
+    int: The precedence of expression, -1 if it is not known
+    """
+
+    op_type = -1
+    for step in term:
+        kind = step[0]
+        if kind == "operand":
+            entry = table.symbol_table[step[1]]
+            op_type = operand_prec(op_type, entry.type, entry.typedata)
+        elif kind == "call":
+            op_type = CALL_TYPE_TO_PREC.get(table.symbol_table[step[1]].type, op_type)
+        elif kind == "set":
+            op_type = step[1]
+
+    return op_type
+
+
+class DeferredOpCode:
+    """
+    DeferredOpCode class holds an opcode (statement) whose value depends on types which are inferred after parsing
+    """
+
+    __slots__ = ("opcode", "term", "infer_format", "fstrings")
+
+    def __init__(self, opcode, term, infer_format, fstrings):
+        """
+        Class initializer
+
+        Params
+        ======
+        opcode       (Statement) = Statement to be completed
+        term         (list)      = Steps of expression of statement
+        infer_format (bool)      = Whether format of print statement is not known yet
+        fstrings     (list)      = FormatString nodes which could not be converted yet
+        """
+
+        self.opcode = opcode
+        self.term = term
+        self.infer_format = infer_format
+        self.fstrings = fstrings
+
+    def complete(self, table):
+        """
+        Fill in the parts of opcode whose types are known now
+
+        Params
+        ======
+        table (SymbolTable) = Symbol table after types were inferred
+
+        Returns
+        =======
+        bool: Whether the opcode is complete or not
+        """
+
+        if self.infer_format:
+            op_type = term_prec(self.term, table)
+            if op_type == -1:
+                return False
+
+            self.opcode.format = PREC_TO_PRINT_FORMAT[op_type]
+            self.infer_format = False
+
+        pending = []
+        for node in self.fstrings:
+            node.converted = convert_fstring(node.text, node.names, table)
+            if node.converted is None:
+                pending.append(node)
+        self.fstrings = pending
+
+        return not pending
+
+
+class TypeGraph:
+    """
+    TypeGraph class holds the constraints between types which could not be inferred while parsing
+
+    Dependencies of symbol table entries are the edges of graph, the type of an entry flows to the entries which
+    depend on it. Return types of functions are given by the recorded terms of their return expressions.
+    """
+
+    def __init__(self):
+        """
+        Class initializer
+        """
+
+        # Function id -> terms of return expressions whose type was not known
+        self.returns = {}
+
+        # Ids of functions which were called
+        self.called = set()
+
+        # Opcodes which are completed after types are inferred
+        self.deferred = []
+
+    def add_return(self, func_id, term):
+        """
+        Record a return expression whose type was not known while parsing
+
+        Params
+        ======
+        func_id (int)  = Id of function in symbol table
+        term    (list) = Steps of return expression
+        """
+
+        self.returns.setdefault(func_id, []).append(term)
+
+    def defer(self, opcode, term, infer_format=False):
+        """
+        Record an opcode (statement) whose value depends on types which are not known yet
+
+        Params
+        ======
+        opcode       (Statement) = Statement to be completed after types are inferred
+        term         (list)      = Steps of expression of statement
+        infer_format (bool)      = Whether format of print statement is not known yet
+        """
+
+        fstrings = [step[1] for step in term if step[0] == "fstring"]
+        if not infer_format and not fstrings:
+            return
+
+        self.deferred.append(DeferredOpCode(opcode, term, infer_format, fstrings))
+
+
+def flow_type(father_type, child):
+    """
+    Pass the type of an entry to an entry which depends on it
+
+    Params
+    ======
+    father_type (string)      = Known type of entry
+    child       (SymbolEntry) = Entry which depends on it
+
+    Returns
+    =======
+    bool: Whether the type of child changed or not
+    """
+
+    # If the type is not defined
+    if child.type == "declared":
+        child.type = "char*" if father_type == "string" else father_type
+        return True
+
+    # If the type is defined, it cannot downgrade
+    if child.type > father_type:
+        child.type = father_type
+        return True
+
+    return False
+
+
+def propagate_types(table, start_ids, returns=None, readers=None):
+    """
+    Pass known types along the dependencies of entries, starting from the given entries
+
+    Types are solved with a worklist, an entry is visited again only when the type of an entry it depends on
+    changes. A type only changes from unknown to known or downgrades, so this terminates.
+
+    Params
+    ======
+    table     (SymbolTable) = Symbol table
+    start_ids (iterable)    = Ids of entries whose types are passed on
+    returns   (dict)        = Function id -> terms of return expressions, None to skip return types
+    readers   (dict)        = Id -> functions whose return expressions read its type
+    """
+
+    symbols = table.symbol_table
+
+    worklist = deque(start_ids)
+    queued = set(worklist)
+
+    while worklist:
+        id_ = worklist.popleft()
+        queued.discard(id_)
+        entry = symbols[id_]
+
+        # The first return expression whose type is known gives the return type of function
+        if returns is not None and entry.type in UNKNOWN_TYPES and id_ in returns:
+            for term in returns[id_]:
+                op_type = term_prec(term, table)
+                if op_type != -1:
+                    entry.type = PREC_TO_RETURN_TYPE[op_type]
+                    break
+
+        if entry.type in UNKNOWN_TYPES:
+            continue
+
+        changed = [
+            child_id
+            for child_id in entry.dependencies
+            if flow_type(entry.type, symbols[child_id])
+        ]
+        if returns is not None:
+            changed.extend(readers.get(id_, []))
+
+        for next_id in changed:
+            if next_id not in queued:
+                queued.add(next_id)
+                worklist.append(next_id)
+
+
+def infer_types(table):
+    """
+    Infer the types which were not known while parsing and complete the deferred opcodes
+
+    Return types are only inferred for functions which were called, others stay not_known. Constraints which
+    can't be solved yet (for example parameters of a module function which is not called yet) stay in the graph
+    for the next time types are inferred.
+
+    Params
+    ======
+    table (SymbolTable) = Symbol table after parsing
+    """
+
+    graph = table.type_graph
+    symbols = table.symbol_table
+
+    returns = {
+        func_id: terms
+        for func_id, terms in graph.returns.items()
+        if func_id in graph.called
+    }
+
+    # Id -> functions whose return expressions read its type
+    readers = {}
+    for func_id, terms in returns.items():
+        for term in terms:
+            for step in term:
+                if step[0] in ["operand", "call"]:
+                    readers.setdefault(step[1], []).append(func_id)
+
+    # Start from every function with unknown return type and every entry with dependencies
+    start_ids = list(returns)
+    start_ids.extend(id_ for id_, entry in symbols.items() if entry.dependencies)
+    propagate_types(table, start_ids, returns, readers)
+
+    # Complete the opcodes whose types are known now
+    graph.deferred = [
+        deferred for deferred in graph.deferred if not deferred.complete(table)
+    ]